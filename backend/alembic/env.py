@@ -14,6 +14,7 @@ from src.db.models.noticia_model import Noticia
 from src.db.models.fonte_model import Fonte
 from src.db.models.curtir_model import Curtir
 from src.db.models.refresh_tokens_model import RefreshToken
+from src.db.models.ranking_model import RankingNoticia
 
 # Importar o metadata da Base para usar nas migrações
 from src.db.database import Base
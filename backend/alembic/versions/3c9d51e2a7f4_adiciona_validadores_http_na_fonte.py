@@ -0,0 +1,30 @@
+"""Adiciona validadores HTTP na fonte
+
+Revision ID: 3c9d51e2a7f4
+Revises: 7f275ec7540f
+Create Date: 2026-10-18 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d51e2a7f4'
+down_revision: Union[str, None] = '7f275ec7540f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('fontes', sa.Column('etag', sa.String(length=512), nullable=True))
+    op.add_column('fontes', sa.Column('last_modified', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('fontes', 'last_modified')
+    op.drop_column('fontes', 'etag')
@@ -0,0 +1,37 @@
+"""Cria tabela rankings_noticias
+
+Revision ID: 5d1f8e63b0c9
+Revises: e4b7c0a91d52
+Create Date: 2026-10-18 16:21:08.392714
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f8e63b0c9'
+down_revision: Union[str, None] = 'e4b7c0a91d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rankings_noticias',
+        sa.Column('janela', sa.String(length=5), nullable=False),
+        sa.Column('posicao', sa.Integer(), nullable=False),
+        sa.Column('id_noticia', sa.Integer(), nullable=False),
+        sa.Column('qtd_curtidas', sa.Integer(), nullable=False),
+        sa.Column('atualizado_em', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['id_noticia'], ['noticias.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('janela', 'posicao'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rankings_noticias')
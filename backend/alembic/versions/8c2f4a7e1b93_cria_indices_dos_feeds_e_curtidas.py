@@ -0,0 +1,43 @@
+"""Cria índices dos feeds, curtidas e refresh tokens
+
+Revision ID: 8c2f4a7e1b93
+Revises: 5d1f8e63b0c9
+Create Date: 2026-10-18 18:42:10.215377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2f4a7e1b93'
+down_revision: Union[str, None] = '5d1f8e63b0c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome, tabela, colunas)
+INDICES = [
+    ('ix_noticias_data_postagem_id', 'noticias', ['data_postagem', 'id']),
+    ('ix_noticias_qtd_curtidas_id', 'noticias', ['qtd_curtidas', 'id']),
+    ('ix_curtidas_id_noticia', 'curtidas', ['id_noticia']),
+    ('ix_curtidas_id_usuario_data_curtida', 'curtidas', ['id_usuario', 'data_curtida']),
+    ('ix_refresh_tokens_usuario_id', 'refresh_tokens', ['usuario_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY não bloqueia escritas nas tabelas, mas não roda dentro de
+    # uma transação. Se falhar no meio, o índice fica INVALID e precisa ser
+    # removido (DROP INDEX CONCURRENTLY) antes de rodar a migração de novo.
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for nome, tabela, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True)
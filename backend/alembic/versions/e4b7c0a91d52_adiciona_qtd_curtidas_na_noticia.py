@@ -0,0 +1,40 @@
+"""Adiciona qtd_curtidas na noticia
+
+Revision ID: e4b7c0a91d52
+Revises: 3c9d51e2a7f4
+Create Date: 2026-10-18 15:03:27.481920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7c0a91d52'
+down_revision: Union[str, None] = '3c9d51e2a7f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'noticias',
+        sa.Column('qtd_curtidas', sa.Integer(), server_default='0', nullable=False),
+    )
+    # Preenche o contador com as curtidas já existentes
+    op.execute(
+        """
+        UPDATE noticias
+        SET qtd_curtidas = (
+            SELECT count(*) FROM curtidas WHERE curtidas.id_noticia = noticias.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('noticias', 'qtd_curtidas')
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark da extração de texto e imagem do HTML das entradas de feed.
+
+Compara a extração antiga (dois parses com html.parser: um para a imagem e
+outro em limpar_texto) com extrair_conteudo em cada parser disponível.
+
+Uso (a partir da pasta backend/, com o .env configurado):
+    python -m benchmarks.benchmark_html
+    python -m benchmarks.benchmark_html --feed https://exemplo.com/rss --repeticoes 500
+"""
+import argparse
+import importlib.util
+import time
+from pathlib import Path
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from src.services.rss_service import (
+    _html_da_imagem,
+    _html_do_texto,
+    extrair_conteudo,
+    imagem_da_midia,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "feed_noticias.xml"
+
+
+def extracao_antiga(entry):
+    # Como era antes: um BeautifulSoup para a imagem e outro para o texto
+    img_tag = BeautifulSoup(_html_da_imagem(entry), "html.parser").find("img")
+    imagem = img_tag.get("src") if img_tag else None  # type: ignore
+    texto = BeautifulSoup(_html_do_texto(entry), "html.parser").get_text(separator=" ", strip=True)
+    return texto, imagem
+
+
+def medir(funcao, entradas, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for entry in entradas:
+            funcao(entry)
+    return len(entradas) * repeticoes / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--feed", action="append", help="URL ou arquivo RSS (padrão: fixture)")
+    parser.add_argument("--repeticoes", type=int, default=200, help="Vezes que o corpus é processado")
+    args = parser.parse_args()
+
+    entradas = [
+        entry for feed in args.feed or [str(FIXTURE)] for entry in feedparser.parse(feed).entries
+    ]
+
+    variantes = {
+        "antiga (2x html.parser)": extracao_antiga,
+        "extrair_conteudo (html.parser)": lambda entry: extrair_conteudo(entry, "html.parser", imagem_da_midia(entry)),
+    }
+    if importlib.util.find_spec("lxml"):
+        variantes["extrair_conteudo (lxml)"] = lambda entry: extrair_conteudo(entry, "lxml", imagem_da_midia(entry))
+    else:
+        print("lxml não instalado: pip install lxml para comparar")
+
+    print(f"Corpus: {len(entradas)} entradas x {args.repeticoes} repetições\n")
+    base = None
+    for nome, funcao in variantes.items():
+        vazao = medir(funcao, entradas, args.repeticoes)
+        base = base or vazao
+        print(f"{nome:<32} {vazao:>10.0f} entradas/s  ({vazao / base:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark dos modos de resumo (summary_nlp_mode).
+
+Compara a vazão (docs/s), o tempo de carga do pipeline e a memória de pico de
+cada modo sobre um corpus de entradas de feed. Cada modo roda em um
+subprocesso próprio para que a memória medida seja só a dele.
+
+Uso (a partir da pasta backend/):
+    python -m benchmarks.benchmark_resumo
+    python -m benchmarks.benchmark_resumo --feed https://exemplo.com/rss --repeticoes 50
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import feedparser
+from bs4 import BeautifulSoup
+
+FIXTURE = Path(__file__).parent / "fixtures" / "feed_noticias.xml"
+MODOS = ["full", "senter", "sentencizer"]
+# Documentos resumidos antes de medir a vazão
+AQUECIMENTO_DOCS = 8
+
+
+def carregar_textos(feeds: list[str]) -> list[str]:
+    # Mesmo texto usado na coleta: summary, description ou content, sem HTML
+    textos = []
+    for feed in feeds:
+        for entry in feedparser.parse(feed).entries:
+            html = entry.get("summary") or entry.get("description")
+            if not html:
+                content = entry.get("content") or [{}]
+                html = content[0].get("value", "")
+            textos.append(
+                BeautifulSoup(str(html), "html.parser").get_text(separator=" ", strip=True)
+            )
+    return textos
+
+
+def medir_modo(modo: str, textos: list[str], repeticoes: int) -> dict:
+    """Executado no subprocesso: carrega o pipeline do modo e resume o corpus."""
+    os.environ["summary_nlp_mode"] = modo
+
+    inicio = time.perf_counter()
+    from src.services import summary_service
+
+    # O modelo é carregado sob demanda: força a carga dentro do cronômetro
+    summary_service.get_nlp()
+    carga = time.perf_counter() - inicio
+
+    # Aquecimento, para a vazão não incluir a primeira passada pelo pipeline
+    summary_service.resumir_lote(textos[:AQUECIMENTO_DOCS])
+
+    corpus = textos * repeticoes
+    inicio = time.perf_counter()
+    resumos = summary_service.resumir_lote(corpus)
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "modo": modo,
+        "docs": len(corpus),
+        "carga_s": carga,
+        "docs_s": len(corpus) / duracao,
+        # ru_maxrss vem em KB no Linux
+        "memoria_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "resumos": resumos[: len(textos)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--feed", action="append", help="URL ou arquivo RSS (padrão: fixture)")
+    parser.add_argument("--repeticoes", type=int, default=20, help="Vezes que o corpus é processado")
+    parser.add_argument("--modo", action="append", choices=MODOS, help="Modos comparados (padrão: todos)")
+    parser.add_argument("--interno", choices=MODOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    feeds = args.feed or [str(FIXTURE)]
+    textos = carregar_textos(feeds)
+
+    if args.interno:
+        print(json.dumps(medir_modo(args.interno, textos, args.repeticoes)))
+        return
+
+    print(f"Corpus: {len(textos)} entradas x {args.repeticoes} repetições\n")
+    print(f"{'modo':<12} {'docs/s':>10} {'carga (s)':>10} {'memória (MB)':>13} {'= full':>8}")
+
+    resultados = {}
+    for modo in args.modo or MODOS:
+        comando = [sys.executable, "-m", "benchmarks.benchmark_resumo", "--interno", modo]
+        comando += ["--repeticoes", str(args.repeticoes)]
+        for feed in feeds:
+            comando += ["--feed", feed]
+
+        processo = subprocess.run(comando, capture_output=True, text=True)
+        if processo.returncode != 0:
+            erro = processo.stderr.strip().splitlines()[-1] if processo.stderr else "erro"
+            print(f"{modo:<12} falhou: {erro}")
+            continue
+
+        resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+        resultados[modo] = resultado
+
+        # Percentual de resumos idênticos aos do pipeline completo
+        iguais = "-"
+        if "full" in resultados:
+            referencia = resultados["full"]["resumos"]
+            total = sum(a == b for a, b in zip(referencia, resultado["resumos"]))
+            iguais = f"{100 * total / len(referencia):.0f}%"
+
+        print(
+            f"{modo:<12} {resultado['docs_s']:>10.1f} {resultado['carga_s']:>10.2f} "
+            f"{resultado['memoria_mb']:>13.1f} {iguais:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark do argon2 pelo executor de senhas.
+
+Mede logins/s (verify_password) e a memória de pico para cada combinação de
+custo do argon2 e de password_hash_workers. Cada combinação roda em um
+subprocesso próprio para que a memória medida seja só a dela.
+
+Uso (a partir da pasta backend/):
+    python -m benchmarks.benchmark_senha
+    python -m benchmarks.benchmark_senha --custo 2,19456,1 --custo 3,65536,4 --workers 1 --workers 4
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+# time_cost,memory_cost (KiB),parallelism
+CUSTOS = ["3,65536,4", "2,19456,1", "1,47104,1"]
+WORKERS = [1, 2, 4]
+
+
+def medir_custo(custo: str, workers: int, logins: int) -> dict:
+    """Executado no subprocesso: configura o argon2 e dispara os logins em paralelo."""
+    time_cost, memory_cost, parallelism = custo.split(",")
+    os.environ.update({
+        "argon2_time_cost": time_cost,
+        "argon2_memory_cost": memory_cost,
+        "argon2_parallelism": parallelism,
+        "password_hash_workers": str(workers),
+        # Fila do tamanho do teste: nenhum login é recusado
+        "password_hash_queue": str(logins),
+    })
+    from src.auth.password import hash_password, verify_password
+
+    senha_hash = hash_password("senha-do-benchmark")
+    memoria_base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    # Uma thread por login, como requisições simultâneas no threadpool da API
+    threads = [
+        threading.Thread(target=verify_password, args=("senha-do-benchmark", senha_hash))
+        for _ in range(logins)
+    ]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "logins_s": logins / duracao,
+        # ru_maxrss vem em KB no Linux
+        "memoria_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "memoria_base_mb": memoria_base,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--custo", action="append", help="time_cost,memory_cost,parallelism (padrão: alguns perfis)")
+    parser.add_argument("--workers", action="append", type=int, help="password_hash_workers (padrão: 1, 2 e 4)")
+    parser.add_argument("--logins", type=int, default=32, help="Logins simultâneos por medição")
+    parser.add_argument("--interno", nargs=2, metavar=("CUSTO", "WORKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        custo, workers = args.interno
+        print(json.dumps(medir_custo(custo, int(workers), args.logins)))
+        return
+
+    print(f"{args.logins} logins simultâneos por medição (CPUs: {os.cpu_count()})\n")
+    print(f"{'t,m(KiB),p':<14} {'workers':>7} {'logins/s':>10} {'pico (MB)':>10} {'+ hashes (MB)':>14}")
+
+    for custo in args.custo or CUSTOS:
+        for workers in args.workers or WORKERS:
+            comando = [sys.executable, "-m", "benchmarks.benchmark_senha", "--interno", custo, str(workers)]
+            comando += ["--logins", str(args.logins)]
+
+            processo = subprocess.run(comando, capture_output=True, text=True)
+            if processo.returncode != 0:
+                erro = processo.stderr.strip().splitlines()[-1] if processo.stderr else "erro"
+                print(f"{custo:<14} {workers:>7} falhou: {erro}")
+                continue
+
+            resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+            print(
+                f"{custo:<14} {workers:>7} {resultado['logins_s']:>10.1f} "
+                f"{resultado['memoria_mb']:>10.1f} "
+                f"{resultado['memoria_mb'] - resultado['memoria_base_mb']:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Mede o tempo de inicialização e a memória de um processo da API.
+
+Cada medição roda em um processo novo (como um cold start de réplica):
+importa src.main, executa o startup do lifespan e informa o tempo total, a
+memória de pico e se o spaCy foi carregado. Com --com-modelo o pipeline de
+resumo é carregado em seguida, para comparar com o custo de carregá-lo no
+import (comportamento anterior).
+
+Uso (a partir da pasta backend/):
+    python -m benchmarks.benchmark_startup
+    python -m benchmarks.benchmark_startup --execucoes 10 --com-modelo
+"""
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+
+def medir_startup(com_modelo: bool) -> dict:
+    """Executado no subprocesso: importa a aplicação e roda o startup."""
+    inicio = time.perf_counter()
+    from src.main import app, lifespan
+
+    importacao = time.perf_counter() - inicio
+
+    async def iniciar():
+        async with lifespan(app):
+            pass
+
+    asyncio.run(iniciar())
+    startup = time.perf_counter() - inicio
+
+    modelo = 0.0
+    if com_modelo:
+        from src.services.summary_service import get_nlp
+
+        inicio_modelo = time.perf_counter()
+        get_nlp()
+        modelo = time.perf_counter() - inicio_modelo
+
+    return {
+        "importacao_s": importacao,
+        "startup_s": startup,
+        "modelo_s": modelo,
+        # ru_maxrss vem em KB no Linux
+        "memoria_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "spacy_carregado": "spacy" in sys.modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--execucoes", type=int, default=5, help="Processos medidos")
+    parser.add_argument("--com-modelo", action="store_true", help="Carrega também o modelo de resumo")
+    parser.add_argument("--interno", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        print(json.dumps(medir_startup(args.com_modelo)))
+        return
+
+    comando = [sys.executable, "-m", "benchmarks.benchmark_startup", "--interno"]
+    if args.com_modelo:
+        comando.append("--com-modelo")
+
+    resultados = []
+    for _ in range(args.execucoes):
+        processo = subprocess.run(comando, capture_output=True, text=True, check=True)
+        resultados.append(json.loads(processo.stdout.strip().splitlines()[-1]))
+
+    def mediana(chave):
+        return statistics.median(r[chave] for r in resultados)
+
+    print(f"Execuções: {len(resultados)} (mediana)")
+    print(f"Importação de src.main: {mediana('importacao_s'):.2f}s")
+    print(f"Startup completo:       {mediana('startup_s'):.2f}s")
+    if args.com_modelo:
+        print(f"Carga do modelo:        {mediana('modelo_s'):.2f}s")
+    print(f"Memória de pico:        {mediana('memoria_mb'):.1f} MB")
+    print(f"spaCy carregado:        {any(r['spacy_carregado'] for r in resultados)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.auth.jwt import decode_token
-from src.db.database import get_db
+from src.auth.principal import Principal, principal_do_token
+from src.db.database import get_async_db, get_db
 from src.db.models.usuario_model import Usuario
+from src.db.replicas import get_async_read_db, get_read_db
+from src.services.user_cache_service import (
+    get_usuario_snapshot,
+    get_usuario_snapshot_async,
+)
 
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -36,4 +43,76 @@ def get_current_user_optional(
         return None
     
     usuario = db.query(Usuario).get(int(payload["sub"]))
-    return usuario
\ No newline at end of file
+    return usuario
+
+
+def get_principal(token: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> Principal:
+    """
+    Usuário autenticado só pelas claims do token, sem consultar o banco.
+    Para rotas que usam apenas o id do usuário.
+    """
+    principal = principal_do_token(token.credentials)
+    if principal is None:
+        raise HTTPException(status_code=401, detail="Token inválido.")
+    return principal
+
+
+def get_principal_optional(
+    token: HTTPAuthorizationCredentials | None = Depends(bearer_scheme_optional),
+) -> Principal | None:
+    if token is None:
+        return None
+    return principal_do_token(token.credentials)
+
+
+def get_current_user_leitura(
+    principal: Principal = Depends(get_principal),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Dados do usuário autenticado para rotas que só leem o usuário (perfil,
+    curtidas): vêm do cache de usuários e, no miss, da sessão de leitura.
+    Diferente de get_principal, confirma que o usuário ainda existe.
+    """
+    usuario = get_usuario_snapshot(principal.id, db)
+    if usuario is None:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado.")
+    return usuario
+
+
+# Versões para as rotas assíncronas (db_async=true)
+async def get_current_user_async(
+    token: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    payload = decode_token(token.credentials)
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Token inválido.")
+    usuario = await db.get(Usuario, int(payload["sub"]))
+    if usuario is None:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado.")
+    return usuario
+
+
+async def get_current_user_optional_async(
+    token: HTTPAuthorizationCredentials | None = Depends(bearer_scheme_optional),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if token is None:
+        return None
+
+    payload = decode_token(token.credentials)
+    if payload is None:
+        return None
+
+    return await db.get(Usuario, int(payload["sub"]))
+
+
+async def get_current_user_leitura_async(
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    usuario = await get_usuario_snapshot_async(principal.id, db)
+    if usuario is None:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado.")
+    return usuario
@@ -1,7 +1,91 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+load_dotenv()
+
+# Custo do argon2 (padrões do passlib); cada hash usa argon2_memory_cost KiB de RAM
+ARGON2_TIME_COST = int(os.getenv("argon2_time_cost", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("argon2_memory_cost", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("argon2_parallelism", "4"))
+
+# Hashes/verificações simultâneos; limita CPU e memória gastos com senhas
+PASSWORD_HASH_WORKERS = int(os.getenv("password_hash_workers", "2"))
+# Pedidos aguardando um worker; acima disso a requisição recebe 503 na hora
+PASSWORD_HASH_QUEUE = int(os.getenv("password_hash_queue", "16"))
+
+
+def criar_contexto(
+    time_cost: int = ARGON2_TIME_COST,
+    memory_cost: int = ARGON2_MEMORY_COST,
+    parallelism: int = ARGON2_PARALLELISM,
+) -> CryptContext:
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
 # Configurando argon2 como algoritmo de hash
-password_context = CryptContext(schemes=["argon2"], deprecated="auto")
+password_context = criar_contexto()
+
+
+class ExecutorSenhas:
+    """
+    Executa o argon2 em um pool de threads limitado (o argon2 libera o GIL).
+
+    Cada pedido ocupa uma vaga (workers + fila) até terminar; sem vaga, falha
+    na hora com 503 em vez de prender mais threads do servidor esperando.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, fila: int = PASSWORD_HASH_QUEUE):
+        self.workers = workers
+        self.fila = fila
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._vagas = threading.BoundedSemaphore(workers + fila)
+        self._lock = threading.Lock()
+        self.ocupadas = self.rejeitadas = 0
+
+    def executar(self, funcao, *args):
+        if not self._vagas.acquire(blocking=False):
+            with self._lock:
+                self.rejeitadas += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado. Tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self.ocupadas += 1
+        try:
+            return self._executor.submit(funcao, *args).result()
+        finally:
+            with self._lock:
+                self.ocupadas -= 1
+            self._vagas.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "fila": self.fila,
+            "ocupadas": self.ocupadas,
+            "rejeitadas": self.rejeitadas,
+        }
+
+
+_executor = ExecutorSenhas()
+
+
+def get_executor_senhas() -> ExecutorSenhas:
+    return _executor
+
 
 def hash_password(password: str) -> str:
     """
@@ -12,9 +96,12 @@ def hash_password(password: str) -> str:
 
     returns:
     - str: A senha hasheada.
+
+    raises:
+    - HTTPException (503): Se o executor de senhas estiver lotado.
     """
 
-    return password_context.hash(password)
+    return get_executor_senhas().executar(password_context.hash, password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -26,6 +113,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
     returns:
     - bool: True se as senhas corresponderem, False caso contrário.
+
+    raises:
+    - HTTPException (503): Se o executor de senhas estiver lotado.
     """
 
-    return password_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return get_executor_senhas().executar(password_context.verify, plain_password, hashed_password)
+
+
+def precisa_rehash(hashed_password: str) -> bool:
+    """
+    Indica se o hash foi gerado com parâmetros diferentes dos atuais
+    (argon2_time_cost, argon2_memory_cost, argon2_parallelism). Não executa o
+    argon2: só compara os parâmetros gravados no próprio hash.
+    """
+    try:
+        return password_context.needs_update(hashed_password)
+    except ValueError:  # Hash em formato desconhecido
+        return False
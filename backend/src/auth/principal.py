@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.auth.jwt import verify_access_token
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Usuário autenticado montado só com as claims do access token, sem
+    consulta ao banco. Serve às rotas que precisam apenas do id (feeds,
+    notícia por id).
+    """
+
+    id: int
+
+
+@dataclass(frozen=True)
+class UsuarioSnapshot:
+    """Cópia somente leitura dos dados públicos do usuário, guardada em cache."""
+
+    id: int
+    nome: str
+    email: str
+    data_cadastro: datetime | None
+    foto_perfil: str | None
+
+
+def principal_do_token(token: str) -> Principal | None:
+    """
+    Monta o Principal a partir do access token.
+
+    returns:
+    - Principal | None: None se o token não for de acesso (um refresh token
+      não autentica rotas) ou não tiver o id do usuário.
+    """
+    payload = verify_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+    return Principal(id=int(payload["sub"]))
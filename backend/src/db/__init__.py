@@ -1 +1 @@
-from src.db.models import curtir_model, usuario_model, noticia_model, fonte_model
+from src.db.models import curtir_model, usuario_model, noticia_model, fonte_model, ranking_model
@@ -1,8 +1,12 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from dotenv import load_dotenv
+from uuid import uuid4
 import os
 
+from src.db.pool import AsyncAdaptedQueuePoolMonitorado, QueuePoolMonitorado
+
 # Carrega variáveis de ambiente
 load_dotenv()
 
@@ -16,12 +20,85 @@ DBNAME = os.getenv("dbname")
 # URL de conexão com PostgreSQL
 DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
 
+# Engine assíncrono (db_async=true): as rotas de notícias e de usuário passam a
+# usar AsyncSession e a concorrência deixa de depender do threadpool.
+# O engine síncrono continua existindo para o worker, a autenticação e o alembic.
+DB_ASYNC = os.getenv("db_async", "false").lower() == "true"
+# asyncpg | psycopg (psycopg 3); o driver escolhido precisa estar instalado
+DB_ASYNC_DRIVER = os.getenv("db_async_driver", "asyncpg")
+
+# asyncpg recebe o TLS como ssl=require; o psycopg 3 aceita sslmode como o psycopg2
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?ssl=require"
+    if DB_ASYNC_DRIVER == "asyncpg"
+    else f"postgresql+psycopg://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
+)
+
+# Pool de conexões, por processo (API, worker) e por engine
+DB_POOL_SIZE = int(os.getenv("db_pool_size", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("db_max_overflow", "10"))
+# Segundos esperando uma conexão livre antes de falhar
+DB_POOL_TIMEOUT = float(os.getenv("db_pool_timeout", "30"))
+# Conexões mais velhas que isso (segundos) são reabertas antes de cortes do servidor
+DB_POOL_RECYCLE = int(os.getenv("db_pool_recycle", "1800"))
+# Testa a conexão no checkout e descarta as que o servidor já fechou
+DB_POOL_PRE_PING = os.getenv("db_pool_pre_ping", "true").lower() == "true"
+# Cache do SQL compilado pelo SQLAlchemy (0 desliga)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("db_statement_cache_size", "500"))
+# Pooler em modo transação na frente do banco (PgBouncer, Supavisor na porta 6543)
+DB_PGBOUNCER = os.getenv("db_pgbouncer", "false").lower() == "true"
+
+
+def opcoes_engine(
+    assincrono: bool = False, driver: str = DB_ASYNC_DRIVER, pgbouncer: bool = DB_PGBOUNCER
+) -> dict:
+    """
+    Argumentos de create_engine/create_async_engine para o pool configurado.
+
+    No modo PgBouncer (transação), cada transação pode cair em outra conexão
+    do servidor: prepared statements nomeados dos drivers assíncronos são
+    desligados. O psycopg2 não usa prepared statements no servidor e os
+    advisory locks passam a ser de transação (ver locks.py).
+    """
+    opcoes = {
+        "poolclass": AsyncAdaptedQueuePoolMonitorado if assincrono else QueuePoolMonitorado,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "query_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+    if pgbouncer and assincrono:
+        if driver == "asyncpg":
+            opcoes["connect_args"] = {
+                "statement_cache_size": 0,
+                # Nomes únicos: o pooler pode reaproveitar a conexão de outro cliente
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            opcoes["connect_args"] = {"prepare_threshold": None}
+    return opcoes
+
+
 # Criação do engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **opcoes_engine())
 
 # Criação da sessão
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, **opcoes_engine(assincrono=True)) if DB_ASYNC else None
+)
+
+# expire_on_commit=False: atributos continuam acessíveis depois do commit sem
+# um novo SELECT (lazy load implícito não funciona em AsyncSession)
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if DB_ASYNC
+    else None
+)
+
 # Classe base dos models
 Base = declarative_base()
 
@@ -33,6 +110,14 @@ def get_db():
     finally:
         db.close()
 
+# Versão assíncrona de get_db, usada pelas rotas de src/routers/aio
+async def get_async_db():
+    db: AsyncSession = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
 # Teste de conexão (remova isso em produção)
 if __name__ == "__main__":
     try:
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from src.db.database import DB_PGBOUNCER, engine
+
+# Chave do advisory lock que garante uma única coleta de RSS por cluster
+COLETA_LOCK_KEY = 7_340_215_001
+# Chave do advisory lock da reconciliação do contador de curtidas
+RECONCILIACAO_LOCK_KEY = 7_340_215_002
+# Chave do advisory lock do recálculo dos rankings do feed "em alta"
+RANKING_LOCK_KEY = 7_340_215_003
+
+
+@contextmanager
+def advisory_lock(chave: int, bind: Engine = engine, transacional: bool = DB_PGBOUNCER):
+    """
+    Tenta obter um advisory lock do PostgreSQL sem bloquear.
+
+    O lock é de sessão e fica preso a uma conexão própria, mantida aberta até
+    o fim do bloco; assim commits da sessão de trabalho não o liberam. Em
+    outros bancos (ex.: SQLite nos testes) não há lock e o bloco sempre roda.
+
+    Atrás de um pooler em modo transação (db_pgbouncer=true) a conexão do
+    servidor troca a cada transação e um lock de sessão ficaria preso a outro
+    cliente. Nesse caso o lock é de transação: a conexão própria mantém uma
+    transação aberta durante o bloco e o rollback no final o libera.
+
+    uso:
+        with advisory_lock(COLETA_LOCK_KEY) as obtido:
+            if not obtido:
+                ...  # outro processo já está com o lock
+
+    yields:
+    - bool: True se o lock foi obtido.
+    """
+    if bind.dialect.name != "postgresql":
+        yield True
+        return
+
+    if transacional:
+        with bind.connect() as conn:
+            obtido = conn.execute(select(func.pg_try_advisory_xact_lock(chave))).scalar()
+            try:
+                yield bool(obtido)
+            finally:
+                conn.rollback()
+        return
+
+    with bind.connect() as conn:
+        obtido = conn.execute(select(func.pg_try_advisory_lock(chave))).scalar()
+        # Encerra a transação para a conexão não ficar "idle in transaction"
+        conn.commit()
+        try:
+            yield bool(obtido)
+        finally:
+            if obtido:
+                conn.execute(select(func.pg_advisory_unlock(chave)))
+                conn.commit()
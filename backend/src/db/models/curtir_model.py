@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.db.database import Base
@@ -15,9 +15,14 @@ class Curtir(Base):
     """
 
     __tablename__ = "curtidas"
+    __table_args__ = (
+        # Histórico de curtidas do usuário, da mais recente para a mais antiga
+        Index("ix_curtidas_id_usuario_data_curtida", "id_usuario", "data_curtida"),
+    )
 
     id_usuario = Column(Integer, ForeignKey("usuarios.id"), primary_key=True)
-    id_noticia = Column(Integer, ForeignKey("noticias.id"), primary_key=True)
+    # A chave primária começa por id_usuario; a contagem por notícia precisa de índice próprio
+    id_noticia = Column(Integer, ForeignKey("noticias.id"), primary_key=True, index=True)
     data_curtida = Column(DateTime(timezone=True), server_default=func.now())
 
     usuario = relationship("Usuario", back_populates="curtidas")
@@ -12,6 +12,8 @@ class Fonte(Base):
     - url: URL da fonte
     - tipo_extracao: Tipo da fonte (RSS, API, Scraping)
     - nome: Nome da fonte
+    - etag: Último ETag devolvido pelo servidor do feed
+    - last_modified: Último Last-Modified devolvido pelo servidor do feed
     """
 
     __tablename__ = "fontes"
@@ -21,6 +23,10 @@ class Fonte(Base):
     tipo_extracao = Column(String(15), nullable=False)
     nome = Column(String(30), nullable=False, unique=True)
 
+    # Validadores HTTP usados no GET condicional do feed
+    etag = Column(String(512), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+
     # Define a relação com o modelo Noticia
     noticias = relationship("Noticia", back_populates="fonte")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -18,9 +18,15 @@ class Noticia(Base):
     - url: URL da notícia
     - id_fonte: Identificador da fonte da notícia
     - data_coleta: Data de coleta da notícia
+    - qtd_curtidas: Quantidade de curtidas (contador mantido em likes_service)
     """
 
     __tablename__ = "noticias"
+    __table_args__ = (
+        # Ordem e paginação por cursor dos feeds mais recentes e em alta
+        Index("ix_noticias_data_postagem_id", "data_postagem", "id"),
+        Index("ix_noticias_qtd_curtidas_id", "qtd_curtidas", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     titulo = Column(String(200), nullable=False)
@@ -30,6 +36,8 @@ class Noticia(Base):
     url = Column(String(2048), unique=True, nullable=False)
     id_fonte = Column(Integer, ForeignKey("fontes.id"), nullable=False)
     data_coleta = Column(DateTime(timezone=True), server_default=func.now())
+    # Atualizado junto com cada curtida; reconciliado periodicamente pelo worker
+    qtd_curtidas = Column(Integer, nullable=False, default=0, server_default="0")
 
     fonte = relationship("Fonte", back_populates="noticias")
     curtidas = relationship("Curtir", back_populates="noticia")
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from src.db.database import Base
+
+
+class RankingNoticia(Base):
+    """
+    Posição pré-calculada de uma notícia no feed "em alta" de uma janela de tempo.
+
+    Atualizado periodicamente pelo worker (ver ranking_service).
+
+    Attributes:
+    - janela: Janela de tempo do ranking (week, month, year, all)
+    - posicao: Posição da notícia no ranking, a partir de 1
+    - id_noticia: Identificador da notícia
+    - qtd_curtidas: Curtidas da notícia no momento do cálculo
+    - atualizado_em: Data do cálculo
+    """
+
+    __tablename__ = "rankings_noticias"
+
+    janela = Column(String(5), primary_key=True)
+    posicao = Column(Integer, primary_key=True)
+    id_noticia = Column(Integer, ForeignKey("noticias.id", ondelete="CASCADE"), nullable=False)
+    qtd_curtidas = Column(Integer, nullable=False)
+    atualizado_em = Column(DateTime(timezone=True), server_default=func.now())
+
+    noticia = relationship("Noticia")
+
+    def __repr__(self):
+        return f"<RankingNoticia(janela='{self.janela}', posicao={self.posicao}, noticia={self.id_noticia})>"
@@ -8,7 +8,7 @@ class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False, index=True)
     token = Column(String, unique=True, nullable=False)
     criado_em = Column(DateTime(timezone=True), default=datetime.utcnow)
     expira_em = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,72 @@
+"""
+Pools de conexão com medição do tempo de espera no checkout.
+
+Além do que o QueuePool já informa (conexões em uso, overflow), registram
+quantos checkouts houve, quanto tempo esperaram por uma conexão (inclui abrir
+uma nova conexão, com o handshake TLS) e quantos estouraram pool_timeout.
+"""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class _MedicaoEspera:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_medicao = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._lock_medicao:
+                self.timeouts += 1
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._lock_medicao:
+                self.checkouts += 1
+                self.espera_total += espera
+                self.espera_maxima = max(self.espera_maxima, espera)
+
+
+class QueuePoolMonitorado(_MedicaoEspera, QueuePool):
+    pass
+
+
+class AsyncAdaptedQueuePoolMonitorado(_MedicaoEspera, AsyncAdaptedQueuePool):
+    pass
+
+
+def estatisticas_pool(pool) -> dict:
+    """
+    Situação atual do pool e tempos de espera acumulados desde o início do
+    processo.
+
+    returns:
+    - dict: tamanho, em_uso, disponiveis, overflow, checkouts, timeouts,
+      espera_media_ms e espera_maxima_ms.
+    """
+    estatisticas = {
+        "tamanho": pool.size(),
+        "em_uso": pool.checkedout(),
+        "disponiveis": pool.checkedin(),
+        # Conexões além de pool_size (negativo enquanto o pool não está cheio)
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, _MedicaoEspera):
+        checkouts = pool.checkouts
+        estatisticas.update({
+            "checkouts": checkouts,
+            "timeouts": pool.timeouts,
+            "espera_media_ms": round(pool.espera_total / checkouts * 1000, 3) if checkouts else 0.0,
+            "espera_maxima_ms": round(pool.espera_maxima * 1000, 3),
+        })
+    return estatisticas
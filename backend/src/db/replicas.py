@@ -0,0 +1,172 @@
+"""
+Roteamento de leituras para réplicas do PostgreSQL.
+
+As sessões de leitura (get_read_db, usadas pelos feeds, pela notícia por id e
+pelo perfil) mandam os SELECTs para uma réplica sorteada em db_replica_urls;
+qualquer flush ou DML vai para o primário. Curtidas, coleta, autenticação e o
+worker continuam em get_db/SessionLocal, só no primário.
+
+Leia-suas-escritas: depois de uma curtida, as leituras do mesmo usuário ficam
+no primário por db_replica_sticky_seconds (atraso máximo esperado da réplica).
+A marca fica no Redis do cache de feeds, para valer em todos os processos da
+API; por isso as réplicas exigem cache_backend=redis. Sem ele, db_replica_urls
+é ignorado e tudo fica no primário.
+"""
+import os
+import random
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.auth.jwt import decode_token
+from src.db.database import (
+    DB_ASYNC,
+    DB_ASYNC_DRIVER,
+    async_engine,
+    engine,
+    opcoes_engine,
+)
+from src.utils.cache import RedisCache, criar_cache
+
+load_dotenv()
+
+# URLs SQLAlchemy das réplicas, separadas por vírgula (vazio = tudo no primário)
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("db_replica_urls", "").split(",") if url.strip()]
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("db_replica_sticky_seconds", "10"))
+
+
+def _url_assincrona(url: str):
+    """Mesma réplica, com o driver assíncrono configurado em db_async_driver."""
+    url = make_url(url)
+    query = dict(url.query)
+    if DB_ASYNC_DRIVER == "asyncpg" and "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    drivername = "postgresql+asyncpg" if DB_ASYNC_DRIVER == "asyncpg" else "postgresql+psycopg"
+    return url.set(drivername=drivername, query=query)
+
+
+def _criar_marcas() -> RedisCache | None:
+    if not DB_REPLICA_URLS:
+        return None
+    cache = criar_cache()
+    if isinstance(cache, RedisCache):
+        # Compartilhadas entre os processos da API, fora das chaves dos feeds
+        return RedisCache(cache.client, ttl=DB_REPLICA_STICKY_SECONDS, prefixo="econnect:primario:")
+    # Uma marca na memória valeria só para o processo que recebeu a escrita:
+    # os outros processos da API continuariam lendo da réplica atrasada
+    print("⚠️ db_replica_urls exige cache_backend=redis (leia-suas-escritas entre processos). Lendo só do primário.")
+    return None
+
+
+# Usuários que escreveram há pouco (chave: id do usuário)
+_marcas = _criar_marcas()
+
+_urls_ativas = DB_REPLICA_URLS if _marcas is not None else []
+
+replica_engines = [create_engine(url, **opcoes_engine()) for url in _urls_ativas]
+async_replica_engines = (
+    [create_async_engine(_url_assincrona(url), **opcoes_engine(assincrono=True)) for url in _urls_ativas]
+    if DB_ASYNC
+    else []
+)
+
+
+class RoutingSession(Session):
+    """
+    Sessão que lê de uma réplica e escreve no primário.
+
+    A réplica é sorteada uma vez por sessão, para que as consultas de uma
+    mesma requisição vejam o mesmo estado. Com info["primario"] = True (ou sem
+    réplicas configuradas) tudo vai para o primário.
+    """
+
+    primario = engine
+    replicas = replica_engines
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            not self.replicas
+            or self.info.get("primario")
+            or self._flushing
+            or getattr(clause, "is_dml", False)
+        ):
+            return self.primario
+        if "replica" not in self.info:
+            self.info["replica"] = random.choice(self.replicas)
+        return self.info["replica"]
+
+
+class AsyncRoutingSession(RoutingSession):
+    """Sessão síncrona por trás da AsyncSession de leitura (recebe os sync_engine)."""
+
+    primario = async_engine.sync_engine if async_engine is not None else None
+    replicas = [replica.sync_engine for replica in async_replica_engines]
+
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+AsyncReadSessionLocal = (
+    async_sessionmaker(sync_session_class=AsyncRoutingSession, autoflush=False, expire_on_commit=False)
+    if DB_ASYNC
+    else None
+)
+
+
+def marcar_escrita(usuario_id: int):
+    """
+    Registra que o usuário acabou de escrever no primário; as próximas leituras
+    dele ficam no primário até a réplica alcançar.
+
+    args:
+    - usuario_id (int): ID do usuário que escreveu.
+    """
+    if replica_engines or async_replica_engines:
+        _marcas.set(str(usuario_id), "1")
+
+
+def escreveu_recentemente(usuario_id: int) -> bool:
+    return _marcas is not None and _marcas.get(str(usuario_id)) is not None
+
+
+def _usuario_da_requisicao(request: Request) -> int | None:
+    # Só decodifica o token; a autenticação de verdade fica com as dependências de auth
+    esquema, _, credenciais = request.headers.get("Authorization", "").partition(" ")
+    if esquema.lower() != "bearer" or not credenciais:
+        return None
+    try:
+        payload = decode_token(credenciais)
+    except HTTPException:
+        return None
+    if payload is None or "sub" not in payload:
+        return None
+    return int(payload["sub"])
+
+
+def _leitura_no_primario(request: Request) -> bool:
+    if not (replica_engines or async_replica_engines):
+        return False
+    usuario_id = _usuario_da_requisicao(request)
+    return usuario_id is not None and escreveu_recentemente(usuario_id)
+
+
+def get_read_db(request: Request):
+    db: Session = ReadSessionLocal()
+    db.info["primario"] = _leitura_no_primario(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Versão assíncrona de get_read_db, usada pelas rotas de src/routers/aio
+async def get_async_read_db(request: Request):
+    db: AsyncSession = AsyncReadSessionLocal()
+    db.sync_session.info["primario"] = _leitura_no_primario(request)
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,115 @@
+"""
+Rotas de notícias com AsyncSession, incluídas no lugar de
+src/routers/news_router.py quando db_async=true. Mesmos caminhos, parâmetros
+e respostas; a coleta manual (/fetch-rss) continua sendo a rota síncrona.
+"""
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.api_key import verify_api_key
+from src.auth.auth import get_current_user_async, get_principal, get_principal_optional
+from src.db.database import get_async_db
+from src.db.replicas import get_async_read_db, marcar_escrita
+from src.routers.news_router import handle_rss_fetch, set_next_cursor
+from src.schemas.noticia_schema import NoticiaResponse
+from src.services.aio.likes_service import handleLike
+from src.services.aio.news_service import (
+    get_liked_news,
+    get_news_by_id,
+    get_news_feed,
+    marcar_curtidos,
+)
+from src.services.aio.ranking_service import get_hottest_feed
+from src.services.feed_cache_service import get_feed_em_cache_async
+from src.services.news_service import get_next_cursor
+from src.utils.http_cache import responder_com_etag
+
+news_router = APIRouter(
+    prefix="/news", tags=["Notícias"], dependencies=[Depends(verify_api_key)]
+)
+
+
+@news_router.get("/feed/latest", response_model=list[NoticiaResponse])
+async def latest_feed(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=10),  # Limite máximo de 10 notícias por vez
+    cursor: str | None = Query(None),  # Valor de X-Next-Cursor da página anterior
+    db: AsyncSession = Depends(get_async_read_db),
+    usuario=Depends(get_principal_optional),
+):
+    async def carregar():
+        noticias = await get_news_feed(None, db, skip=skip, limit=limit, cursor=cursor)
+        return noticias, get_next_cursor(noticias, limit)
+
+    params = {"skip": skip, "limit": limit, "cursor": cursor}
+    noticias, next_cursor = await get_feed_em_cache_async("latest", params, carregar, db)
+    set_next_cursor(response, next_cursor)
+    noticias = await marcar_curtidos(noticias, usuario, db)
+    return responder_com_etag(request, response, noticias, privado=usuario is not None)
+
+
+@news_router.get("/feed/hottest", response_model=list[NoticiaResponse])
+async def hottest_feed(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=10),  # Limite máximo de 10 notícias por vez
+    time_filter: str = Query("all", regex="^(week|month|year|all)$"),  # Filtro de tempo
+    cursor: str | None = Query(None),  # Valor de X-Next-Cursor da página anterior
+    db: AsyncSession = Depends(get_async_read_db),
+    usuario=Depends(get_principal_optional),
+):
+    async def carregar():
+        return await get_hottest_feed(
+            None, db, skip=skip, limit=limit, time_filter=time_filter, cursor=cursor
+        )
+
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "time_filter": time_filter}
+    noticias, next_cursor = await get_feed_em_cache_async("hottest", params, carregar, db)
+    set_next_cursor(response, next_cursor)
+    noticias = await marcar_curtidos(noticias, usuario, db)
+    return responder_com_etag(request, response, noticias, privado=usuario is not None)
+
+
+@news_router.get("/feed/liked", response_model=list[NoticiaResponse])
+async def liked_history(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=10),  # Limite máximo de 10 notícias por vez
+    cursor: str | None = Query(None),  # Valor de X-Next-Cursor da página anterior
+    db: AsyncSession = Depends(get_async_read_db),
+    usuario=Depends(get_principal),
+):
+    noticias, next_cursor = await get_liked_news(usuario, db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return responder_com_etag(request, response, noticias, privado=True)
+
+
+@news_router.get("/", response_model=NoticiaResponse)
+async def get_news(
+    request: Request,
+    response: Response,
+    news_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    usuario=Depends(get_principal_optional),
+):
+    noticia = await get_news_by_id(usuario, news_id, db)
+    return responder_com_etag(request, response, noticia, privado=usuario is not None)
+
+
+@news_router.post("/handle-like/{news_id}")
+async def handle_like(
+    news_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    usuario=Depends(get_current_user_async),
+):
+    resultado = await handleLike(db, usuario, news_id)
+    marcar_escrita(usuario.id)
+    return resultado
+
+
+# Coleta manual: mesma rota síncrona do router padrão
+news_router.add_api_route("/fetch-rss", handle_rss_fetch, methods=["POST"])
@@ -0,0 +1,56 @@
+"""
+Rotas de usuário com AsyncSession, incluídas no lugar de
+src/routers/user_router.py quando db_async=true.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.api_key import verify_api_key
+from src.auth.auth import get_current_user_async, get_current_user_leitura_async
+from src.db.database import get_async_db
+from src.db.replicas import marcar_escrita
+from src.routers.user_router import get_profile
+from src.schemas.usuario_schema import (
+    UpdateUsuario,
+    UpdateUsuarioResponse,
+    UsuarioProfileResponse,
+)
+from src.services.aio.user_service import delete_usuario, update_usuario
+
+user_router = APIRouter(
+    prefix="/user", tags=["Usuário"], dependencies=[Depends(verify_api_key)]
+)
+
+
+@user_router.delete("/")
+async def delete(db: AsyncSession = Depends(get_async_db), usuario=Depends(get_current_user_async)):
+    return await delete_usuario(usuario, db)
+
+
+@user_router.patch("/", response_model=UpdateUsuarioResponse)
+async def update(
+    nome: Optional[str] = Form(None),
+    email: Optional[str] = Form(None),
+    senha: Optional[str] = Form(None),
+    foto_perfil: UploadFile = File(None),
+    db: AsyncSession = Depends(get_async_db),
+    usuario=Depends(get_current_user_async),
+):
+    # Converte strings vazias para None para evitar erro de validação
+    nome = nome if nome not in (None, "") else None
+    email = email if email not in (None, "") else None
+    senha = senha if senha not in (None, "") else None
+    updated_usuario = UpdateUsuario(
+        nome=nome, email=email, senha=senha, foto_perfil=foto_perfil
+    )
+
+    resposta = await update_usuario(usuario, db, updated_usuario)
+    marcar_escrita(usuario.id)
+    return resposta
+
+
+@user_router.get("/", response_model=UsuarioProfileResponse)
+async def get_profile_async(usuario=Depends(get_current_user_leitura_async)):
+    return get_profile(usuario)
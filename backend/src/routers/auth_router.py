@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import Optional, Union
 from src.auth.jwt import (
@@ -22,8 +22,9 @@ auth_router = APIRouter(
 )
 
 
+# Síncrona (threadpool): o hash da senha espera o executor do argon2
 @auth_router.post("/register", response_model=UsuarioResponse, status_code=201)
-async def register(
+def register(
     nome: str = Form(...),
     email: str = Form(...),
     senha: str = Form(...),
@@ -47,8 +48,10 @@ async def register(
 
 
 @auth_router.post("/login", response_model=Token)
-def login(credentials: LoginSchema, db: Session = Depends(get_db)):
-    user = authenticate_usuario(credentials, db)
+def login(
+    credentials: LoginSchema, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
+    user = authenticate_usuario(credentials, db, background_tasks)
 
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)}, db=db)
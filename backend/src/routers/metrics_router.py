@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+
+from src.auth.api_key import verify_api_key
+from src.auth.password import get_executor_senhas
+from src.db.database import async_engine, engine
+from src.db.pool import estatisticas_pool
+from src.db.replicas import async_replica_engines, replica_engines
+from src.services.feed_cache_service import metricas_cache
+
+metrics_router = APIRouter(
+    prefix="/metrics", tags=["Métricas"], dependencies=[Depends(verify_api_key)]
+)
+
+
+# Hits, misses e ocupação do cache de feeds deste processo
+@metrics_router.get("/cache")
+def cache_metrics():
+    return metricas_cache()
+
+
+# Conexões em uso, overflow e tempo de espera no pool de cada engine
+@metrics_router.get("/pool")
+def pool_metrics():
+    return {
+        "sync": estatisticas_pool(engine.pool),
+        "async": estatisticas_pool(async_engine.sync_engine.pool) if async_engine is not None else None,
+        "replicas": [estatisticas_pool(replica.pool) for replica in replica_engines],
+        "replicas_async": [estatisticas_pool(replica.sync_engine.pool) for replica in async_replica_engines],
+    }
+
+
+# Ocupação do executor do argon2 e pedidos recusados com 503
+@metrics_router.get("/passwords")
+def password_metrics():
+    return get_executor_senhas().stats()
@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from src.auth.auth import get_current_user, get_current_user_optional
+from src.auth.auth import get_current_user, get_principal, get_principal_optional
 from src.db.database import get_db
+from src.db.replicas import get_read_db, marcar_escrita
 from src.schemas.noticia_schema import NoticiaCreate, NoticiaResponse
 from src.auth.api_key import verify_api_key
+from src.db.locks import COLETA_LOCK_KEY, advisory_lock
 from src.services.likes_service import handleLike
-from src.services.news_service import create_news, get_news_feed, get_news_by_id, get_liked_news
+from src.services.news_service import (
+    create_news,
+    get_liked_news,
+    get_news_by_id,
+    get_news_feed,
+    get_next_cursor,
+    marcar_curtidos,
+)
+from src.services.feed_cache_service import get_feed_em_cache
+from src.services.ranking_service import get_hottest_feed
+from src.utils.http_cache import responder_com_etag
 from dotenv import load_dotenv
+import asyncio
 import os
 
 from src.services.rss_service import get_news_from_rss
+from src.services.summary_service import encerrar_executor
 
 load_dotenv()
 
@@ -18,48 +32,99 @@ news_router = APIRouter(
     prefix="/news", tags=["Notícias"], dependencies=[Depends(verify_api_key)]
 )
 
+# Cabeçalho com o cursor da próxima página (ausente na última página)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, next_cursor: str | None):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
 @news_router.get("/feed/latest", response_model=list[NoticiaResponse])
 def latest_feed(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=10),  # Limite máximo de 10 notícias por vez
-    db: Session = Depends(get_db),
-    usuario=Depends(get_current_user_optional),
+    cursor: str | None = Query(None),  # Valor de X-Next-Cursor da página anterior
+    db: Session = Depends(get_read_db),
+    usuario=Depends(get_principal_optional),
 ):
-    return get_news_feed(usuario, db, skip=skip, limit=limit)
+    # A página é a mesma para todos e vem do cache de feeds; só o campo
+    # curtido depende do usuário e é aplicado por cima
+    def carregar():
+        noticias = get_news_feed(None, db, skip=skip, limit=limit, cursor=cursor)
+        return noticias, get_next_cursor(noticias, limit)
+
+    params = {"skip": skip, "limit": limit, "cursor": cursor}
+    noticias, next_cursor = get_feed_em_cache("latest", params, carregar, db)
+    set_next_cursor(response, next_cursor)
+    noticias = marcar_curtidos(noticias, usuario, db)
+    return responder_com_etag(request, response, noticias, privado=usuario is not None)
 
 
 @news_router.get("/feed/hottest", response_model=list[NoticiaResponse])
 def hottest_feed(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=10),  # Limite máximo de 10 notícias por vez
     time_filter: str = Query("all", regex="^(week|month|year|all)$"),  # Filtro de tempo
-    db: Session = Depends(get_db),
-    usuario=Depends(get_current_user_optional),
+    cursor: str | None = Query(None),  # Valor de X-Next-Cursor da página anterior
+    db: Session = Depends(get_read_db),
+    usuario=Depends(get_principal_optional),
 ):
-    return get_news_feed(usuario, db, skip=skip, limit=limit, order_by="qtd_curtidas", time_filter=time_filter)
+    # Ordem do ranking pré-calculado pelo worker (ver ranking_service);
+    # página compartilhada em cache, como no feed latest
+    def carregar():
+        return get_hottest_feed(
+            None, db, skip=skip, limit=limit, time_filter=time_filter, cursor=cursor
+        )
+
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "time_filter": time_filter}
+    noticias, next_cursor = get_feed_em_cache("hottest", params, carregar, db)
+    set_next_cursor(response, next_cursor)
+    noticias = marcar_curtidos(noticias, usuario, db)
+    return responder_com_etag(request, response, noticias, privado=usuario is not None)
 
 
 @news_router.get("/feed/liked", response_model=list[NoticiaResponse])
 def liked_history(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=10),  # Limite máximo de 10 notícias por vez
-    db: Session = Depends(get_db),
-    usuario=Depends(get_current_user),
+    cursor: str | None = Query(None),  # Valor de X-Next-Cursor da página anterior
+    db: Session = Depends(get_read_db),
+    usuario=Depends(get_principal),
 ):
-    return get_liked_news(usuario, db, skip=skip, limit=limit)
+    noticias, next_cursor = get_liked_news(usuario, db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return responder_com_etag(request, response, noticias, privado=True)
 
 @news_router.get("/", response_model=NoticiaResponse)
 def get_news(
-    news_id: int, db: Session = Depends(get_db), usuario=Depends(get_current_user_optional)
+    request: Request,
+    response: Response,
+    news_id: int,
+    db: Session = Depends(get_read_db),
+    usuario=Depends(get_principal_optional),
 ):
-    return get_news_by_id(usuario, news_id, db)
+    noticia = get_news_by_id(usuario, news_id, db)
+    return responder_com_etag(request, response, noticia, privado=usuario is not None)
 
 
 @news_router.post("/handle-like/{news_id}")
 def handle_like(
     news_id: int, db: Session = Depends(get_db), usuario=Depends(get_current_user)
 ):
-    return handleLike(db, usuario, news_id)
+    # Escrita: o usuário é confirmado no primário, não no cache/réplica, para
+    # que a curtida não referencie um usuário já excluído
+    resultado = handleLike(db, usuario, news_id)
+    # Leituras seguintes do usuário no primário até a réplica receber a curtida
+    marcar_escrita(usuario.id)
+    return resultado
 
 #@news_router.post("/register", response_model=NoticiaResponse)
 def register_news(
@@ -75,5 +140,19 @@ def register_news(
     return create_news(news, db)
 
 @news_router.post("/fetch-rss")
-async def handle_rss_fetch(db: Session = Depends(get_db)):
-     return await get_news_from_rss(db)
\ No newline at end of file
+def handle_rss_fetch(db: Session = Depends(get_db)):
+    # Rota síncrona (roda no threadpool): a coleta usa a Session síncrona entre
+    # os downloads, então ganha um event loop próprio em vez de bloquear o da API
+    # Mesmo lock do worker de coleta: nunca roda junto com outra coleta
+    with advisory_lock(COLETA_LOCK_KEY) as obtido:
+        if not obtido:
+            raise HTTPException(
+                status_code=409,
+                detail="Já existe uma coleta de notícias em andamento.",
+            )
+        try:
+            return asyncio.run(get_news_from_rss(db))
+        finally:
+            # A coleta contínua é do worker: os processos de resumo (cada um com
+            # o spaCy carregado) não ficam ocupando memória na API
+            encerrar_executor()
\ No newline at end of file
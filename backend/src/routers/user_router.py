@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, File, Form, UploadFile
 from sqlalchemy.orm import Session
 
 from src.auth.api_key import verify_api_key
-from src.auth.auth import get_current_user
+from src.auth.auth import get_current_user, get_current_user_leitura
 from src.db.database import get_db
+from src.db.replicas import marcar_escrita
 from src.schemas.usuario_schema import (
     UpdateUsuario,
     UpdateUsuarioResponse,
@@ -40,11 +41,14 @@ def update(
         nome=nome, email=email, senha=senha, foto_perfil=foto_perfil
     )
 
-    return update_usuario(usuario, db, updated_usuario)
+    resposta = update_usuario(usuario, db, updated_usuario)
+    # O perfil é lido da réplica: o usuário vê a própria alteração logo em seguida
+    marcar_escrita(usuario.id)
+    return resposta
 
 
 @user_router.get("/", response_model=UsuarioProfileResponse)
-def get_profile(usuario=Depends(get_current_user)):
+def get_profile(usuario=Depends(get_current_user_leitura)):
     return UsuarioProfileResponse(
         nome=str(usuario.nome),
         email=str(usuario.email),
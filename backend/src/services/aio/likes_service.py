@@ -0,0 +1,42 @@
+"""Versão AsyncSession de likes_service, usada com db_async=true."""
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models.curtir_model import Curtir
+from src.db.models.noticia_model import Noticia
+from src.db.models.usuario_model import Usuario
+from src.services.likes_service import insert_curtida, delete_curtida
+
+
+async def _get_like(user_id: int, news_id: int, db: AsyncSession):
+    return await db.scalar(
+        select(Curtir).where(Curtir.id_usuario == user_id, Curtir.id_noticia == news_id)
+    )
+
+
+async def _alterar_qtd_curtidas(news_id: int, delta: int, db: AsyncSession) -> int:
+    # UPDATE atômico (qtd = qtd + delta): curtidas simultâneas não se sobrescrevem
+    qtd_curtidas = await db.scalar(
+        update(Noticia)
+        .where(Noticia.id == news_id)
+        .values(qtd_curtidas=Noticia.qtd_curtidas + delta)
+        .returning(Noticia.qtd_curtidas)
+        .execution_options(synchronize_session=False)
+    )
+    return qtd_curtidas or 0
+
+
+async def handleLike(db: AsyncSession, usuario: Usuario, news_id: int):
+    user_id = getattr(usuario, "id", None)
+    if user_id is None:
+        raise ValueError("Usuario instance does not have a valid 'id' attribute.")
+    liked = await _get_like(user_id, news_id, db) is None
+    stmt = insert_curtida(user_id, news_id, db) if liked else delete_curtida(user_id, news_id)
+    alterada = (await db.execute(stmt.returning(Curtir.id_noticia))).first()
+    # O contador só muda se a curtida mudou de fato (ver likes_service.handleLike)
+    if alterada is not None:
+        likes = await _alterar_qtd_curtidas(news_id, 1 if liked else -1, db)
+    else:
+        likes = await db.scalar(select(Noticia.qtd_curtidas).where(Noticia.id == news_id)) or 0
+    await db.commit()
+    return {"liked": liked, "likes": likes}
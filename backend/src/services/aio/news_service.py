@@ -0,0 +1,147 @@
+"""
+Versão AsyncSession de news_service, usada com db_async=true.
+
+As consultas são as mesmas do serviço síncrono, escritas com select();
+cursores, filtros de tempo e a montagem das respostas são reaproveitados.
+"""
+from fastapi import HTTPException
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from src.db.models.curtir_model import Curtir
+from src.db.models.noticia_model import Noticia
+from src.db.models.usuario_model import Usuario
+from src.schemas.noticia_schema import NoticiaResponse
+from src.services.news_service import (
+    build_noticia_response,
+    campos_de_curtida,
+    get_time_filter_date,
+    ler_cursor,
+)
+from src.utils.cursor import encode_cursor
+
+
+async def get_ids_curtidos(
+    usuario: Usuario | None, ids_noticias: list[int], db: AsyncSession
+) -> set[int]:
+    if usuario is None or not ids_noticias:
+        return set()
+    resultado = await db.scalars(
+        select(Curtir.id_noticia).where(
+            Curtir.id_usuario == usuario.id, Curtir.id_noticia.in_(ids_noticias)
+        )
+    )
+    return set(resultado)
+
+
+async def get_curtidas_atuais(
+    usuario: Usuario | None, ids_noticias: list[int], db: AsyncSession
+) -> dict[int, tuple[int, bool]]:
+    if usuario is None or not ids_noticias:
+        return {}
+    linhas = await db.execute(
+        select(Noticia.id, Noticia.qtd_curtidas, Curtir.id_noticia)
+        .outerjoin(
+            Curtir, and_(Curtir.id_noticia == Noticia.id, Curtir.id_usuario == usuario.id)
+        )
+        .where(Noticia.id.in_(ids_noticias))
+    )
+    return {id_noticia: (qtd, curtida is not None) for id_noticia, qtd, curtida in linhas}
+
+
+async def montar_pagina(
+    noticias: list[Noticia], usuario: Usuario | None, db: AsyncSession
+) -> list[NoticiaResponse]:
+    # Notícias já vêm com a fonte carregada; curtido sai de uma consulta IN
+    curtidas = await get_ids_curtidos(usuario, [noticia.id for noticia in noticias], db)
+    return [
+        build_noticia_response(noticia, usuario, db, curtido=noticia.id in curtidas)
+        for noticia in noticias
+    ]
+
+
+async def marcar_curtidos(
+    noticias: list[NoticiaResponse], usuario: Usuario | None, db: AsyncSession
+) -> list[NoticiaResponse]:
+    if usuario is None:
+        return noticias
+    atuais = await get_curtidas_atuais(usuario, [noticia.id for noticia in noticias], db)
+    return [
+        noticia.model_copy(update=campos_de_curtida(noticia, atuais)) for noticia in noticias
+    ]
+
+
+async def get_news_feed(
+    usuario: Usuario | None,
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    order_by: str = "data_postagem",
+    time_filter: str = "all",
+    cursor: str | None = None,
+) -> list[NoticiaResponse]:
+    consulta = select(Noticia).options(joinedload(Noticia.fonte))
+
+    # O filtro de tempo só vale para o feed ordenado por curtidas
+    if order_by == "qtd_curtidas":
+        date_limit = get_time_filter_date(time_filter)
+        if date_limit:
+            consulta = consulta.where(Noticia.data_postagem >= date_limit)
+
+    chave = getattr(Noticia, order_by)
+    if cursor:
+        valor, id_noticia = ler_cursor(cursor, order_by)
+        consulta = consulta.where(tuple_(chave, Noticia.id) < tuple_(valor, id_noticia))
+
+    consulta = consulta.order_by(chave.desc(), Noticia.id.desc())
+    if not cursor:
+        consulta = consulta.offset(skip)
+
+    noticias = (await db.scalars(consulta.limit(limit))).all()
+    return await montar_pagina(noticias, usuario, db)
+
+
+async def get_liked_news(
+    usuario: Usuario,
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+) -> tuple[list[NoticiaResponse], str | None]:
+    consulta = (
+        select(Noticia, Curtir.data_curtida)
+        .join(Curtir, Curtir.id_noticia == Noticia.id)
+        .options(joinedload(Noticia.fonte))
+        .where(Curtir.id_usuario == usuario.id)
+    )
+
+    if cursor:
+        data_curtida, id_noticia = ler_cursor(cursor, "data_curtida")
+        consulta = consulta.where(
+            tuple_(Curtir.data_curtida, Curtir.id_noticia) < tuple_(data_curtida, id_noticia)
+        )
+
+    consulta = consulta.order_by(Curtir.data_curtida.desc(), Curtir.id_noticia.desc())
+    if not cursor:
+        consulta = consulta.offset(skip)
+
+    linhas = (await db.execute(consulta.limit(limit))).all()
+    noticias = [build_noticia_response(n, usuario, db, curtido=True) for n, _ in linhas]
+
+    next_cursor = None
+    if len(linhas) == limit:
+        ultima, data_curtida = linhas[-1]
+        next_cursor = encode_cursor(
+            {"o": "data_curtida", "v": data_curtida.isoformat(), "id": ultima.id}
+        )
+    return noticias, next_cursor
+
+
+async def get_news_by_id(usuario: Usuario | None, news_id: int, db: AsyncSession) -> NoticiaResponse:
+    noticia = await db.scalar(
+        select(Noticia).options(joinedload(Noticia.fonte)).where(Noticia.id == news_id)
+    )
+    if not noticia:
+        raise HTTPException(status_code=404, detail="Notícia não encontrada")
+    return (await montar_pagina([noticia], usuario, db))[0]
@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models.usuario_model import Usuario
+from src.schemas.noticia_schema import NoticiaResponse
+from src.services import ranking_service
+
+
+async def get_hottest_feed(
+    usuario: Usuario | None,
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    time_filter: str = "all",
+    cursor: str | None = None,
+) -> tuple[list[NoticiaResponse], str | None]:
+    # Reaproveita o serviço síncrono (ranking com várias alternativas ao vivo)
+    # via run_sync: as consultas continuam assíncronas, sem ocupar threads
+    return await db.run_sync(
+        lambda sessao: ranking_service.get_hottest_feed(
+            usuario, sessao, skip=skip, limit=limit, time_filter=time_filter, cursor=cursor
+        )
+    )
@@ -0,0 +1,123 @@
+"""Versão AsyncSession de user_service, usada com db_async=true."""
+import asyncio
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models.curtir_model import Curtir
+from src.db.models.noticia_model import Noticia
+from src.db.models.refresh_tokens_model import RefreshToken
+from src.db.models.usuario_model import Usuario
+from src.schemas.usuario_schema import UpdateUsuario, UpdateUsuarioResponse
+from src.auth.password import hash_password, verify_password
+from src.services.user_cache_service import invalidar_usuario
+from src.utils.handle_user_image import delete_user_image, save_user_image
+
+
+async def get_usuario(user_id: int, db: AsyncSession) -> Usuario | None:
+    return await db.get(Usuario, user_id)
+
+
+async def delete_usuario(usuario: Usuario, db: AsyncSession):
+    try:
+        # Desconta as curtidas do usuário do contador das notícias
+        await db.execute(
+            update(Noticia)
+            .where(Noticia.id.in_(select(Curtir.id_noticia).where(Curtir.id_usuario == usuario.id)))
+            .values(qtd_curtidas=Noticia.qtd_curtidas - 1)
+            .execution_options(synchronize_session=False)
+        )
+        # Deleta todas as curtidas do usuário e os refresh tokens relacionados
+        await db.execute(delete(Curtir).where(Curtir.id_usuario == usuario.id))
+        await db.execute(delete(RefreshToken).where(RefreshToken.usuario_id == usuario.id))
+        # Deleta a imagem do usuário (E/S de disco fora do event loop)
+        await asyncio.to_thread(delete_user_image, int(getattr(usuario, "id")))
+
+        await db.delete(usuario)
+        await db.commit()
+        invalidar_usuario(usuario.id)
+
+        return {"detail": f"Usuário {usuario.email} e curtidas removidos com sucesso"}
+
+    except Exception as e:
+        print(str(e))
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao deletar usuário.",
+        )
+
+
+async def update_usuario(
+    usuario: Usuario, db: AsyncSession, updated_usuario: UpdateUsuario
+) -> UpdateUsuarioResponse:
+    """
+    Mesmas validações de user_service.update_usuario. O Argon2 e a gravação
+    da imagem rodam em threads (asyncio.to_thread), para não travar o event
+    loop enquanto o hash ou o disco trabalham.
+    """
+    try:
+        updated = False
+
+        # Verifica o nome.
+        if updated_usuario.nome is not None:
+            if updated_usuario.nome.strip() == "":
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Nome não pode ser vazio",
+                )
+            if updated_usuario.nome != usuario.nome:
+                setattr(usuario, "nome", updated_usuario.nome)
+                updated = True
+
+        # Verifica o email.
+        if updated_usuario.email is not None:
+            if updated_usuario.email != usuario.email:
+                existing_email = await db.scalar(
+                    select(Usuario.id).where(Usuario.email == updated_usuario.email).limit(1)
+                )
+                if existing_email is not None:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Email já cadastrado",
+                    )
+                setattr(usuario, "email", str(updated_usuario.email))
+                updated = True
+
+        # Verifica a senha.
+        if updated_usuario.senha is not None:
+            if updated_usuario.senha.strip() == "":
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Senha não pode ser vazia",
+                )
+            if not await asyncio.to_thread(
+                verify_password, updated_usuario.senha, str(usuario.senha_hash)
+            ):
+                senha_hash = await asyncio.to_thread(hash_password, updated_usuario.senha)
+                setattr(usuario, "senha_hash", senha_hash)
+                updated = True
+
+        if updated_usuario.foto_perfil is not None:
+            filepath = await asyncio.to_thread(
+                save_user_image, updated_usuario.foto_perfil, getattr(usuario, "id")
+            )
+            setattr(usuario, "foto_perfil", filepath)
+            updated = True
+
+        if updated:
+            await db.commit()
+            await db.refresh(usuario)
+            invalidar_usuario(usuario.id)
+
+        return UpdateUsuarioResponse(nome=str(usuario.nome), email=str(usuario.email))
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao atualizar usuário.",
+        )
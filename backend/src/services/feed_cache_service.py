@@ -0,0 +1,161 @@
+import json
+import os
+from typing import Awaitable, Callable
+from urllib.parse import urlencode
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.db.models.noticia_model import Noticia
+from src.db.models.ranking_model import RankingNoticia
+from src.schemas.noticia_schema import NoticiaResponse
+from src.utils.cache import MemoryCache, get_cache
+
+load_dotenv()
+
+# Geração dos feeds: incrementada a cada coleta e recálculo dos rankings
+FEEDS_GERACAO = "feeds"
+# Por quantos segundos a versão dos dados lida do banco é reaproveitada
+CACHE_VERSION_SECONDS = float(os.getenv("cache_version_seconds", "5"))
+
+PaginaFeed = tuple[list[NoticiaResponse], str | None]
+
+
+def chave_feed(endpoint: str, params: dict, geracao: int | str) -> str:
+    # Ex.: feeds:3-1520.20240101120000000000:hottest:cursor=&limit=10&skip=0&time_filter=week
+    valores = {nome: "" if valor is None else valor for nome, valor in params.items()}
+    return f"{FEEDS_GERACAO}:{geracao}:{endpoint}:{urlencode(sorted(valores.items()))}"
+
+
+# Versão dos dados no banco, reaproveitada por alguns segundos no processo
+_versoes = MemoryCache(max_entries=1, ttl=CACHE_VERSION_SECONDS)
+
+
+def _consulta_versao():
+    # Última notícia coletada e último cálculo dos rankings, numa só ida ao banco
+    return select(
+        select(func.max(Noticia.id)).scalar_subquery(),
+        select(func.max(RankingNoticia.atualizado_em)).scalar_subquery(),
+    )
+
+
+def _formatar_versao(ultima_noticia, ultimo_ranking) -> str:
+    ranking = ultimo_ranking.strftime("%Y%m%d%H%M%S%f") if ultimo_ranking else "0"
+    return f"{ultima_noticia or 0}.{ranking}"
+
+
+def _geracao(cache, versao: str | None) -> str:
+    # O contador do cache só chega aos outros processos com o Redis; a versão
+    # do banco faz a coleta e o recálculo do worker valerem também para o
+    # cache em memória de cada processo da API
+    geracao = str(cache.get_geracao(FEEDS_GERACAO))
+    return geracao if versao is None else f"{geracao}-{versao}"
+
+
+def versao_dos_dados(db: Session) -> str:
+    """
+    Versão dos dados dos feeds no banco: muda quando o worker insere notícias
+    ou recalcula os rankings. Consultada no máximo a cada cache_version_seconds.
+    """
+    versao = _versoes.get("versao")
+    if versao is None:
+        versao = _formatar_versao(*db.execute(_consulta_versao()).one())
+        _versoes.set("versao", versao)
+    return versao
+
+
+async def versao_dos_dados_async(db: AsyncSession) -> str:
+    """Igual a versao_dos_dados, com AsyncSession."""
+    versao = _versoes.get("versao")
+    if versao is None:
+        versao = _formatar_versao(*(await db.execute(_consulta_versao())).one())
+        _versoes.set("versao", versao)
+    return versao
+
+
+def _ler_pagina(cache, chave: str) -> PaginaFeed | None:
+    bruto = cache.get(chave)
+    if bruto is None:
+        return None
+    dados = json.loads(bruto)
+    return [NoticiaResponse.model_validate(n) for n in dados["noticias"]], dados["cursor"]
+
+
+def _guardar_pagina(cache, chave: str, pagina: PaginaFeed):
+    noticias, next_cursor = pagina
+    cache.set(
+        chave,
+        json.dumps({
+            "noticias": [noticia.model_dump(mode="json") for noticia in noticias],
+            "cursor": next_cursor,
+        }),
+    )
+
+
+def get_feed_em_cache(
+    endpoint: str, params: dict, carregar: Callable[[], PaginaFeed], db: Session | None = None
+) -> PaginaFeed:
+    """
+    Devolve a página anônima de um feed a partir do cache, carregando do
+    banco com carregar() em caso de miss.
+
+    args:
+    - endpoint (str): Nome do feed (ex.: "latest", "hottest").
+    - params (dict): Parâmetros que mudam a página (cursor, skip, limit, time_filter).
+    - carregar (Callable): Monta a página e o cursor da próxima.
+    - db (Session | None): Sessão usada para ler a versão dos dados; sem ela
+      a página só é descartada por invalidar_feeds ou pelo TTL.
+
+    returns:
+    - tuple[list[NoticiaResponse], str | None]: Página e cursor da próxima.
+    """
+    cache = get_cache()
+    if cache is None:
+        return carregar()
+
+    versao = versao_dos_dados(db) if db is not None else None
+    chave = chave_feed(endpoint, params, _geracao(cache, versao))
+    pagina = _ler_pagina(cache, chave)
+    if pagina is None:
+        pagina = carregar()
+        _guardar_pagina(cache, chave, pagina)
+    return pagina
+
+
+async def get_feed_em_cache_async(
+    endpoint: str,
+    params: dict,
+    carregar: Callable[[], Awaitable[PaginaFeed]],
+    db: AsyncSession | None = None,
+) -> PaginaFeed:
+    """Igual a get_feed_em_cache, para rotas assíncronas (carregar é uma corrotina)."""
+    cache = get_cache()
+    if cache is None:
+        return await carregar()
+
+    versao = await versao_dos_dados_async(db) if db is not None else None
+    chave = chave_feed(endpoint, params, _geracao(cache, versao))
+    pagina = _ler_pagina(cache, chave)
+    if pagina is None:
+        pagina = await carregar()
+        _guardar_pagina(cache, chave, pagina)
+    return pagina
+
+
+def invalidar_feeds():
+    """
+    Descarta as páginas em cache de todos os feeds (nova geração de chaves).
+    Com o cache em memória vale só para este processo; os demais percebem a
+    mudança pela versão dos dados no banco.
+    """
+    cache = get_cache()
+    if cache is not None:
+        cache.incr_geracao(FEEDS_GERACAO)
+    _versoes.delete("versao")
+
+
+def metricas_cache() -> dict:
+    cache = get_cache()
+    return cache.stats() if cache is not None else {"backend": "none"}
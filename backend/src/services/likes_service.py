@@ -1,6 +1,9 @@
 from src.db.models.curtir_model import Curtir
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from src.db.models.noticia_model import Noticia
 from src.db.models.usuario_model import Usuario
 
 
@@ -10,20 +13,69 @@ def _get_like(user_id: int, news_id: int, db: Session):
         Curtir.id_noticia == news_id
     ).first()
 
+def _alterar_qtd_curtidas(news_id: int, delta: int, db: Session) -> int:
+    # UPDATE atômico (qtd = qtd + delta): curtidas simultâneas não se sobrescrevem
+    qtd_curtidas = db.execute(
+        update(Noticia)
+        .where(Noticia.id == news_id)
+        .values(qtd_curtidas=Noticia.qtd_curtidas + delta)
+        .returning(Noticia.qtd_curtidas)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    return qtd_curtidas or 0
+
+
+def _get_qtd_curtidas(news_id: int, db: Session) -> int:
+    return db.scalar(select(Noticia.qtd_curtidas).where(Noticia.id == news_id)) or 0
+
+
+def insert_curtida(user_id: int, news_id: int, db: Session):
+    """INSERT da curtida que não faz nada se ela já existir (ON CONFLICT DO NOTHING)."""
+    # O SQLite (usado nos testes) também suporta a cláusula
+    insert = sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+    return insert(Curtir).values(id_usuario=user_id, id_noticia=news_id).on_conflict_do_nothing()
+
+
+def delete_curtida(user_id: int, news_id: int):
+    """DELETE da curtida do usuário na notícia."""
+    return delete(Curtir).where(Curtir.id_usuario == user_id, Curtir.id_noticia == news_id)
+
+
 def handleLike(db: Session, usuario: Usuario, news_id: int):
     user_id = getattr(usuario, "id", None)
     if user_id is None:
         raise ValueError("Usuario instance does not have a valid 'id' attribute.")
-    curtida = _get_like(user_id, news_id, db)
-    if curtida:
-        db.delete(curtida)
-        db.commit()
-        liked = False
+    liked = _get_like(user_id, news_id, db) is None
+    stmt = insert_curtida(user_id, news_id, db) if liked else delete_curtida(user_id, news_id)
+    alterada = db.execute(stmt.returning(Curtir.id_noticia)).first()
+    # O contador só muda se a curtida mudou de fato: dois cliques simultâneos
+    # veem o mesmo estado, mas só um deles insere ou remove a linha
+    if alterada is not None:
+        likes = _alterar_qtd_curtidas(news_id, 1 if liked else -1, db)
     else:
-        new_like = Curtir(id_usuario=user_id, id_noticia=news_id)
-        db.add(new_like)
-        db.commit()
-        liked = True
-    # Conta total de likes na notícia
-    likes = db.query(Curtir).filter(Curtir.id_noticia == news_id).count()
-    return {"liked": liked, "likes": likes}
\ No newline at end of file
+        likes = _get_qtd_curtidas(news_id, db)
+    db.commit()
+    return {"liked": liked, "likes": likes}
+
+
+def reconciliar_qtd_curtidas(db: Session) -> int:
+    """
+    Corrige notícias cujo contador qtd_curtidas divergiu da tabela curtidas
+    (ex.: curtidas removidas direto no banco). Executado pelo worker.
+
+    returns:
+    - int: Quantidade de notícias corrigidas.
+    """
+    contagem = (
+        select(func.count(Curtir.id_usuario))
+        .where(Curtir.id_noticia == Noticia.id)
+        .scalar_subquery()
+    )
+    resultado = db.execute(
+        update(Noticia)
+        .where(Noticia.qtd_curtidas != contagem)
+        .values(qtd_curtidas=contagem)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return resultado.rowcount
\ No newline at end of file
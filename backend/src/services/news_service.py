@@ -3,10 +3,15 @@ from fastapi import HTTPException, status
 from src.db.models.curtir_model import Curtir
 from src.db.models.usuario_model import Usuario
 from src.schemas.noticia_schema import NoticiaCreate, NoticiaResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from src.db.models.noticia_model import Noticia
 from src.schemas.fonte_schema import FonteResponse
-from sqlalchemy import func
+from src.utils.cursor import decode_cursor, encode_cursor
+from sqlalchemy import and_, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Quantidade de notícias por INSERT com múltiplos VALUES
+NEWS_INSERT_CHUNK_SIZE = 200
 
 
 # Calcula a data limite baseada no filtro de tempo
@@ -73,24 +78,62 @@ def create_news(news: NoticiaCreate, db: Session):
     return new_news
 
 
+# Função para inserir várias notícias de uma vez, ignorando URLs já cadastradas
+def insert_news_bulk(noticias: list[dict], db: Session) -> dict[str, int]:
+    """
+    Insere as notícias em lotes com INSERT ... ON CONFLICT (url) DO NOTHING.
+
+    Notícias com URL já cadastrada são ignoradas em vez de abortar o lote, o
+    que torna a coleta idempotente mesmo com duas execuções sobrepostas.
+    Não faz commit: a transação fica a cargo de quem chamou.
+
+    args:
+    - noticias (list[dict]): Valores das colunas de cada notícia.
+    - db (Session): Sessão do banco de dados.
+
+    returns:
+    - dict[str, int]: Quantidade de notícias inseridas e ignoradas.
+    """
+    # O SQLite (usado nos testes) também suporta ON CONFLICT DO NOTHING
+    dialeto = db.get_bind().dialect.name
+    insert = sqlite.insert if dialeto == "sqlite" else postgresql.insert
+
+    inseridas = 0
+    for inicio in range(0, len(noticias), NEWS_INSERT_CHUNK_SIZE):
+        lote = noticias[inicio : inicio + NEWS_INSERT_CHUNK_SIZE]
+        stmt = (
+            insert(Noticia)
+            .values(lote)
+            .on_conflict_do_nothing(index_elements=[Noticia.url])
+            .returning(Noticia.id)
+        )
+        inseridas += len(db.execute(stmt).all())
+
+    return {"inseridas": inseridas, "ignoradas": len(noticias) - inseridas}
+
+
 # Função auxiliar para montar o objeto de resposta da notícia
 # Inclui quantidade de curtidas, se o usuário curtiu e dados da fonte
+# curtido pode vir pré-calculado (ver montar_pagina)
 
 
-def build_noticia_response(noticia, usuario, db, qtd_curtidas=None):
-    # Conta o número de curtidas se não for passado
+def build_noticia_response(noticia, usuario, db, qtd_curtidas=None, curtido=None):
+    # Usa o contador mantido na própria notícia se não for passado
     if qtd_curtidas is None:
-        qtd_curtidas = db.query(Curtir).filter(Curtir.id_noticia == noticia.id).count()
+        qtd_curtidas = noticia.qtd_curtidas
     
     # Verifica se o usuário já curtiu essa notícia (se estiver autenticado)
-    curtiu = (
-        db.query(Curtir)
-        .filter(Curtir.id_noticia == noticia.id, Curtir.id_usuario == usuario.id)
-        .first()
-        is not None
-        if usuario is not None
-        else False
-    )
+    if curtido is not None:
+        curtiu = curtido
+    else:
+        curtiu = (
+            db.query(Curtir)
+            .filter(Curtir.id_noticia == noticia.id, Curtir.id_usuario == usuario.id)
+            .first()
+            is not None
+            if usuario is not None
+            else False
+        )
     
     # Converte o relacionamento da fonte para o schema Pydantic
     fonte_response = (
@@ -114,70 +157,208 @@ def build_noticia_response(noticia, usuario, db, qtd_curtidas=None):
     )
 
 
+# Busca, com uma única consulta IN, quais notícias da página o usuário curtiu
+def get_ids_curtidos(usuario: Usuario | None, ids_noticias: list[int], db: Session) -> set[int]:
+    if usuario is None or not ids_noticias:
+        return set()
+    return {
+        id_noticia
+        for (id_noticia,) in db.query(Curtir.id_noticia).filter(
+            Curtir.id_usuario == usuario.id, Curtir.id_noticia.in_(ids_noticias)
+        )
+    }
+
+
+def get_curtidas_atuais(
+    usuario: Usuario | None, ids_noticias: list[int], db: Session
+) -> dict[int, tuple[int, bool]]:
+    # Contador atual e curtido do usuário de cada notícia, numa única consulta
+    if usuario is None or not ids_noticias:
+        return {}
+    linhas = (
+        db.query(Noticia.id, Noticia.qtd_curtidas, Curtir.id_noticia)
+        .outerjoin(
+            Curtir, and_(Curtir.id_noticia == Noticia.id, Curtir.id_usuario == usuario.id)
+        )
+        .filter(Noticia.id.in_(ids_noticias))
+    )
+    return {id_noticia: (qtd, curtida is not None) for id_noticia, qtd, curtida in linhas}
+
+
+def montar_pagina(noticias, usuario: Usuario | None, db: Session) -> list[NoticiaResponse]:
+    """
+    Monta a resposta de uma página de notícias sem consultas por item.
+
+    args:
+    - noticias (list[Noticia]): Notícias da página, com a fonte já carregada.
+    - usuario (Usuario | None): Usuário autenticado, se houver.
+    - db (Session): Sessão do banco de dados.
+
+    returns:
+    - list[NoticiaResponse]: Notícias na mesma ordem recebida.
+    """
+    curtidas = get_ids_curtidos(usuario, [noticia.id for noticia in noticias], db)
+    return [
+        build_noticia_response(noticia, usuario, db, curtido=noticia.id in curtidas)
+        for noticia in noticias
+    ]
+
+
+def marcar_curtidos(
+    noticias: list[NoticiaResponse], usuario: Usuario | None, db: Session
+) -> list[NoticiaResponse]:
+    """
+    Aplica o campo curtido do usuário sobre uma página montada sem usuário
+    (ex.: a página anônima do cache de feeds), com uma única consulta IN.
+    qtd_curtidas vem junto do contador atual, para a curtida do usuário
+    aparecer mesmo com a página em cache montada antes dela.
+
+    returns:
+    - list[NoticiaResponse]: Cópias das notícias com curtido e qtd_curtidas
+      atualizados; a página recebida não é alterada.
+    """
+    if usuario is None:
+        return noticias
+    atuais = get_curtidas_atuais(usuario, [noticia.id for noticia in noticias], db)
+    return [
+        noticia.model_copy(update=campos_de_curtida(noticia, atuais)) for noticia in noticias
+    ]
+
+
+def campos_de_curtida(noticia: NoticiaResponse, atuais: dict[int, tuple[int, bool]]) -> dict:
+    # Notícia removida depois do cache: mantém o contador da página
+    qtd_curtidas, curtido = atuais.get(noticia.id, (noticia.qtd_curtidas, False))
+    return {"qtd_curtidas": qtd_curtidas, "curtido": curtido}
+
+
+# Lê o cursor de paginação de um feed e devolve os valores da chave (ordem, id)
+def ler_cursor(cursor: str, order_by: str) -> tuple:
+    dados = decode_cursor(cursor)
+    try:
+        if dados["o"] != order_by:
+            raise ValueError("cursor de outro feed")
+        if order_by == "qtd_curtidas":
+            valor = int(dados["v"])
+        else:
+            valor = datetime.fromisoformat(dados["v"])
+        return valor, int(dados["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        )
+
+
+# Gera o cursor da próxima página a partir do último item da página atual
+def get_next_cursor(
+    noticias: list[NoticiaResponse], limit: int, order_by: str = "data_postagem"
+) -> str | None:
+    # Página incompleta: não há próxima
+    if len(noticias) < limit:
+        return None
+
+    ultima = noticias[-1]
+    if order_by == "qtd_curtidas":
+        valor = ultima.qtd_curtidas
+    else:
+        valor = getattr(ultima, order_by).isoformat()
+    return encode_cursor({"o": order_by, "v": valor, "id": ultima.id})
+
+
 # Função para buscar o feed de notícias, ordenando por data ou por curtidas
+# Cada página custa duas consultas: notícias (com fonte) e curtidas do usuário
+# Com cursor, a página começa logo após a chave (ordem, id) do último item já visto,
+# sem OFFSET; skip é mantido para clientes antigos e ignorado quando há cursor
 def get_news_feed(
     usuario: Usuario | None,
     db: Session,
     skip: int = 0,
     limit: int = 10,
     order_by: str = "data_postagem",
-    time_filter: str = "all"
+    time_filter: str = "all",
+    cursor: str | None = None,
 ):
-    # Ordena por quantidade de curtidas
+    query = db.query(Noticia).options(joinedload(Noticia.fonte))
+
+    # O filtro de tempo só vale para o feed ordenado por curtidas
     if order_by == "qtd_curtidas":
         # Calcula a data limite baseada no filtro
         date_limit = get_time_filter_date(time_filter)
-        
-        query = (
-            db.query(Noticia, func.count(Curtir.id_usuario).label("qtd_curtidas"))
-            .outerjoin(Curtir, Noticia.id == Curtir.id_noticia)
-        )
-        
+
         # Aplica filtro de tempo se necessário
         if date_limit:
             query = query.filter(Noticia.data_postagem >= date_limit)
-        
-        noticias = (
-            query
-            .group_by(Noticia.id)
-            .order_by(func.count(Curtir.id_usuario).desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-        # noticias é uma lista de tuplas: (Noticia, qtd_curtidas)
-        return [
-            build_noticia_response(noticia, usuario, db, qtd_curtidas=qtd_curtidas)
-            for noticia, qtd_curtidas in noticias
-        ]
-    # Ordena por data de postagem (ou outro campo)
-    else:
-        noticias = (
-            db.query(Noticia)
-            .order_by(getattr(Noticia, order_by).desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-        return [build_noticia_response(noticia, usuario, db) for noticia in noticias]
 
-def get_liked_news(usuario: Usuario, db: Session, skip: int = 0, limit: int = 10):
-    # Busca as curtidas do usuário e retorna as notícias correspondentes
-    curtidas = (
-        db.query(Curtir)
+    # Ordena pelo contador qtd_curtidas ou por data de postagem (ou outro campo)
+    chave = getattr(Noticia, order_by)
+
+    if cursor:
+        valor, id_noticia = ler_cursor(cursor, order_by)
+        query = query.filter(tuple_(chave, Noticia.id) < tuple_(valor, id_noticia))
+
+    # O id desempata notícias com a mesma chave, deixando a ordem estável
+    query = query.order_by(chave.desc(), Noticia.id.desc())
+    if not cursor:
+        query = query.offset(skip)
+
+    noticias = query.limit(limit).all()
+    return montar_pagina(noticias, usuario, db)
+
+
+def get_liked_news(
+    usuario: Usuario,
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+) -> tuple[list[NoticiaResponse], str | None]:
+    """
+    Histórico de notícias curtidas pelo usuário, da curtida mais recente para
+    a mais antiga, em uma única consulta (curtidas + notícias + fontes).
+
+    A quantidade de curtidas vem do contador qtd_curtidas e todas as notícias
+    já são curtidas pelo usuário. Com cursor, a página começa logo após a
+    chave (data_curtida, id_noticia) do último item; skip é ignorado.
+
+    returns:
+    - tuple[list[NoticiaResponse], str | None]: Página e cursor da próxima.
+    """
+    query = (
+        db.query(Noticia, Curtir.data_curtida)
+        .join(Curtir, Curtir.id_noticia == Noticia.id)
+        .options(joinedload(Noticia.fonte))
         .filter(Curtir.id_usuario == usuario.id)
-        .order_by(Curtir.data_curtida.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
-    noticias = [db.query(Noticia).filter(Noticia.id == c.id_noticia).first() for c in curtidas]
-    return [build_noticia_response(n, usuario, db) for n in noticias if n]
+
+    if cursor:
+        data_curtida, id_noticia = ler_cursor(cursor, "data_curtida")
+        query = query.filter(
+            tuple_(Curtir.data_curtida, Curtir.id_noticia) < tuple_(data_curtida, id_noticia)
+        )
+
+    query = query.order_by(Curtir.data_curtida.desc(), Curtir.id_noticia.desc())
+    if not cursor:
+        query = query.offset(skip)
+
+    linhas = query.limit(limit).all()
+    noticias = [build_noticia_response(n, usuario, db, curtido=True) for n, _ in linhas]
+
+    next_cursor = None
+    if len(linhas) == limit:
+        ultima, data_curtida = linhas[-1]
+        next_cursor = encode_cursor(
+            {"o": "data_curtida", "v": data_curtida.isoformat(), "id": ultima.id}
+        )
+    return noticias, next_cursor
 
 
 # Função para buscar uma notícia específica pelo ID
 def get_news_by_id(usuario: Usuario | None, news_id: int, db: Session):
-    noticia = db.query(Noticia).filter(Noticia.id == news_id).first()
+    noticia = (
+        db.query(Noticia)
+        .options(joinedload(Noticia.fonte))
+        .filter(Noticia.id == news_id)
+        .first()
+    )
     if not noticia:
         raise HTTPException(status_code=404, detail="Notícia não encontrada")
-    return build_noticia_response(noticia, usuario, db)
+    return montar_pagina([noticia], usuario, db)[0]
@@ -0,0 +1,115 @@
+"""
+Atualização dos hashes de senha para os parâmetros atuais do argon2.
+
+Os parâmetros ficam gravados em cada hash ($argon2id$v=19$m=...,t=...,p=...$),
+então mudar argon2_time_cost, argon2_memory_cost ou argon2_parallelism não
+invalida as senhas existentes: cada uma é refeita no próximo login bem-sucedido
+(rehash_senha, em segundo plano), quando a senha em texto plano está
+disponível.
+
+Relatório da migração (a partir da pasta backend/):
+    python -m src.services.password_service
+"""
+from collections import Counter
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.auth.password import hash_password, password_context, precisa_rehash
+from src.db.database import SessionLocal
+from src.db.models.usuario_model import Usuario
+
+
+def rehash_senha(usuario_id: int, senha: str, hash_antigo: str) -> bool:
+    """
+    Regrava o hash da senha com os parâmetros atuais. Executada depois da
+    resposta do login, com uma sessão própria.
+
+    O UPDATE só vale se o hash ainda for o antigo: uma troca de senha feita
+    nesse meio-tempo não é sobrescrita.
+
+    args:
+    - usuario_id (int): ID do usuário que acabou de logar.
+    - senha (str): Senha em texto plano já verificada.
+    - hash_antigo (str): Hash verificado no login.
+
+    returns:
+    - bool: True se o hash foi atualizado.
+    """
+    try:
+        novo_hash = hash_password(senha)
+    except HTTPException:
+        # Executor de senhas lotado: tenta de novo no próximo login
+        print(f"⚠️ Rehash da senha do usuário {usuario_id} adiado: executor de senhas ocupado")
+        return False
+
+    try:
+        with SessionLocal() as db:
+            atualizados = db.execute(
+                update(Usuario)
+                .where(Usuario.id == usuario_id, Usuario.senha_hash == hash_antigo)
+                .values(senha_hash=novo_hash)
+            ).rowcount
+            db.commit()
+    except SQLAlchemyError as e:
+        print(f"❌ Erro ao atualizar o hash da senha do usuário {usuario_id}: {e}")
+        return False
+    return atualizados > 0
+
+
+def parametros_do_hash(senha_hash: str) -> str:
+    # "$argon2id$v=19$m=65536,t=3,p=4$sal$digest" -> "$argon2id$v=19$m=65536,t=3,p=4$"
+    partes = senha_hash.split("$")
+    if len(partes) < 6:
+        return "desconhecido"
+    return "$".join(partes[:4]) + "$"
+
+
+def relatorio_parametros_senha(db: Session) -> list[dict]:
+    """
+    Quantos usuários têm o hash da senha em cada conjunto de parâmetros.
+
+    returns:
+    - list[dict]: parametros, usuarios e atual (False = será refeito no
+      próximo login), do grupo mais numeroso para o menor.
+    """
+    contagem = Counter()
+    exemplos = {}
+    for senha_hash in db.scalars(select(Usuario.senha_hash).execution_options(yield_per=1000)):
+        parametros = parametros_do_hash(senha_hash)
+        contagem[parametros] += 1
+        exemplos.setdefault(parametros, senha_hash)
+
+    return [
+        {
+            "parametros": parametros,
+            "usuarios": usuarios,
+            "atual": parametros != "desconhecido" and not precisa_rehash(exemplos[parametros]),
+        }
+        for parametros, usuarios in contagem.most_common()
+    ]
+
+
+def main():
+    atuais = parametros_do_hash(password_context.hash("parametros-atuais"))
+    with SessionLocal() as db:
+        relatorio = relatorio_parametros_senha(db)
+
+    total = sum(grupo["usuarios"] for grupo in relatorio)
+    migrados = sum(grupo["usuarios"] for grupo in relatorio if grupo["atual"])
+    print(f"Parâmetros atuais: {atuais}\n")
+    print(f"{'parâmetros':<36} {'usuários':>9} {'%':>6}  situação")
+    for grupo in relatorio:
+        situacao = "atual" if grupo["atual"] else "refeito no próximo login"
+        print(
+            f"{grupo['parametros']:<36} {grupo['usuarios']:>9} "
+            f"{100 * grupo['usuarios'] / total:>5.1f}%  {situacao}"
+        )
+    if total:
+        print(f"\n{migrados} de {total} usuários ({100 * migrados / total:.1f}%) com os parâmetros atuais")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from statistics import median
+
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.db.models.noticia_model import Noticia
+
+load_dotenv()
+
+# Limites do intervalo de coleta de cada fonte, em minutos
+POLLING_MIN_MINUTES = float(os.getenv("polling_min_minutes", "5"))
+POLLING_MAX_MINUTES = float(os.getenv("polling_max_minutes", "360"))
+# Intervalo de fontes sem histórico suficiente (ex.: fontes novas)
+POLLING_DEFAULT_MINUTES = float(os.getenv("ingest_interval_minutes", "60"))
+# Variação aleatória aplicada ao intervalo (0.1 = ±10%)
+POLLING_JITTER = float(os.getenv("polling_jitter", "0.1"))
+# Quantidade de notícias recentes usadas para estimar o ritmo de cada fonte
+POLLING_HISTORICO = 20
+
+
+def _utc(data: datetime) -> datetime:
+    # SQLite devolve datas sem timezone; no banco elas estão em UTC
+    if data.tzinfo is None:
+        return data.replace(tzinfo=timezone.utc)
+    return data
+
+
+def calcular_intervalo(datas: list[datetime], agora: datetime | None = None) -> timedelta:
+    """
+    Calcula o intervalo de coleta de uma fonte a partir das datas de postagem.
+
+    Usa a mediana dos intervalos entre publicações, ou o tempo desde a última
+    notícia se for maior (fontes que pararam de publicar vão ficando mais
+    lentas), e coleta duas vezes por intervalo esperado. O resultado fica
+    entre POLLING_MIN_MINUTES e POLLING_MAX_MINUTES.
+
+    args:
+    - datas (list[datetime]): Datas de postagem recentes da fonte.
+    - agora (datetime | None): Momento de referência (padrão: agora, em UTC).
+
+    returns:
+    - timedelta: Intervalo até a próxima coleta, sem jitter.
+    """
+    if len(datas) < 2:
+        return timedelta(minutes=POLLING_DEFAULT_MINUTES)
+
+    agora = agora or datetime.now(timezone.utc)
+    datas = sorted((_utc(data) for data in datas), reverse=True)
+
+    mediana = median(
+        (recente - anterior).total_seconds()
+        for recente, anterior in zip(datas, datas[1:])
+    )
+    desde_ultima = (agora - datas[0]).total_seconds()
+
+    minutos = max(mediana, desde_ultima) / 60 / 2
+    minutos = min(max(minutos, POLLING_MIN_MINUTES), POLLING_MAX_MINUTES)
+    return timedelta(minutes=minutos)
+
+
+def aplicar_jitter(intervalo: timedelta, jitter: float = POLLING_JITTER) -> timedelta:
+    """Espalha as coletas para as fontes não serem consultadas todas juntas."""
+    return intervalo * random.uniform(1 - jitter, 1 + jitter)
+
+
+def intervalos_por_fonte(
+    db: Session, ids_fontes: list[int], agora: datetime | None = None
+) -> dict[int, timedelta]:
+    """
+    Calcula o intervalo de coleta de cada fonte com uma única consulta,
+    usando as POLLING_HISTORICO notícias mais recentes de cada uma.
+    """
+    if not ids_fontes:
+        return {}
+
+    posicao = (
+        func.row_number()
+        .over(partition_by=Noticia.id_fonte, order_by=Noticia.data_postagem.desc())
+        .label("posicao")
+    )
+    recentes = (
+        db.query(Noticia.id_fonte, Noticia.data_postagem, posicao)
+        .filter(Noticia.id_fonte.in_(ids_fontes))
+        .subquery()
+    )
+    linhas = (
+        db.query(recentes.c.id_fonte, recentes.c.data_postagem)
+        .filter(recentes.c.posicao <= POLLING_HISTORICO)
+        .all()
+    )
+
+    datas: dict[int, list[datetime]] = {id_fonte: [] for id_fonte in ids_fontes}
+    for id_fonte, data_postagem in linhas:
+        datas[id_fonte].append(data_postagem)
+
+    return {
+        id_fonte: calcular_intervalo(datas_fonte, agora)
+        for id_fonte, datas_fonte in datas.items()
+    }
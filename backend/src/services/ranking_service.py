@@ -0,0 +1,216 @@
+import os
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session, joinedload
+
+from src.db.models.noticia_model import Noticia
+from src.db.models.ranking_model import RankingNoticia
+from src.db.models.usuario_model import Usuario
+from src.schemas.noticia_schema import NoticiaResponse
+from src.services.feed_cache_service import invalidar_feeds
+from src.services.news_service import (
+    get_news_feed,
+    get_next_cursor,
+    get_time_filter_date,
+    montar_pagina,
+)
+from src.utils.cursor import decode_cursor, encode_cursor
+
+load_dotenv()
+
+# Janelas de tempo do feed "em alta" (parâmetro time_filter)
+JANELAS = ("week", "month", "year", "all")
+# Posições guardadas por janela; além delas o feed segue com a consulta ao vivo
+RANKING_TAMANHO = int(os.getenv("ranking_size", "1000"))
+
+
+def atualizar_rankings(db: Session) -> dict[str, int]:
+    """
+    Recalcula o ranking de cada janela de tempo a partir do contador
+    qtd_curtidas e troca as posições antigas pelas novas numa única
+    transação: quem lê vê sempre um ranking completo. Executado pelo worker.
+
+    returns:
+    - dict[str, int]: Quantidade de posições gravadas por janela.
+    """
+    totais = {}
+    ordem = (Noticia.qtd_curtidas.desc(), Noticia.id.desc())
+    # Mesma versão para todas as posições do cálculo; vai no cursor das páginas
+    versao = datetime.now(timezone.utc)
+
+    for janela in JANELAS:
+        origem = select(
+            literal(janela),
+            func.row_number().over(order_by=ordem),
+            Noticia.id,
+            Noticia.qtd_curtidas,
+            literal(versao, RankingNoticia.atualizado_em.type),
+        )
+        date_limit = get_time_filter_date(janela)
+        if date_limit:
+            origem = origem.where(Noticia.data_postagem >= date_limit)
+        origem = origem.order_by(*ordem).limit(RANKING_TAMANHO)
+
+        db.execute(delete(RankingNoticia).where(RankingNoticia.janela == janela))
+        resultado = db.execute(
+            insert(RankingNoticia).from_select(
+                ["janela", "posicao", "id_noticia", "qtd_curtidas", "atualizado_em"], origem
+            )
+        )
+        totais[janela] = resultado.rowcount
+
+    db.commit()
+    invalidar_feeds()  # O feed "em alta" em cache segue a ordem antiga
+    return totais
+
+
+def get_ranking_page(
+    db: Session, janela: str, posicao: int, limit: int
+) -> list[tuple[Noticia, int, datetime]]:
+    # Notícias das posições (posicao, posicao + limit], com a fonte já carregada,
+    # junto das curtidas guardadas no cálculo e da versão do ranking
+    return (
+        db.query(Noticia, RankingNoticia.qtd_curtidas, RankingNoticia.atualizado_em)
+        .join(RankingNoticia, RankingNoticia.id_noticia == Noticia.id)
+        .options(joinedload(Noticia.fonte))
+        .filter(RankingNoticia.janela == janela, RankingNoticia.posicao > posicao)
+        .order_by(RankingNoticia.posicao)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_versao_ranking(db: Session, janela: str) -> datetime | None:
+    # Data do último cálculo do ranking da janela (None se ainda não calculado)
+    return (
+        db.query(func.max(RankingNoticia.atualizado_em))
+        .filter(RankingNoticia.janela == janela)
+        .scalar()
+    )
+
+
+def _cursor_ranking(janela: str, posicao: int, ultima: tuple[Noticia, int, datetime]) -> str:
+    # Posição no ranking, versão do cálculo e chave (curtidas guardadas, id) da
+    # última notícia vista, para seguir ao vivo se o ranking for recalculado
+    noticia, qtd_curtidas, versao = ultima
+    return encode_cursor(
+        {
+            "o": "ranking",
+            "j": janela,
+            "p": posicao,
+            "r": versao.isoformat(),
+            "v": qtd_curtidas,
+            "id": noticia.id,
+        }
+    )
+
+
+def _cursor_ao_vivo(qtd_curtidas: int, id_noticia: int) -> str:
+    return encode_cursor({"o": "qtd_curtidas", "v": qtd_curtidas, "id": id_noticia})
+
+
+def _ler_cursor_ranking(cursor: str, janela: str) -> dict:
+    dados = decode_cursor(cursor)
+    valido = (
+        dados.get("o") == "ranking"
+        and dados.get("j") == janela
+        and isinstance(dados.get("p"), int)
+        and isinstance(dados.get("r"), str)
+        and isinstance(dados.get("v"), int)
+        and isinstance(dados.get("id"), int)
+    )
+    if not valido:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        )
+    return dados
+
+
+def get_hottest_feed(
+    usuario: Usuario | None,
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    time_filter: str = "all",
+    cursor: str | None = None,
+) -> tuple[list[NoticiaResponse], str | None]:
+    """
+    Feed "em alta" lido do ranking pré-calculado da janela de tempo.
+
+    A ordem vem do último cálculo do ranking, então as páginas não mudam
+    enquanto os usuários curtem; qtd_curtidas mostra o contador atual.
+    Sem ranking calculado para a janela, ou depois da última posição
+    guardada, usa a consulta ao vivo de get_news_feed. O cursor guarda a
+    versão do ranking: se ele foi recalculado entre as páginas, a paginação
+    segue ao vivo a partir das curtidas guardadas da última notícia vista.
+
+    returns:
+    - tuple[list[NoticiaResponse], str | None]: Página e cursor da próxima.
+    """
+
+    def ao_vivo(**kwargs):
+        pagina = get_news_feed(
+            usuario, db, limit=limit, order_by="qtd_curtidas", time_filter=time_filter, **kwargs
+        )
+        return pagina, get_next_cursor(pagina, limit, "qtd_curtidas")
+
+    # Cursor da consulta ao vivo: a paginação já saiu do ranking
+    if cursor and decode_cursor(cursor).get("o") == "qtd_curtidas":
+        return ao_vivo(cursor=cursor)
+
+    posicao = skip
+    if cursor:
+        dados = _ler_cursor_ranking(cursor, time_filter)
+        versao = get_versao_ranking(db, time_filter)
+        if versao is None or versao.isoformat() != dados["r"]:
+            # Ranking recalculado (ou apagado) entre as páginas: as posições
+            # mudaram, então segue ao vivo a partir da última notícia vista
+            return ao_vivo(cursor=_cursor_ao_vivo(dados["v"], dados["id"]))
+        posicao = dados["p"]
+
+    linhas = get_ranking_page(db, time_filter, posicao, limit)
+    noticias = [noticia for noticia, _, _ in linhas]
+
+    if len(linhas) == limit:
+        proximo = _cursor_ranking(time_filter, posicao + limit, linhas[-1])
+        return montar_pagina(noticias, usuario, db), proximo
+
+    # Última página do ranking: descobre se ele cobre todas as notícias da janela
+    total = (
+        db.query(func.count())
+        .select_from(RankingNoticia)
+        .filter(RankingNoticia.janela == time_filter)
+        .scalar()
+    )
+    if total == 0:
+        # Ranking ainda não calculado
+        return ao_vivo(skip=posicao)
+
+    if total < RANKING_TAMANHO:
+        # O ranking cobre todas as notícias da janela: fim do feed
+        return montar_pagina(noticias, usuario, db), None
+
+    if not linhas:
+        if cursor:
+            # A página anterior terminou na última posição do ranking
+            return ao_vivo(cursor=_cursor_ao_vivo(dados["v"], dados["id"]))
+        # Posição além do ranking (skip alto): segue só com a consulta ao vivo
+        return ao_vivo(skip=posicao)
+
+    # Ranking cheio: completa a página com a consulta ao vivo a partir da última
+    # notícia, pelas curtidas guardadas no ranking (o contador atual já pode ter
+    # mudado e repetiria ou pularia notícias)
+    ultima, qtd_curtidas, _ = linhas[-1]
+    pagina = montar_pagina(noticias, usuario, db)
+    pagina += get_news_feed(
+        usuario,
+        db,
+        limit=limit - len(pagina),
+        order_by="qtd_curtidas",
+        time_filter=time_filter,
+        cursor=_cursor_ao_vivo(qtd_curtidas, ultima.id),
+    )
+    return pagina, get_next_cursor(pagina, limit, "qtd_curtidas")
@@ -1,46 +1,48 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any
+
 import feedparser
+import httpx
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timezone
+from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 
 from src.db.models.fonte_model import Fonte
 from src.db.models.noticia_model import Noticia
-
-import spacy
+from src.services.feed_cache_service import invalidar_feeds
+from src.services.news_service import insert_news_bulk
+from src.services.summary_service import gerar_resumos
 
 from src.utils.parse_date import parse_date
 
-# Carrega o modelo de linguagem do spaCy
-nlp = spacy.load("pt_core_news_sm")
-
-
-def gerar_resumo(texto: str, max_length=300):
-    if not texto.strip():
-        return "Resumo indisponível"
+try:
+    # lxml está nas dependências e parseia o HTML das entradas em C; sem ele
+    # (instalação manual sem o lock) cai no html.parser do BeautifulSoup
+    import lxml.html
+    from lxml import etree
+except ImportError:  # pragma: no cover - depende do ambiente
+    lxml = None
 
-    doc = nlp(texto)
-    resumo = ""
+load_dotenv()
 
-    for sent in doc.sents:
-        # +1 para contar o espaço que será adicionado, se resumo já tiver conteúdo
-        espaco = 1 if resumo else 0
-        print(len(resumo))
-        print(len(sent.text))
-        print(espaco)
-        if len(resumo) + len(sent.text) + espaco <= max_length:
-            print("entrou")
-            resumo += (" " if resumo else "") + sent.text
-        else:
-            break
+# Tempo máximo (em segundos) para baixar o RSS de uma única fonte
+RSS_FETCH_TIMEOUT = float(os.getenv("rss_fetch_timeout", "15"))
+# Quantidade máxima de fontes baixadas ao mesmo tempo
+RSS_MAX_CONCURRENCY = int(os.getenv("rss_max_concurrency", "10"))
+RSS_USER_AGENT = "EconnectBot/1.0 (+https://github.com/Gabzk/econnect-web)"
+# Quantidade de URLs por consulta IN na verificação de duplicidade
+URL_DEDUP_CHUNK_SIZE = 500
+# Tamanho máximo do título (coluna noticias.titulo)
+TITULO_MAX_LENGTH = 200
 
-    if resumo:
-        return resumo
-    else:
-        # corta texto e adiciona reticências, garantindo max_length
-        return texto[: max_length - 3] + "..."
+# Parser usado no HTML das entradas ("lxml" se disponível, senão "html.parser")
+HTML_PARSER = "lxml" if lxml is not None else "html.parser"
 
 
-def limpar_texto(entry):
+def _html_do_texto(entry) -> str:
     # Primeiro tenta pegar summary
     html = entry.get("summary")
 
@@ -56,99 +58,329 @@ def limpar_texto(entry):
         else:
             html = ""
 
+    return str(html)
+
+
+def _html_da_imagem(entry) -> str:
+    # O conteúdo completo costuma ter mais imagens que o summary
+    content = entry.get("content", [])
+    return str(content[0].get("value") if content else entry.get("summary", ""))
+
+
+def parse_html(html: str, parser: str = HTML_PARSER) -> tuple[str, str | None]:
+    """
+    Parseia um trecho de HTML uma única vez.
+
+    args:
+    - html (str): HTML da entrada do feed.
+    - parser (str): "lxml" ou "html.parser".
+
+    returns:
+    - tuple[str, str | None]: Texto limpo e src da primeira <img> (se houver).
+    """
+    if parser == "lxml":
+        if not html.strip():
+            return "", None
+        try:
+            raiz = lxml.html.fragment_fromstring(html, create_parent="div")
+        except Exception:
+            # Fragmentos que o lxml recusa (ex.: "<html></html>" gera "too many
+            # bodies") seguem pelo html.parser, que aceita qualquer entrada
+            return parse_html(html, "html.parser")
+        # get_text do BeautifulSoup também ignora comentários, scripts e estilos
+        etree.strip_elements(raiz, etree.Comment, "script", "style", with_tail=False)
+        texto = " ".join(t.strip() for t in raiz.itertext() if t.strip())
+        img_tag = next(raiz.iter("img"), None)
+        return texto, img_tag.get("src") if img_tag is not None else None
+
+    soup = BeautifulSoup(html, "html.parser")
+    img_tag = soup.find("img")
+    imagem = img_tag.get("src") if img_tag else None  # type: ignore
+    return soup.get_text(separator=" ", strip=True), imagem  # type: ignore
+
+
+def imagem_da_midia(entry) -> str | None:
+    # Imagem declarada no próprio RSS (media_content ou enclosures), sem parse
+    if hasattr(entry, "media_content") and entry.media_content:
+        return entry.media_content[0].get("url")
+    if hasattr(entry, "enclosures") and entry.enclosures:
+        return entry.enclosures[0].get("href")
+    return None
+
+
+def extrair_conteudo(
+    entry, parser: str = HTML_PARSER, imagem: str | None = None
+) -> tuple[str, str | None]:
+    """
+    Extrai o texto limpo (usado no resumo) e a imagem da entrada, parseando
+    cada HTML no máximo uma vez. Com a imagem do RSS (imagem_da_midia), só o
+    HTML do texto é parseado; sem ela, o HTML da imagem vem primeiro e, se não
+    tiver <img>, a entrada é descartada sem parsear o texto.
+
+    args:
+    - entry: Entrada do feedparser.
+    - parser (str): "lxml" ou "html.parser".
+    - imagem (str | None): Imagem já encontrada em media_content/enclosures.
+
+    returns:
+    - tuple[str, str | None]: Texto limpo e URL da imagem (None = sem imagem,
+      texto vazio).
+    """
+    html_texto = _html_do_texto(entry)
+    if imagem:
+        return parse_html(html_texto, parser)[0], imagem
+
+    html_imagem = _html_da_imagem(entry)
+    texto, imagem = parse_html(html_imagem, parser)
+    if not imagem:
+        return "", None
+    if html_imagem != html_texto:
+        texto, _ = parse_html(html_texto, parser)
+
+    return texto, imagem
+
+
+def limpar_texto(entry):
     # Limpa o HTML e retorna o texto
-    return BeautifulSoup(str(html), "html.parser").get_text(separator=" ", strip=True)
+    return parse_html(_html_do_texto(entry))[0]
+
+
+@dataclass
+class FeedBaixado:
+    """
+    Resultado do download de um feed.
+
+    Attributes:
+    - conteudo: Bytes do RSS
+    - etag: ETag devolvido pelo servidor (se houver)
+    - last_modified: Last-Modified devolvido pelo servidor (se houver)
+    """
+
+    conteudo: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _headers_condicionais(fonte: Fonte) -> dict[str, str]:
+    # Reenvia os validadores da última coleta para o servidor responder 304 se nada mudou
+    headers = {}
+    if fonte.etag:
+        headers["If-None-Match"] = str(fonte.etag)
+    if fonte.last_modified:
+        headers["If-Modified-Since"] = str(fonte.last_modified)
+    return headers
+
 
+async def baixar_feed(
+    client: httpx.AsyncClient, fonte: Fonte, semaforo: asyncio.Semaphore
+) -> FeedBaixado | None:
+    """
+    Baixa o conteúdo bruto do RSS de uma fonte usando GET condicional.
 
-async def get_news_from_rss(db: Session):
+    Retorna None se o feed não mudou desde a última coleta (304), se o download
+    falhar ou estourar o tempo limite, assim uma fonte lenta, fora do ar ou
+    cadastrada com URL inválida não interrompe a coleta das demais.
+    """
+    url = str(fonte.url)
+    async with semaforo:
+        try:
+            response = await asyncio.wait_for(
+                client.get(url, headers=_headers_condicionais(fonte)),
+                RSS_FETCH_TIMEOUT,
+            )
+            if response.status_code == 304:
+                print(f"♻️ Feed sem alterações: {url}")
+                return None
+            response.raise_for_status()
+            return FeedBaixado(
+                conteudo=response.content,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+        except asyncio.TimeoutError:
+            print(f"⏱️ Tempo esgotado ao baixar: {url}")
+        except httpx.HTTPError as e:
+            print(f"❌ Erro ao baixar {url}: {e}")
+        except Exception as e:
+            # URL inválida (httpx.InvalidURL, ValueError) e afins: uma exceção
+            # aqui abortaria o gather e a coleta de todas as fontes
+            print(f"❌ Erro inesperado ao baixar {url}: {e}")
+    return None
+
+
+async def baixar_feeds(
+    fontes: list[Fonte], client: httpx.AsyncClient | None = None
+) -> list[tuple[Fonte, FeedBaixado | None]]:
+    """
+    Baixa o RSS de todas as fontes de forma concorrente, respeitando o
+    limite de RSS_MAX_CONCURRENCY downloads simultâneos.
+
+    O tempo total passa a acompanhar o feed mais lento, e não a soma de todos.
+    Retorna pares (fonte, feed baixado) na mesma ordem das fontes recebidas.
+    """
+    semaforo = asyncio.Semaphore(RSS_MAX_CONCURRENCY)
+
+    if client is not None:
+        conteudos = await asyncio.gather(
+            *(baixar_feed(client, fonte, semaforo) for fonte in fontes)
+        )
+        return list(zip(fontes, conteudos))
+
+    async with httpx.AsyncClient(
+        timeout=RSS_FETCH_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": RSS_USER_AGENT},
+        limits=httpx.Limits(max_connections=RSS_MAX_CONCURRENCY),
+    ) as novo_client:
+        return await baixar_feeds(fontes, novo_client)
+
+
+def buscar_urls_existentes(db: Session, urls: list[str]) -> set[str]:
+    """
+    Retorna quais das URLs informadas já estão cadastradas em noticias.
+
+    Faz uma consulta com IN por lote de URL_DEDUP_CHUNK_SIZE URLs, em vez de
+    um SELECT por notícia.
+    """
+    existentes: set[str] = set()
+    for inicio in range(0, len(urls), URL_DEDUP_CHUNK_SIZE):
+        lote = urls[inicio : inicio + URL_DEDUP_CHUNK_SIZE]
+        linhas = db.query(Noticia.url).filter(Noticia.url.in_(lote)).all()
+        existentes.update(url for (url,) in linhas)
+    return existentes
+
+
+def coletar_entradas(feeds: list[tuple[Fonte, FeedBaixado | None]]) -> list[tuple[Fonte, Any]]:
+    """
+    Parseia os feeds baixados e devolve as entradas candidatas (fonte, entry),
+    já sem URLs repetidas dentro do próprio lote.
+    """
+    candidatas = []
+    urls_vistas = set()
+
+    for fonte, baixado in feeds:
+        # Feed sem alterações (304) ou com erro: nada para parsear
+        if baixado is None:
+            continue
+
+        try:
+            print(f"🔍 Coletando de: {fonte.url}")
+            feed = feedparser.parse(baixado.conteudo)
+        except Exception as e:
+            print(f"Erro ao processar notícia: {e}")
+            continue
+
+        # Guarda os validadores para o próximo GET condicional.
+        # São salvos junto com as notícias no commit final.
+        setattr(fonte, "etag", baixado.etag)
+        setattr(fonte, "last_modified", baixado.last_modified)
+
+        for entry in feed.entries:
+            url = entry.get("link", "")
+            if not url:
+                print("🚫 Notícia sem link. Pulando...")
+                continue
+            if url in urls_vistas:
+                print(f"🚫 Notícia repetida no lote: {url}")
+                continue
+            urls_vistas.add(url)
+            candidatas.append((fonte, entry))
+
+    return candidatas
+
+
+async def get_news_from_rss(db: Session, ids_fontes: list[int] | None = None):
     noticias = []  # Armazena as notícias temporariamente
-    fontes = db.query(Fonte).filter(Fonte.tipo_extracao == "rss").all()
+    textos = []  # Texto limpo de cada notícia, usado para gerar o resumo
+    query = db.query(Fonte).filter(Fonte.tipo_extracao == "rss")
+    if ids_fontes is not None:
+        # Coleta só as fontes informadas (usado pelo agendamento por fonte)
+        query = query.filter(Fonte.id.in_(ids_fontes))
+    fontes = query.all()
 
     if not fontes:
         raise ValueError("Nenhuma fonte de RSS encontrada.")
 
-    # Faz um loop por cada fonte e parseia o RSS com feedparser
-    try:
-        for fonte in fontes:
-            print(f"🔍 Coletando de: {fonte.url}")
-            feed = feedparser.parse(fonte.url)
-
-            # Itera em cada item do feed e transforma em uma notícia
-            for entry in feed.entries:
-                # Pega a URL da notícia e converte a data (se existir) para datetime.
-                url = entry.get("link", "")
-
-                #       Verifica duplicidade de noticias
-                if db.query(Noticia).filter_by(url=url).first():
-                    print(f"🚫 Notícia duplicada: {url}")
-                    continue
-
-                # Pega imagem, se houver media_content ou enclosures no RSS.
-                imagem = None
-                if hasattr(entry, "media_content") and entry.media_content:
-                    imagem = entry.media_content[0].get("url")
-                elif hasattr(entry, "enclosures") and entry.enclosures:
-                    imagem = entry.enclosures[0].get("href")
-                if not imagem:  # Se ainda não achou imagem, tenta extrair do conteúdo HTML do post usando BeautifulSoup
-                    content = entry.get("content", [])
-                    html_content = (
-                        content[0].get("value") if content else entry.get("summary", "")
-                    )
-                    soup = BeautifulSoup(str(html_content), "html.parser")
-                    img_tag = soup.find("img")
-                    if img_tag and img_tag.has_attr("src"):  # type: ignore
-                        imagem = img_tag["src"]  # type: ignore
-
-                #       pula notícias sem imagem
-                if not imagem:
-                    print("🚫 Notícia sem imagem. Pulando...")
-                    continue
-
-                titulo = entry.get("title", "Sem título")  # Pega o título da notícia
-
-                resumo = gerar_resumo(
-                    limpar_texto(entry)
-                )  # Gera um resumo do texto limpo
-
-                data_postagem = (
-                    entry.get("pubDate")
-                    or entry.get("published")
-                    or entry.get("updated")
-                    or entry.get("date")
-                )
-
-                if data_postagem:
-                    data_postagem = parse_date(str(data_postagem))
-                else:
-                    data_postagem = parse_date(str(datetime.now()))
-
-                # Adicionar noticias  na lista
-                noticias.append(
-                    Noticia(
-                        titulo=titulo,
-                        resumo=resumo,
-                        imagem=imagem,
-                        data_postagem=data_postagem,
-                        url=url,
-                        id_fonte=fonte.id,
-                    )
-                )
-    except Exception as e:
-        print(f"Erro ao processar notícia: {e}")
-
-    # Insere as notícias embaralhadas no banco
-    for noticia in noticias:
-        if len(noticia.titulo) > 200:
-            print(f"❌ Titulo: {noticia.titulo}")
-        if len(noticia.resumo) > 300:
-            print(f"❌ Resumo: {noticia.resumo}")
-           
-        db.add(noticia)
-        
-        print(f"✅ Notícia adicionada: {noticia.titulo}")
-    
+    # Baixa todos os feeds em paralelo antes de parsear
+    feeds = await baixar_feeds(fontes)
+    candidatas = coletar_entradas(feeds)
+
+    # Verifica duplicidade de notícias de uma vez só, antes de qualquer
+    # parse de HTML ou geração de resumo
+    existentes = buscar_urls_existentes(db, [entry.get("link", "") for _, entry in candidatas])
+
+    for fonte, entry in candidatas:
+        # Um erro numa entrada não descarta as demais: os validadores HTTP da
+        # fonte são salvos no commit e o feed não seria parseado de novo (304)
+        try:
+            # Pega a URL da notícia e converte a data (se existir) para datetime.
+            url = entry.get("link", "")
+
+            if url in existentes:
+                print(f"🚫 Notícia duplicada: {url}")
+                continue
+
+            # Imagem do RSS (media_content/enclosures) ou, sem ela, a primeira
+            # <img> do conteúdo do post; cada HTML é parseado no máximo uma vez
+            texto, imagem = extrair_conteudo(entry, imagem=imagem_da_midia(entry))
+
+            #       pula notícias sem imagem
+            if not imagem:
+                print("🚫 Notícia sem imagem. Pulando...")
+                continue
+
+            titulo = entry.get("title", "Sem título")  # Pega o título da notícia
+
+            data_postagem = (
+                entry.get("pubDate")
+                or entry.get("published")
+                or entry.get("updated")
+                or entry.get("date")
+            )
+
+            if data_postagem:
+                data_postagem = parse_date(str(data_postagem))
+            else:
+                data_postagem = parse_date(str(datetime.now()))
+            if data_postagem is None:
+                # Data ilegível: um NULL explícito no INSERT em lote violaria o NOT NULL
+                data_postagem = datetime.now(timezone.utc)
+
+            # Um título longo demais faria o INSERT do lote inteiro falhar
+            if len(titulo) > TITULO_MAX_LENGTH:
+                print(f"❌ Titulo: {titulo}")
+                titulo = titulo[: TITULO_MAX_LENGTH - 3] + "..."
+
+            # Adicionar noticias  na lista (o resumo é gerado depois, em lote)
+            noticias.append(
+                {
+                    "titulo": titulo,
+                    "imagem": imagem,
+                    "data_postagem": data_postagem,
+                    "url": url,
+                    "id_fonte": fonte.id,
+                }
+            )
+            textos.append(texto)
+        except Exception as e:
+            print(f"Erro ao processar notícia {entry.get('link', '')}: {e}")
+
+    # Gera os resumos de todas as notícias novas no pool de processos
+    resumos = await gerar_resumos(textos)
+    for noticia, resumo in zip(noticias, resumos):
+        noticia["resumo"] = resumo
+
+    # Insere as notícias no banco em lote, ignorando URLs já cadastradas
+    resultado = insert_news_bulk(noticias, db)
+    print(
+        f"✅ {resultado['inseridas']} notícias adicionadas, "
+        f"{resultado['ignoradas']} já existiam"
+    )
 
     # Confirma as transações
     db.commit()
+    # Notícias novas mudam os feeds: descarta as páginas em cache
+    if resultado["inseridas"]:
+        invalidar_feeds()
 
-    return {"detail": "Notícias coletadas com sucesso!"}
+    return {"detail": "Notícias coletadas com sucesso!", **resultado}
@@ -0,0 +1,195 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Quantidade de processos que geram resumos em paralelo (0 = no próprio processo)
+SUMMARY_WORKERS = int(os.getenv("summary_workers", str(os.cpu_count() or 1)))
+# Quantidade de textos enviados de uma vez para cada processo
+SUMMARY_BATCH_SIZE = int(os.getenv("summary_batch_size", "32"))
+# Pipeline usado para separar sentenças:
+# - full: modelo completo (tagger, parser, lemmatizer, NER...)
+# - senter: só o componente senter do modelo, sem os demais
+# - sentencizer: regras de pontuação, sem modelo estatístico
+SUMMARY_NLP_MODE = os.getenv("summary_nlp_mode", "full")
+SUMMARY_NLP_MODES = ("full", "senter", "sentencizer")
+SUMMARY_MODEL = "pt_core_news_sm"
+# Componentes do modelo que não participam da separação de sentenças
+COMPONENTES_DESNECESSARIOS = [
+    "tok2vec",
+    "morphologizer",
+    "parser",
+    "lemmatizer",
+    "attribute_ruler",
+    "ner",
+]
+# Tamanho máximo do resumo (coluna noticias.resumo)
+RESUMO_MAX_LENGTH = 300
+RESUMO_INDISPONIVEL = "Resumo indisponível"
+
+
+def carregar_nlp(modo: str = SUMMARY_NLP_MODE):
+    """
+    Carrega o pipeline do spaCy de acordo com o modo de resumo.
+
+    args:
+    - modo (str): "full", "senter" ou "sentencizer".
+
+    returns:
+    - Language: Pipeline pronto para separar sentenças.
+    """
+    # Importado aqui para que a API não carregue o spaCy só por importar o módulo
+    import spacy
+
+    match modo:
+        case "full":
+            return spacy.load(SUMMARY_MODEL)
+        case "senter":
+            # O senter vem desabilitado no modelo e não depende do tok2vec compartilhado
+            nlp = spacy.load(SUMMARY_MODEL, exclude=COMPONENTES_DESNECESSARIOS)
+            nlp.enable_pipe("senter")
+            return nlp
+        case "sentencizer":
+            nlp = spacy.blank("pt")
+            nlp.add_pipe("sentencizer")
+            return nlp
+        case _:
+            raise ValueError(
+                f"Modo de resumo inválido: {modo}. Use um de {SUMMARY_NLP_MODES}."
+            )
+
+
+# Pipeline do spaCy, carregado no primeiro resumo (ver get_nlp)
+_nlp = None
+_nlp_lock = threading.Lock()
+
+# Pool de processos compartilhado pelas coletas, criado no primeiro uso
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_nlp():
+    """
+    Retorna o pipeline do spaCy, carregando-o no primeiro uso.
+
+    Processos que nunca geram resumos (como os workers da API) não pagam o
+    tempo de carga nem a memória do modelo.
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                inicio = time.perf_counter()
+                _nlp = carregar_nlp()
+                print(
+                    f"🧠 Modelo de resumo ({SUMMARY_NLP_MODE}) carregado em "
+                    f"{time.perf_counter() - inicio:.2f}s"
+                )
+    return _nlp
+
+
+def montar_resumo(texto: str, doc, max_length: int = RESUMO_MAX_LENGTH) -> str:
+    """
+    Junta as primeiras sentenças do documento até atingir max_length.
+
+    Se nem a primeira sentença couber, corta o texto e adiciona reticências.
+    """
+    resumo = ""
+
+    for sent in doc.sents:
+        # +1 para contar o espaço que será adicionado, se resumo já tiver conteúdo
+        espaco = 1 if resumo else 0
+        if len(resumo) + len(sent.text) + espaco <= max_length:
+            resumo += (" " if resumo else "") + sent.text
+        else:
+            break
+
+    if resumo:
+        return resumo
+    else:
+        # corta texto e adiciona reticências, garantindo max_length
+        return texto[: max_length - 3] + "..."
+
+
+def gerar_resumo(texto: str, max_length=RESUMO_MAX_LENGTH):
+    if not texto.strip():
+        return RESUMO_INDISPONIVEL
+
+    return montar_resumo(texto, get_nlp()(texto), max_length)
+
+
+def resumir_lote(textos: list[str], max_length: int = RESUMO_MAX_LENGTH) -> list[str]:
+    """
+    Gera os resumos de um lote de textos com nlp.pipe.
+
+    Roda dentro dos processos do pool, por isso precisa ser uma função de
+    módulo (serializável).
+    """
+    resumos = [RESUMO_INDISPONIVEL] * len(textos)
+    indices = [i for i, texto in enumerate(textos) if texto.strip()]
+
+    docs = get_nlp().pipe(textos[i] for i in indices)
+    for i, doc in zip(indices, docs):
+        resumos[i] = montar_resumo(textos[i], doc, max_length)
+
+    return resumos
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn evita herdar threads do servidor/agendador via fork
+        _executor = ProcessPoolExecutor(
+            max_workers=SUMMARY_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def encerrar_executor():
+    """Finaliza o pool de processos de resumo, se tiver sido criado."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+async def gerar_resumos(textos: list[str]) -> list[str]:
+    """
+    Etapa de resumo da coleta: divide os textos em lotes de SUMMARY_BATCH_SIZE
+    e distribui entre os processos do pool, sem bloquear o event loop.
+
+    Com SUMMARY_WORKERS = 0 os lotes rodam em uma thread do próprio processo.
+    Retorna os resumos na mesma ordem dos textos e registra a vazão em docs/s.
+    """
+    if not textos:
+        return []
+
+    inicio = time.perf_counter()
+    lotes = [
+        textos[i : i + SUMMARY_BATCH_SIZE]
+        for i in range(0, len(textos), SUMMARY_BATCH_SIZE)
+    ]
+
+    if SUMMARY_WORKERS > 0:
+        loop = asyncio.get_running_loop()
+        executor: Executor = _get_executor()
+        resultados = await asyncio.gather(
+            *(loop.run_in_executor(executor, resumir_lote, lote) for lote in lotes)
+        )
+    else:
+        resultados = [await asyncio.to_thread(resumir_lote, lote) for lote in lotes]
+
+    resumos = [resumo for lote in resultados for resumo in lote]
+
+    duracao = time.perf_counter() - inicio
+    print(
+        f"🧠 {len(resumos)} resumos em {duracao:.2f}s "
+        f"({len(resumos) / max(duracao, 1e-9):.1f} docs/s)"
+    )
+    return resumos
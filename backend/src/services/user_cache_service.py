@@ -0,0 +1,95 @@
+"""
+Cache em memória dos dados do usuário autenticado.
+
+Evita a consulta a usuarios em cada requisição que precisa do perfil ou de
+confirmar que o usuário ainda existe. As entradas expiram em
+user_cache_ttl_seconds e são removidas na hora por update_usuario e
+delete_usuario; em outros processos da API a alteração aparece quando a
+entrada expira.
+"""
+import json
+import os
+from datetime import datetime
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.auth.principal import UsuarioSnapshot
+from src.db.models.usuario_model import Usuario
+from src.utils.cache import MemoryCache
+
+load_dotenv()
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("user_cache_ttl_seconds", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("user_cache_max_entries", "10000"))
+
+_usuarios = MemoryCache(max_entries=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def get_cache_usuarios() -> MemoryCache:
+    return _usuarios
+
+
+def _snapshot(usuario: Usuario) -> UsuarioSnapshot:
+    return UsuarioSnapshot(
+        id=usuario.id,
+        nome=usuario.nome,
+        email=usuario.email,
+        data_cadastro=usuario.data_cadastro,
+        foto_perfil=usuario.foto_perfil,
+    )
+
+
+def _ler(usuario_id: int) -> UsuarioSnapshot | None:
+    bruto = get_cache_usuarios().get(str(usuario_id))
+    if bruto is None:
+        return None
+    dados = json.loads(bruto)
+    if dados["data_cadastro"] is not None:
+        dados["data_cadastro"] = datetime.fromisoformat(dados["data_cadastro"])
+    return UsuarioSnapshot(**dados)
+
+
+def _guardar(snapshot: UsuarioSnapshot):
+    dados = vars(snapshot).copy()
+    if dados["data_cadastro"] is not None:
+        dados["data_cadastro"] = dados["data_cadastro"].isoformat()
+    get_cache_usuarios().set(str(snapshot.id), json.dumps(dados))
+
+
+def get_usuario_snapshot(usuario_id: int, db: Session) -> UsuarioSnapshot | None:
+    """
+    Dados do usuário a partir do cache, consultando o banco em caso de miss.
+
+    args:
+    - usuario_id (int): ID do usuário (claim sub do token).
+    - db (Session): Sessão usada apenas no miss.
+
+    returns:
+    - UsuarioSnapshot | None: None se o usuário não existir.
+    """
+    snapshot = _ler(usuario_id)
+    if snapshot is None:
+        usuario = db.get(Usuario, usuario_id)
+        if usuario is None:
+            return None
+        snapshot = _snapshot(usuario)
+        _guardar(snapshot)
+    return snapshot
+
+
+async def get_usuario_snapshot_async(usuario_id: int, db: AsyncSession) -> UsuarioSnapshot | None:
+    snapshot = _ler(usuario_id)
+    if snapshot is None:
+        usuario = await db.get(Usuario, usuario_id)
+        if usuario is None:
+            return None
+        snapshot = _snapshot(usuario)
+        _guardar(snapshot)
+    return snapshot
+
+
+def invalidar_usuario(usuario_id: int):
+    """Remove o usuário do cache depois de alterá-lo ou excluí-lo."""
+    get_cache_usuarios().delete(str(usuario_id))
@@ -1,5 +1,6 @@
-from fastapi import File, HTTPException, UploadFile, status
+from fastapi import BackgroundTasks, File, HTTPException, UploadFile, status
 from src.db.models.curtir_model import Curtir
+from src.db.models.noticia_model import Noticia
 from src.db.models.refresh_tokens_model import RefreshToken
 from src.schemas.usuario_schema import (
     UpdateUsuario,
@@ -8,13 +9,16 @@ from src.schemas.usuario_schema import (
     UpdateUsuarioResponse,
 )
 from src.db.models.usuario_model import Usuario
-from src.auth.password import hash_password, verify_password
+from src.auth.password import hash_password, precisa_rehash, verify_password
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 
 from typing import Optional
 
+from src.services.password_service import rehash_senha
+from src.services.user_cache_service import invalidar_usuario
 from src.utils.handle_user_image import save_user_image, delete_user_image
 
 
@@ -80,7 +84,9 @@ def create_usuario(
     return new_usuario
 
 
-def authenticate_usuario(credentials: LoginSchema, db: Session):
+def authenticate_usuario(
+    credentials: LoginSchema, db: Session, background_tasks: BackgroundTasks | None = None
+):
     try:
         db_usuario = (
             db.query(Usuario).filter(Usuario.email == credentials.email).first()
@@ -96,6 +102,11 @@ def authenticate_usuario(credentials: LoginSchema, db: Session):
                 detail="Senha incorreta",
             )
 
+        # Hash com parâmetros antigos do argon2: refeito depois da resposta
+        senha_hash = str(db_usuario.senha_hash)
+        if background_tasks is not None and precisa_rehash(senha_hash):
+            background_tasks.add_task(rehash_senha, db_usuario.id, credentials.senha, senha_hash)
+
         return db_usuario
 
     except HTTPException:
@@ -116,6 +127,12 @@ def authenticate_usuario(credentials: LoginSchema, db: Session):
 
 def delete_usuario(usuario: Usuario, db: Session):
     try:
+        # Desconta as curtidas do usuário do contador das notícias
+        db.query(Noticia).filter(
+            Noticia.id.in_(select(Curtir.id_noticia).where(Curtir.id_usuario == usuario.id))
+        ).update(
+            {Noticia.qtd_curtidas: Noticia.qtd_curtidas - 1}, synchronize_session=False
+        )
         # Deleta todas as curtidas do usuário e os refresh tokens relacionados
         db.query(Curtir).filter(Curtir.id_usuario == usuario.id).delete()
         db.query(RefreshToken).filter(RefreshToken.usuario_id == usuario.id).delete()
@@ -124,6 +141,7 @@ def delete_usuario(usuario: Usuario, db: Session):
         # Agora deleta o usuário
         db.delete(usuario)
         db.commit()
+        invalidar_usuario(usuario.id)
 
         return {"detail": f"Usuário {usuario.email} e curtidas removidos com sucesso"}
 
@@ -188,6 +206,7 @@ def update_usuario(usuario: Usuario, db: Session, updated_usuario: UpdateUsuario
         if updated:
             db.commit()
             db.refresh(usuario)
+            invalidar_usuario(usuario.id)
 
         return UpdateUsuarioResponse(nome=str(usuario.nome), email=str(usuario.email))
     except HTTPException:
@@ -0,0 +1,183 @@
+"""
+Cache de respostas com TTL.
+
+Dois backends com a mesma interface (get, set, delete, get_geracao, incr_geracao, stats):
+- MemoryCache: no próprio processo, com TTL e descarte LRU (padrão).
+- RedisCache: compartilhado entre processos; recebe qualquer cliente
+  compatível com Redis (get, set com ex, incr), inclusive um substituto local.
+
+Os valores são strings (JSON), então os dois backends se comportam igual.
+Gerações são contadores fora do LRU, usados para invalidar grupos de chaves:
+quem monta a chave inclui a geração, e incrementá-la descarta o grupo inteiro.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+try:
+    import redis
+except ImportError:  # Opcional: só é necessário com cache_backend=redis
+    redis = None
+
+load_dotenv()
+
+# memory | redis | none
+CACHE_BACKEND = os.getenv("cache_backend", "memory")
+CACHE_URL = os.getenv("cache_url", "redis://localhost:6379/0")
+CACHE_TTL_SECONDS = float(os.getenv("cache_ttl_seconds", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("cache_max_entries", "1000"))
+
+
+class MemoryCache:
+    """Cache em memória do processo, com TTL por entrada e descarte LRU."""
+
+    nome = "memory"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entradas: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._geracoes: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.descartes = 0
+
+    def get(self, chave: str) -> str | None:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None or entrada[0] <= time.monotonic():
+                if entrada is not None:
+                    del self._entradas[chave]
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+            return entrada[1]
+
+    def set(self, chave: str, valor: str, ttl: float | None = None):
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entradas[chave] = (expira, valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+                self.descartes += 1
+
+    def delete(self, chave: str):
+        with self._lock:
+            self._entradas.pop(chave, None)
+
+    def get_geracao(self, nome: str) -> int:
+        return self._geracoes.get(nome, 0)
+
+    def incr_geracao(self, nome: str) -> int:
+        with self._lock:
+            self._geracoes[nome] = self._geracoes.get(nome, 0) + 1
+            return self._geracoes[nome]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.nome,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "entradas": len(self._entradas),
+            "descartes": self.descartes,
+        }
+
+
+class RedisCache:
+    """
+    Cache em um servidor compatível com Redis, compartilhado entre a API e o
+    worker. O descarte fica a cargo do servidor (maxmemory-policy); hits e
+    misses são contados por processo. Se o servidor falhar, o cache age como
+    vazio e as requisições seguem para o banco.
+    """
+
+    nome = "redis"
+
+    def __init__(self, client, ttl: float = CACHE_TTL_SECONDS, prefixo: str = "econnect:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefixo = prefixo
+        self.hits = self.misses = self.erros = 0
+
+    def get(self, chave: str) -> str | None:
+        try:
+            valor = self.client.get(self.prefixo + chave)
+        except Exception as e:
+            self._erro(e)
+            valor = None
+        if valor is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return valor.decode() if isinstance(valor, bytes) else valor
+
+    def set(self, chave: str, valor: str, ttl: float | None = None):
+        segundos = max(int(self.ttl if ttl is None else ttl), 1)
+        try:
+            self.client.set(self.prefixo + chave, valor, ex=segundos)
+        except Exception as e:
+            self._erro(e)
+
+    def delete(self, chave: str):
+        try:
+            self.client.delete(self.prefixo + chave)
+        except Exception as e:
+            self._erro(e)
+
+    def get_geracao(self, nome: str) -> int:
+        try:
+            return int(self.client.get(self.prefixo + "geracao:" + nome) or 0)
+        except Exception as e:
+            self._erro(e)
+            return 0
+
+    def incr_geracao(self, nome: str) -> int:
+        try:
+            return int(self.client.incr(self.prefixo + "geracao:" + nome))
+        except Exception as e:
+            self._erro(e)
+            return 0
+
+    def _erro(self, e: Exception):
+        self.erros += 1
+        print(f"⚠️ Erro no cache Redis: {e}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.nome,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "erros": self.erros,
+        }
+
+
+def criar_cache(backend: str = CACHE_BACKEND) -> MemoryCache | RedisCache | None:
+    """
+    Cria o backend configurado em cache_backend.
+
+    returns:
+    - MemoryCache | RedisCache | None: None se o cache estiver desligado.
+    """
+    if backend == "none":
+        return None
+    if backend == "redis":
+        if redis is not None:
+            return RedisCache(redis.Redis.from_url(CACHE_URL))
+        print("⚠️ cache_backend=redis, mas o pacote redis não está instalado. Usando cache em memória.")
+    return MemoryCache()
+
+
+# Cache do processo (o cliente Redis só conecta no primeiro comando)
+_cache = criar_cache()
+
+
+def get_cache() -> MemoryCache | RedisCache | None:
+    return _cache
@@ -0,0 +1,31 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+
+
+# Cursores de paginação: JSON em base64 url-safe, opacos para o cliente
+def encode_cursor(dados: dict) -> str:
+    bruto = json.dumps(dados, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decodifica um cursor gerado por encode_cursor.
+
+    raises:
+    - HTTPException 400: Se o cursor estiver malformado.
+    """
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        dados = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        dados = None
+
+    if not isinstance(dados, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        )
+    return dados
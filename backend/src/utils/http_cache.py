@@ -0,0 +1,52 @@
+import hashlib
+import json
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+# Respostas anônimas podem ficar no navegador/CDN, mas sempre revalidadas
+CACHE_CONTROL_PUBLICO = "public, max-age=0, must-revalidate"
+# Respostas com dados do usuário (campo curtido) só no cache do próprio cliente
+CACHE_CONTROL_PRIVADO = "private, no-cache"
+
+
+def gerar_etag(conteudo) -> str:
+    """
+    ETag forte a partir do conteúdo serializado da resposta. A página já
+    inclui as versões de cada notícia (data_coleta e qtd_curtidas), o campo
+    curtido e a fonte, então qualquer mudança nelas gera outra ETag.
+    """
+    corpo = json.dumps(jsonable_encoder(conteudo), sort_keys=True, separators=(",", ":"))
+    return f'"{hashlib.sha256(corpo.encode()).hexdigest()[:32]}"'
+
+
+def etag_corresponde(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match usa comparação fraca: ignora o prefixo W/
+    if not if_none_match:
+        return False
+    candidatas = [valor.strip() for valor in if_none_match.split(",")]
+    return "*" in candidatas or etag in (c.removeprefix("W/") for c in candidatas)
+
+
+def responder_com_etag(request: Request, response: Response, conteudo, privado: bool):
+    """
+    Adiciona ETag, Cache-Control e Vary à resposta e devolve 304 Not Modified
+    se o cliente já tem essa versão (If-None-Match).
+
+    args:
+    - conteudo: Corpo da resposta (schemas Pydantic ou listas deles).
+    - privado (bool): True se a resposta depende do usuário autenticado.
+
+    returns:
+    - O próprio conteudo, ou uma Response 304 sem corpo.
+    """
+    etag = gerar_etag(conteudo)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL_PRIVADO if privado else CACHE_CONTROL_PUBLICO
+    # A mesma URL muda com o token (campo curtido)
+    response.headers["Vary"] = "Authorization"
+
+    if etag_corresponde(request.headers.get("if-none-match"), etag):
+        # Uma Response devolvida pelo endpoint não herda os cabeçalhos de response
+        return Response(status_code=304, headers=dict(response.headers))
+    return conteudo
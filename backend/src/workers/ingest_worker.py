@@ -0,0 +1,211 @@
+"""
+Worker de coleta de notícias, executado fora da API.
+
+Chama o pipeline de coleta diretamente (sem passar pelo endpoint
+/news/fetch-rss) e usa um advisory lock do PostgreSQL para que apenas uma
+coleta rode por vez no cluster, mesmo com várias réplicas do worker.
+
+Cada fonte tem seu próprio intervalo, calculado a partir do ritmo de
+publicação (ver polling_service): fontes movimentadas são consultadas com
+mais frequência e fontes paradas, com menos.
+
+O worker também reconcilia periodicamente o contador de curtidas das
+notícias (a cada likes_reconcile_minutes) e recalcula os rankings do feed
+"em alta" (a cada ranking_refresh_minutes).
+
+Uso (a partir da pasta backend/):
+    python -m src.workers.ingest_worker            # coleta contínua, por fonte
+    python -m src.workers.ingest_worker --uma-vez  # uma coleta de todas as fontes e sai
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+from src.db.database import SessionLocal
+from src.db.locks import (
+    COLETA_LOCK_KEY,
+    RANKING_LOCK_KEY,
+    RECONCILIACAO_LOCK_KEY,
+    advisory_lock,
+)
+from src.db.models.fonte_model import Fonte
+from src.services.likes_service import reconciliar_qtd_curtidas
+from src.services.polling_service import (
+    POLLING_MIN_MINUTES,
+    aplicar_jitter,
+    intervalos_por_fonte,
+)
+from src.services.ranking_service import atualizar_rankings
+from src.services.rss_service import get_news_from_rss
+from src.services.summary_service import encerrar_executor
+
+load_dotenv()
+
+# Espera máxima entre verificações, para perceber fontes novas
+ESPERA_MAXIMA = timedelta(minutes=POLLING_MIN_MINUTES)
+# Nova tentativa das fontes vencidas quando a coleta não rodou (lock com
+# outro worker ou erro): o menor intervalo, em vez do ritmo de cada fonte
+RETENTATIVA = timedelta(minutes=POLLING_MIN_MINUTES)
+# Intervalo da reconciliação do contador de curtidas
+RECONCILIACAO_INTERVALO = timedelta(minutes=float(os.getenv("likes_reconcile_minutes", "60")))
+# Intervalo do recálculo dos rankings do feed "em alta"
+RANKING_INTERVALO = timedelta(minutes=float(os.getenv("ranking_refresh_minutes", "5")))
+
+
+async def executar_coleta(ids_fontes: list[int] | None = None) -> dict | None:
+    """
+    Executa uma coleta, se nenhuma outra estiver em andamento.
+
+    args:
+    - ids_fontes (list[int] | None): Fontes a coletar (padrão: todas).
+
+    returns:
+    - dict | None: Resultado da coleta, ou None se ela foi pulada ou falhou.
+    """
+    with advisory_lock(COLETA_LOCK_KEY) as obtido:
+        if not obtido:
+            print("🔒 Outra coleta já está em andamento. Pulando...")
+            return None
+
+        db = SessionLocal()
+        try:
+            return await get_news_from_rss(db, ids_fontes)
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Erro na coleta de notícias: {e}")
+            return None
+        finally:
+            db.close()
+
+
+def executar_reconciliacao() -> int | None:
+    """
+    Corrige o contador qtd_curtidas das notícias que divergiram da tabela
+    de curtidas. Apenas um worker do cluster executa por vez.
+
+    returns:
+    - int | None: Notícias corrigidas, ou None se foi pulada ou falhou.
+    """
+    with advisory_lock(RECONCILIACAO_LOCK_KEY) as obtido:
+        if not obtido:
+            return None
+
+        with SessionLocal() as db:
+            try:
+                corrigidas = reconciliar_qtd_curtidas(db)
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Erro ao reconciliar curtidas: {e}")
+                return None
+
+        if corrigidas:
+            print(f"🔧 Contador de curtidas corrigido em {corrigidas} notícias")
+        return corrigidas
+
+
+def executar_atualizacao_rankings() -> dict[str, int] | None:
+    """
+    Recalcula os rankings do feed "em alta" de todas as janelas de tempo.
+    Apenas um worker do cluster executa por vez.
+
+    returns:
+    - dict[str, int] | None: Posições por janela, ou None se foi pulada ou falhou.
+    """
+    with advisory_lock(RANKING_LOCK_KEY) as obtido:
+        if not obtido:
+            return None
+
+        with SessionLocal() as db:
+            try:
+                return atualizar_rankings(db)
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Erro ao atualizar rankings: {e}")
+                return None
+
+
+def listar_fontes_rss() -> list[int]:
+    with SessionLocal() as db:
+        return [id_fonte for (id_fonte,) in db.query(Fonte.id).filter(Fonte.tipo_extracao == "rss")]
+
+
+def agendar(ids_fontes: list[int], agora: datetime) -> dict[int, datetime]:
+    """Calcula o próximo horário de coleta de cada fonte, com jitter."""
+    with SessionLocal() as db:
+        intervalos = intervalos_por_fonte(db, ids_fontes, agora)
+    return {
+        id_fonte: agora + aplicar_jitter(intervalo)
+        for id_fonte, intervalo in intervalos.items()
+    }
+
+
+def reagendar(ids_fontes: list[int], agora: datetime) -> dict[int, datetime]:
+    """
+    Próxima tentativa das fontes que não foram coletadas. Com várias réplicas
+    do worker, a que perdeu o lock não empurra as fontes pelo intervalo
+    inteiro (até polling_max_minutes) sem que ninguém as tenha coletado.
+    """
+    return {id_fonte: agora + aplicar_jitter(RETENTATIVA) for id_fonte in ids_fontes}
+
+
+async def executar(uma_vez: bool = False):
+    """
+    Laço do worker: coleta as fontes cujo horário chegou e reagenda cada uma
+    de acordo com o próprio ritmo de publicação. Os horários ficam em memória;
+    ao reiniciar, todas as fontes são coletadas de imediato.
+    """
+    proximas: dict[int, datetime] = {}
+    proxima_reconciliacao = datetime.now(timezone.utc)
+    proximo_ranking = proxima_reconciliacao
+    try:
+        while True:
+            agora = datetime.now(timezone.utc)
+            ids_fontes = listar_fontes_rss()
+            devidas = [i for i in ids_fontes if proximas.get(i, agora) <= agora]
+
+            if devidas:
+                print(f"⏰ Coletando {len(devidas)} de {len(ids_fontes)} fontes")
+                resultado = await executar_coleta(devidas)
+                if resultado is None:
+                    # Pulada ou com erro: as fontes continuam devidas
+                    proximas.update(reagendar(devidas, datetime.now(timezone.utc)))
+                else:
+                    proximas.update(agendar(devidas, datetime.now(timezone.utc)))
+
+            if agora >= proxima_reconciliacao:
+                executar_reconciliacao()
+                proxima_reconciliacao = agora + RECONCILIACAO_INTERVALO
+
+            # Depois da reconciliação, para o ranking partir de contadores corretos
+            if agora >= proximo_ranking:
+                executar_atualizacao_rankings()
+                proximo_ranking = agora + RANKING_INTERVALO
+
+            if uma_vez:
+                break
+
+            # Esquece fontes removidas e dorme até a próxima tarefa vencer
+            proximas = {i: proximas[i] for i in ids_fontes if i in proximas}
+            proxima = min([*proximas.values(), proxima_reconciliacao, proximo_ranking])
+            espera = min(proxima - datetime.now(timezone.utc), ESPERA_MAXIMA)
+            await asyncio.sleep(max(espera.total_seconds(), 1))
+    finally:
+        encerrar_executor()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker de coleta de notícias")
+    parser.add_argument("--uma-vez", action="store_true", help="Coleta todas as fontes uma vez e sai")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(executar(args.uma_vez))
+    except KeyboardInterrupt:
+        print("👋 Worker de coleta encerrado.")
+
+
+if __name__ == "__main__":
+    main()
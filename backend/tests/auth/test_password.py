@@ -0,0 +1,75 @@
+# tests/auth/test_password.py
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.auth.password import ExecutorSenhas, criar_contexto, hash_password, verify_password
+from src.schemas.usuario_schema import LoginSchema
+from src.services.user_service import authenticate_usuario
+
+
+@pytest.fixture(autouse=True)
+def contexto_barato():
+    # Custo mínimo para os testes não gastarem 64 MB e centenas de ms por hash
+    with patch("src.auth.password.password_context", criar_contexto(1, 8, 1)):
+        yield
+
+
+def test_hash_e_verify_password_pelo_executor():
+    senha_hash = hash_password("segredo")
+
+    assert senha_hash.startswith("$argon2id$v=19$m=8,t=1,p=1$")
+    assert verify_password("segredo", senha_hash) is True
+    assert verify_password("outra", senha_hash) is False
+
+
+def test_executor_lotado_responde_503():
+    executor = ExecutorSenhas(workers=1, fila=0)
+    liberar = threading.Event()
+    iniciou = threading.Event()
+
+    def lenta():
+        iniciou.set()
+        liberar.wait()
+        return "ok"
+
+    resultado = []
+    thread = threading.Thread(target=lambda: resultado.append(executor.executar(lenta)))
+    thread.start()
+    iniciou.wait()
+
+    with pytest.raises(HTTPException) as exc:
+        executor.executar(lambda: "rápida")
+    assert exc.value.status_code == 503
+    assert executor.stats()["ocupadas"] == 1
+
+    liberar.set()
+    thread.join()
+    assert resultado == ["ok"]
+    # A vaga volta depois que o pedido termina
+    assert executor.executar(lambda: "rápida") == "rápida"
+    assert executor.stats() == {"workers": 1, "fila": 0, "ocupadas": 0, "rejeitadas": 1}
+
+
+def test_executor_propaga_erro_e_libera_vaga():
+    executor = ExecutorSenhas(workers=1, fila=0)
+
+    def falha():
+        raise ValueError("hash inválido")
+
+    with pytest.raises(ValueError):
+        executor.executar(falha)
+    assert executor.executar(lambda: 1) == 1
+
+
+def test_authenticate_usuario_repassa_503():
+    db = MagicMock()
+    erro = HTTPException(status_code=503, detail="Servidor ocupado.")
+
+    with patch("src.services.user_service.verify_password", side_effect=erro):
+        with pytest.raises(HTTPException) as exc:
+            authenticate_usuario(LoginSchema(email="a@x.com", senha="segredo"), db)
+
+    assert exc.value.status_code == 503
@@ -0,0 +1,27 @@
+# Fixtures compartilhadas pelos testes que executam SQL de verdade
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.database import Base
+
+
+@pytest.fixture
+def sqlite_engine():
+    # Banco SQLite em memória com todas as tabelas; StaticPool mantém a mesma
+    # conexão para todas as sessões (e threads) do teste
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_db(sqlite_engine):
+    # Sessão no banco vazio; cada módulo insere os próprios dados
+    db = sessionmaker(bind=sqlite_engine)()
+    yield db
+    db.close()
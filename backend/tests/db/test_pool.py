@@ -0,0 +1,90 @@
+# tests/db/test_pool.py
+import threading
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from src.db.database import opcoes_engine
+from src.db.pool import AsyncAdaptedQueuePoolMonitorado, QueuePoolMonitorado, estatisticas_pool
+
+
+@pytest.fixture
+def engine_pequeno(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePoolMonitorado,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    yield engine
+    engine.dispose()
+
+
+# --- Testes para estatisticas_pool ---
+def test_estatisticas_pool_conexao_em_uso(engine_pequeno):
+    with engine_pequeno.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        estatisticas = estatisticas_pool(engine_pequeno.pool)
+        assert estatisticas["tamanho"] == 1
+        assert estatisticas["em_uso"] == 1
+
+    estatisticas = estatisticas_pool(engine_pequeno.pool)
+    assert estatisticas["em_uso"] == 0
+    assert estatisticas["disponiveis"] == 1
+    assert estatisticas["checkouts"] == 1
+    assert estatisticas["timeouts"] == 0
+
+
+def test_estatisticas_pool_registra_espera_e_timeout(engine_pequeno):
+    with engine_pequeno.connect():
+        # Pool cheio: o segundo checkout espera pool_timeout e falha
+        with pytest.raises(exc.TimeoutError):
+            engine_pequeno.connect()
+
+    estatisticas = estatisticas_pool(engine_pequeno.pool)
+    assert estatisticas["checkouts"] == 2
+    assert estatisticas["timeouts"] == 1
+    assert estatisticas["espera_maxima_ms"] >= 200
+
+
+def test_estatisticas_pool_espera_ate_conexao_ser_devolvida(engine_pequeno):
+    conn = engine_pequeno.connect()
+    liberar = threading.Timer(0.05, conn.close)
+    liberar.start()
+
+    with engine_pequeno.connect():
+        pass
+    liberar.join()
+
+    estatisticas = estatisticas_pool(engine_pequeno.pool)
+    assert estatisticas["timeouts"] == 0
+    assert estatisticas["espera_maxima_ms"] >= 40
+
+
+# --- Testes para opcoes_engine ---
+def test_opcoes_engine_sincrono_sem_connect_args():
+    opcoes = opcoes_engine(pgbouncer=True)
+
+    assert opcoes["poolclass"] is QueuePoolMonitorado
+    # psycopg2 não usa prepared statements no servidor
+    assert "connect_args" not in opcoes
+
+
+def test_opcoes_engine_pgbouncer_asyncpg_desliga_prepared_statements():
+    opcoes = opcoes_engine(assincrono=True, driver="asyncpg", pgbouncer=True)
+
+    assert opcoes["poolclass"] is AsyncAdaptedQueuePoolMonitorado
+    assert opcoes["connect_args"]["statement_cache_size"] == 0
+    nome = opcoes["connect_args"]["prepared_statement_name_func"]
+    assert nome() != nome()
+
+
+def test_opcoes_engine_pgbouncer_psycopg():
+    opcoes = opcoes_engine(assincrono=True, driver="psycopg", pgbouncer=True)
+
+    assert opcoes["connect_args"] == {"prepare_threshold": None}
+
+
+def test_opcoes_engine_sem_pgbouncer():
+    assert "connect_args" not in opcoes_engine(assincrono=True, pgbouncer=False)
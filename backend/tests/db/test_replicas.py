@@ -0,0 +1,128 @@
+# tests/db/test_replicas.py
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from src.auth.jwt import create_access_token
+from src.db.database import Base
+from src.db.models.fonte_model import Fonte
+from src.db.replicas import RoutingSession, _criar_marcas, get_read_db, marcar_escrita
+from src.utils.cache import MemoryCache, RedisCache
+
+
+@pytest.fixture
+def bancos(tmp_path):
+    # Primário e réplica com conteúdos diferentes para saber quem respondeu
+    primario = create_engine(f"sqlite:///{tmp_path / 'primario.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for bind, nome in ((primario, "primario"), (replica, "replica")):
+        Base.metadata.create_all(bind=bind)
+        with sessionmaker(bind=bind)() as db:
+            db.add(Fonte(id=1, url="http://fonte.com/rss", tipo_extracao="rss", nome=nome))
+            db.commit()
+    yield primario, replica
+    primario.dispose()
+    replica.dispose()
+
+
+def sessao(primario, replicas):
+    class SessaoTeste(RoutingSession):
+        pass
+
+    SessaoTeste.primario = primario
+    SessaoTeste.replicas = replicas
+    return sessionmaker(class_=SessaoTeste, autoflush=False)()
+
+
+def nome_da_fonte(db):
+    return db.scalar(select(Fonte.nome).where(Fonte.id == 1))
+
+
+def requisicao(usuario_id=None):
+    headers = []
+    if usuario_id is not None:
+        token = create_access_token({"sub": str(usuario_id)})
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+# --- Testes para RoutingSession ---
+def test_routing_session_le_da_replica(bancos):
+    primario, replica = bancos
+
+    with sessao(primario, [replica]) as db:
+        assert nome_da_fonte(db) == "replica"
+
+
+def test_routing_session_escreve_no_primario(bancos):
+    primario, replica = bancos
+
+    with sessao(primario, [replica]) as db:
+        db.add(Fonte(id=2, url="http://outra.com/rss", tipo_extracao="rss", nome="nova"))
+        db.commit()
+
+    with sessionmaker(bind=primario)() as db:
+        assert db.get(Fonte, 2) is not None
+    with sessionmaker(bind=replica)() as db:
+        assert db.get(Fonte, 2) is None
+
+
+def test_routing_session_marcada_le_do_primario(bancos):
+    primario, replica = bancos
+
+    with sessao(primario, [replica]) as db:
+        db.info["primario"] = True
+        assert nome_da_fonte(db) == "primario"
+
+
+def test_routing_session_sem_replicas_usa_primario(bancos):
+    primario, _ = bancos
+
+    with sessao(primario, []) as db:
+        assert nome_da_fonte(db) == "primario"
+
+
+# --- Testes para get_read_db (leia-suas-escritas) ---
+@patch("src.db.replicas.replica_engines", ["replica"])
+@patch("src.db.replicas._marcas", MemoryCache(ttl=60))
+def test_get_read_db_usuario_que_curtiu_le_do_primario():
+    marcar_escrita(7)
+
+    for usuario_id, esperado in ((7, True), (8, False), (None, False)):
+        dependencia = get_read_db(requisicao(usuario_id))
+        db = next(dependencia)
+        assert db.info["primario"] is esperado
+        dependencia.close()
+
+
+@patch("src.db.replicas._marcas", MemoryCache(ttl=60))
+def test_marcar_escrita_sem_replicas_nao_marca():
+    marcar_escrita(7)
+
+    dependencia = get_read_db(requisicao(7))
+    assert next(dependencia).info["primario"] is False
+    dependencia.close()
+
+
+# --- Testes para as marcas de escrita ---
+@patch("src.db.replicas.DB_REPLICA_URLS", ["postgresql://replica/db"])
+def test_marcas_exigem_backend_compartilhado():
+    with patch("src.db.replicas.criar_cache", return_value=MemoryCache()):
+        assert _criar_marcas() is None
+
+    with patch("src.db.replicas.criar_cache", return_value=RedisCache(MagicMock())):
+        marcas = _criar_marcas()
+
+    assert isinstance(marcas, RedisCache)
+    assert marcas.prefixo == "econnect:primario:"
+
+
+@patch("src.db.replicas.replica_engines", ["replica"])
+@patch("src.db.replicas._marcas", None)
+def test_get_read_db_sem_marcas_nao_quebra():
+    dependencia = get_read_db(requisicao(7))
+    assert next(dependencia).info["primario"] is False
+    dependencia.close()
@@ -0,0 +1,184 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from src.auth.api_key import verify_api_key
+from src.auth.auth import get_principal_optional
+from src.auth.principal import Principal
+from src.db.database import get_db
+from src.db.replicas import get_read_db
+from src.db.models.curtir_model import Curtir
+from src.db.models.fonte_model import Fonte
+from src.db.models.noticia_model import Noticia
+from src.db.models.usuario_model import Usuario
+from src.main import app
+from src.middlewares.rate_limit_middleware import requests_log
+from src.utils.cache import MemoryCache
+
+
+@pytest.fixture
+def news_client(sqlite_engine):
+    # 12 notícias; o usuário 1 curtiu as pares e o usuário 2, a 12
+    engine = sqlite_engine
+    TestingSession = sessionmaker(bind=engine)
+    with TestingSession() as db:
+        db.add(Fonte(id=1, url="http://fonte.com/rss", tipo_extracao="rss", nome="Fonte"))
+        db.add_all([
+            Usuario(id=i, nome=f"U{i}", email=f"u{i}@x.com", senha_hash="h") for i in (1, 2)
+        ])
+        db.add_all([
+            Noticia(
+                id=i,
+                titulo=f"Notícia {i}",
+                resumo="Resumo.",
+                imagem="img.jpg",
+                data_postagem=datetime(2024, 1, 1) + timedelta(hours=i),
+                url=f"http://noticia.com/{i}",
+                id_fonte=1,
+                qtd_curtidas=(i % 2 == 0) + (i == 12),
+            )
+            for i in range(1, 13)
+        ])
+        db.add_all([Curtir(id_usuario=1, id_noticia=i) for i in range(2, 13, 2)])
+        db.add(Curtir(id_usuario=2, id_noticia=12))
+        db.commit()
+
+    def override_get_db():
+        with TestingSession() as db:
+            yield db
+
+    class Cliente(TestClient):
+        usuario_id = None  # Usuário "logado" nas próximas requisições
+
+    client = Cliente(app)
+
+    def override_usuario():
+        return Principal(id=client.usuario_id) if client.usuario_id else None
+
+    async def override_verify_api_key():
+        return True
+
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    anteriores = dict(app.dependency_overrides)
+    app.dependency_overrides.update({
+        get_db: override_get_db,
+        get_read_db: override_get_db,
+        get_principal_optional: override_usuario,
+        verify_api_key: override_verify_api_key,
+    })
+    requests_log.clear()
+    event.listen(engine, "before_cursor_execute", registrar)
+    client.consultas = consultas
+    client.sessao = TestingSession
+    client.cache = MemoryCache(max_entries=100, ttl=60)
+    with patch("src.services.feed_cache_service.get_cache", return_value=client.cache):
+        yield client
+    event.remove(engine, "before_cursor_execute", registrar)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(anteriores)
+
+
+@pytest.mark.parametrize("url", ["/news/feed/latest?limit=4", "/news/feed/hottest?limit=4"])
+def test_feed_logado_usa_pagina_em_cache(news_client, url):
+    anonima = news_client.get(url).json()
+    news_client.consultas.clear()
+
+    news_client.usuario_id = 1
+    usuario_1 = news_client.get(url)
+    news_client.usuario_id = 2
+    usuario_2 = news_client.get(url)
+
+    # Página do cache + uma consulta de curtidas por usuário
+    assert news_client.cache.stats()["hits"] == 2
+    assert len(news_client.consultas) == 2
+    ids = [n["id"] for n in anonima]
+    assert [n["id"] for n in usuario_1.json()] == [n["id"] for n in usuario_2.json()] == ids
+    assert [n["curtido"] for n in usuario_1.json()] == [i % 2 == 0 for i in ids]
+    assert [n["curtido"] for n in usuario_2.json()] == [i == 12 for i in ids]
+    assert not any(n["curtido"] for n in anonima)
+    assert usuario_1.headers["X-Next-Cursor"] == usuario_2.headers["X-Next-Cursor"]
+
+
+def test_feed_logado_primeiro_a_pedir_preenche_o_cache(news_client):
+    news_client.usuario_id = 1
+    logado = news_client.get("/news/feed/latest?limit=3").json()
+    news_client.usuario_id = None
+    anonima = news_client.get("/news/feed/latest?limit=3").json()
+
+    assert [n["curtido"] for n in logado] == [True, False, True]
+    # A página guardada não leva as curtidas de quem a montou
+    assert not any(n["curtido"] for n in anonima)
+    assert news_client.cache.stats()["hits"] == 1
+
+
+# --- ETag e 304 ---
+@pytest.mark.parametrize("url", ["/news/feed/latest?limit=4", "/news/feed/hottest?limit=4", "/news/?news_id=3"])
+def test_etag_e_304(news_client, url):
+    primeira = news_client.get(url)
+    etag = primeira.headers["ETag"]
+
+    revalidada = news_client.get(url, headers={"If-None-Match": etag})
+
+    assert revalidada.status_code == 304
+    assert revalidada.content == b""
+    assert revalidada.headers["ETag"] == etag
+    assert primeira.headers["Cache-Control"] == "public, max-age=0, must-revalidate"
+    assert primeira.headers["Vary"] == "Authorization"
+
+
+def test_etag_fraca_e_lista_no_if_none_match(news_client):
+    etag = news_client.get("/news/feed/latest").headers["ETag"]
+
+    resposta = news_client.get("/news/feed/latest", headers={"If-None-Match": f'"outra", W/{etag}'})
+
+    assert resposta.status_code == 304
+
+
+def test_etag_muda_com_o_contador_de_curtidas(news_client):
+    etag = news_client.get("/news/?news_id=3").headers["ETag"]
+
+    with news_client.sessao() as db:
+        db.query(Noticia).filter(Noticia.id == 3).update({Noticia.qtd_curtidas: 5})
+        db.commit()
+    resposta = news_client.get("/news/?news_id=3", headers={"If-None-Match": etag})
+
+    assert resposta.status_code == 200
+    assert resposta.json()["qtd_curtidas"] == 5
+    assert resposta.headers["ETag"] != etag
+
+
+def test_etag_logado_privada_e_por_usuario(news_client):
+    news_client.usuario_id = 1
+    usuario_1 = news_client.get("/news/feed/latest?limit=4")
+    news_client.usuario_id = 2
+    usuario_2 = news_client.get("/news/feed/latest?limit=4", headers={"If-None-Match": usuario_1.headers["ETag"]})
+
+    # Curtidas diferentes: o usuário 2 não pode reaproveitar a versão do usuário 1
+    assert usuario_2.status_code == 200
+    assert usuario_2.headers["ETag"] != usuario_1.headers["ETag"]
+    assert usuario_1.headers["Cache-Control"] == "private, no-cache"
+
+
+# --- Coleta manual ---
+@contextmanager
+def lock_obtido(chave):
+    yield True
+
+
+@patch("src.routers.news_router.advisory_lock", lock_obtido)
+@patch("src.routers.news_router.encerrar_executor")
+@patch("src.routers.news_router.get_news_from_rss", side_effect=RuntimeError("falhou"))
+def test_fetch_rss_encerra_pool_de_resumos_mesmo_com_erro(mock_coleta, mock_encerrar, news_client):
+    with pytest.raises(RuntimeError):
+        news_client.post("/news/fetch-rss")
+
+    mock_encerrar.assert_called_once()
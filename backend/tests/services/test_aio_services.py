@@ -0,0 +1,256 @@
+# Serviços AsyncSession (db_async=true) comparados com os síncronos no mesmo banco
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.auth.api_key import verify_api_key
+from src.auth.auth import get_current_user_async, get_principal_optional
+from src.auth.principal import Principal
+from src.db.database import Base, get_async_db
+from src.db.replicas import get_async_read_db
+from src.db.models.curtir_model import Curtir
+from src.db.models.fonte_model import Fonte
+from src.db.models.noticia_model import Noticia
+from src.db.models.usuario_model import Usuario
+from src.routers.aio.news_router import news_router
+from src.schemas.usuario_schema import UpdateUsuario
+from src.services import news_service, ranking_service
+from src.services.aio import likes_service as aio_likes
+from src.services.aio import news_service as aio_news
+from src.services.aio import ranking_service as aio_ranking
+from src.services.aio import user_service as aio_user
+from src.services.likes_service import reconciliar_qtd_curtidas
+from src.utils.cache import MemoryCache
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest_asyncio.fixture
+async def bancos(tmp_path):
+    # Mesmo arquivo SQLite para as duas sessões: 15 notícias; o usuário 1
+    # curtiu as pares e o usuário 2, as múltiplas de 3
+    caminho = tmp_path / "econnect.db"
+    engine = create_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(bind=engine)
+    Sessao = sessionmaker(bind=engine)
+    with Sessao() as db:
+        db.add(Fonte(id=1, url="http://fonte.com/rss", tipo_extracao="rss", nome="Fonte"))
+        db.add_all([
+            Usuario(id=i, nome=f"U{i}", email=f"u{i}@x.com", senha_hash="h") for i in (1, 2)
+        ])
+        db.add_all([
+            Noticia(
+                id=i,
+                titulo=f"Notícia {i}",
+                resumo="Resumo.",
+                imagem="img.jpg",
+                data_postagem=datetime(2024, 1, 1) + timedelta(hours=i),
+                url=f"http://noticia.com/{i}",
+                id_fonte=1,
+            )
+            for i in range(1, 16)
+        ])
+        db.add_all(
+            [
+                Curtir(id_usuario=1, id_noticia=i, data_curtida=datetime(2024, 2, 1, 0, i))
+                for i in range(2, 16, 2)
+            ]
+            + [
+                Curtir(id_usuario=2, id_noticia=i, data_curtida=datetime(2024, 2, 1, 1, i))
+                for i in range(3, 16, 3)
+            ]
+        )
+        db.commit()
+        reconciliar_qtd_curtidas(db)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{caminho}")
+    SessaoAsync = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    yield Sessao, SessaoAsync
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def dump(noticias):
+    return [noticia.model_dump() for noticia in noticias]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order_by", ["data_postagem", "qtd_curtidas"])
+async def test_get_news_feed_igual_ao_sincrono(bancos, order_by):
+    Sessao, SessaoAsync = bancos
+    with Sessao() as db:
+        esperado = news_service.get_news_feed(db.get(Usuario, 1), db, limit=4, order_by=order_by)
+        cursor = news_service.get_next_cursor(esperado, 4, order_by)
+        esperado_2 = news_service.get_news_feed(
+            db.get(Usuario, 1), db, limit=4, order_by=order_by, cursor=cursor
+        )
+
+    async with SessaoAsync() as db:
+        usuario = await db.get(Usuario, 1)
+        pagina = await aio_news.get_news_feed(usuario, db, limit=4, order_by=order_by)
+        pagina_2 = await aio_news.get_news_feed(usuario, db, limit=4, order_by=order_by, cursor=cursor)
+
+    assert dump(pagina) == dump(esperado)
+    assert dump(pagina_2) == dump(esperado_2)
+
+
+@pytest.mark.asyncio
+async def test_get_liked_news_e_marcar_curtidos(bancos):
+    Sessao, SessaoAsync = bancos
+    with Sessao() as db:
+        esperado, cursor = news_service.get_liked_news(db.get(Usuario, 1), db, limit=3)
+        anonima = news_service.get_news_feed(None, db, limit=5)
+
+    async with SessaoAsync() as db:
+        usuario = await db.get(Usuario, 2)
+        curtidas, proximo = await aio_news.get_liked_news(await db.get(Usuario, 1), db, limit=3)
+        marcadas = await aio_news.marcar_curtidos(anonima, usuario, db)
+
+    assert (dump(curtidas), proximo) == (dump(esperado), cursor)
+    assert [(n.id, n.curtido) for n in marcadas] == [(i, i % 3 == 0) for i in range(15, 10, -1)]
+
+
+@pytest.mark.asyncio
+async def test_marcar_curtidos_usa_contador_atual(bancos):
+    Sessao, SessaoAsync = bancos
+    with Sessao() as db:
+        anonima = news_service.get_news_feed(None, db, limit=3)
+        db.query(Noticia).filter(Noticia.id == 14).update({Noticia.qtd_curtidas: 7})
+        db.commit()
+
+    async with SessaoAsync() as db:
+        marcadas = await aio_news.marcar_curtidos(anonima, await db.get(Usuario, 1), db)
+
+    assert [(n.id, n.curtido, n.qtd_curtidas) for n in marcadas] == [
+        (15, False, anonima[0].qtd_curtidas),
+        (14, True, 7),
+        (13, False, anonima[2].qtd_curtidas),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_news_by_id(bancos):
+    _, SessaoAsync = bancos
+    async with SessaoAsync() as db:
+        noticia = await aio_news.get_news_by_id(await db.get(Usuario, 1), 6, db)
+        with pytest.raises(HTTPException) as exc_info:
+            await aio_news.get_news_by_id(None, 999, db)
+
+    assert (noticia.qtd_curtidas, noticia.curtido, noticia.fonte.nome) == (2, True, "Fonte")
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_hottest_feed_via_run_sync(bancos):
+    Sessao, SessaoAsync = bancos
+    with Sessao() as db:
+        ranking_service.atualizar_rankings(db)
+        esperado = ranking_service.get_hottest_feed(None, db, limit=4)
+
+    async with SessaoAsync() as db:
+        pagina = await aio_ranking.get_hottest_feed(None, db, limit=4)
+
+    assert (dump(pagina[0]), pagina[1]) == (dump(esperado[0]), esperado[1])
+
+
+@pytest.mark.asyncio
+async def test_handle_like_atualiza_contador(bancos):
+    _, SessaoAsync = bancos
+    async with SessaoAsync() as db:
+        usuario = await db.get(Usuario, 2)
+        assert await aio_likes.handleLike(db, usuario, 1) == {"liked": True, "likes": 1}
+        assert await aio_likes.handleLike(db, usuario, 6) == {"liked": False, "likes": 1}
+        curtidas = set(await db.scalars(select(Curtir.id_noticia).where(Curtir.id_usuario == 2)))
+
+    assert curtidas == {1, 3, 9, 12, 15}
+
+
+@pytest.mark.asyncio
+@patch("src.services.aio.user_service.delete_user_image")
+async def test_delete_usuario_desconta_curtidas(mock_delete_image, bancos):
+    _, SessaoAsync = bancos
+    async with SessaoAsync() as db:
+        await aio_user.delete_usuario(await aio_user.get_usuario(1, db), db)
+        restantes = await db.execute(
+            select(Noticia.id, Noticia.qtd_curtidas).where(Noticia.id.in_([6, 8]))
+        )
+
+    assert dict(restantes.all()) == {6: 1, 8: 0}
+
+    mock_delete_image.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_update_usuario_hash_fora_do_event_loop(bancos):
+    _, SessaoAsync = bancos
+    threads = []
+
+    def hash_falso(senha):
+        threads.append(threading.current_thread())
+        return f"hash:{senha}"
+
+    with patch("src.services.aio.user_service.verify_password", return_value=False), patch(
+        "src.services.aio.user_service.hash_password", side_effect=hash_falso
+    ):
+        async with SessaoAsync() as db:
+            usuario = await aio_user.get_usuario(1, db)
+            resposta = await aio_user.update_usuario(
+                usuario, db, UpdateUsuario(nome="Ana", senha="nova")
+            )
+
+    async with SessaoAsync() as db:
+        salvo = await aio_user.get_usuario(1, db)
+
+    assert resposta.nome == "Ana"
+    assert salvo.senha_hash == "hash:nova"
+    assert threads and threads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_update_usuario_email_em_uso(bancos):
+    _, SessaoAsync = bancos
+    async with SessaoAsync() as db:
+        usuario = await aio_user.get_usuario(1, db)
+        with pytest.raises(HTTPException) as exc:
+            await aio_user.update_usuario(usuario, db, UpdateUsuario(email="u2@x.com"))
+
+    assert exc.value.status_code == 409
+
+
+# --- Rotas assíncronas ---
+def test_rotas_assincronas_de_noticias(bancos):
+    _, SessaoAsync = bancos
+    app = FastAPI()
+    app.include_router(news_router)
+
+    async def override_get_async_db():
+        async with SessaoAsync() as db:
+            yield db
+
+    async def override_usuario(db=Depends(get_async_db)):
+        return await db.get(Usuario, 2)
+
+    app.dependency_overrides.update({
+        get_async_db: override_get_async_db,
+        get_async_read_db: override_get_async_db,
+        get_current_user_async: override_usuario,
+        get_principal_optional: lambda: Principal(id=2),
+        verify_api_key: lambda: True,
+    })
+
+    with patch("src.services.feed_cache_service.get_cache", return_value=MemoryCache()):
+        client = TestClient(app)
+        feed = client.get("/news/feed/latest?limit=3")
+        curtida = client.post("/news/handle-like/15")
+
+    assert [(n["id"], n["curtido"]) for n in feed.json()] == [(15, True), (14, False), (13, False)]
+    assert "X-Next-Cursor" in feed.headers
+    assert curtida.json() == {"liked": False, "likes": 0}
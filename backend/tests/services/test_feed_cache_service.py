@@ -0,0 +1,216 @@
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import Base
+from src.db.models.fonte_model import Fonte
+from src.db.models.noticia_model import Noticia
+from src.db.models.ranking_model import RankingNoticia
+from src.schemas.fonte_schema import FonteResponse
+from src.schemas.noticia_schema import NoticiaResponse
+from src.services.feed_cache_service import get_feed_em_cache, invalidar_feeds, metricas_cache
+from src.utils.cache import MemoryCache, RedisCache, criar_cache
+
+
+class RedisLocal:
+    """Substituto local de um cliente Redis: get, set com ex e incr."""
+
+    def __init__(self):
+        self.dados = {}
+
+    def get(self, chave):
+        valor = self.dados.get(chave)
+        return valor.encode() if isinstance(valor, str) else valor
+
+    def set(self, chave, valor, ex=None):
+        self.dados[chave] = valor
+
+    def incr(self, chave):
+        self.dados[chave] = int(self.dados.get(chave, 0)) + 1
+        return self.dados[chave]
+
+
+def noticia(i):
+    return NoticiaResponse(
+        id=i,
+        titulo=f"Notícia {i}",
+        resumo="Resumo.",
+        imagem="img.jpg",
+        data_postagem=datetime(2024, 1, 1, i),
+        url=f"http://noticia.com/{i}",
+        id_fonte=1,
+        data_coleta=datetime(2024, 1, 2),
+        qtd_curtidas=i,
+        curtido=False,
+        fonte=FonteResponse(nome="Fonte", url="http://fonte.com"),
+    )
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    novo = MemoryCache(max_entries=10, ttl=30) if request.param == "memory" else RedisCache(RedisLocal())
+    with patch("src.services.feed_cache_service.get_cache", return_value=novo):
+        yield novo
+
+
+@pytest.fixture
+def banco(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'econnect.db'}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Fonte(id=1, url="http://fonte.com/rss", tipo_extracao="rss", nome="Fonte"))
+        db.add(nova_noticia(1))
+        db.commit()
+        with patch("src.services.feed_cache_service._versoes", MemoryCache(max_entries=1, ttl=5)) as versoes:
+            yield db, versoes
+    engine.dispose()
+
+
+def nova_noticia(i):
+    return Noticia(
+        id=i,
+        titulo=f"Notícia {i}",
+        resumo="Resumo.",
+        imagem="img.jpg",
+        data_postagem=datetime(2024, 1, 1, i),
+        url=f"http://noticia.com/{i}",
+        id_fonte=1,
+    )
+
+
+# --- Testes dos backends ---
+def test_memory_cache_expira_pelo_ttl():
+    cache = MemoryCache(max_entries=10, ttl=30)
+    with patch("src.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("a", "1")
+        cache.set("b", "2", ttl=60)
+    with patch("src.utils.cache.time.monotonic", return_value=140.0):
+        assert cache.get("a") is None
+        assert cache.get("b") == "2"
+
+    assert cache.stats()["entradas"] == 1
+
+
+def test_memory_cache_descarta_o_menos_usado():
+    cache = MemoryCache(max_entries=2, ttl=30)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")  # "b" passa a ser o menos usado
+    cache.set("c", "3")
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("1", None, "3")
+    assert cache.stats() == {
+        "backend": "memory",
+        "hits": 3,
+        "misses": 1,
+        "hit_ratio": 0.75,
+        "entradas": 2,
+        "descartes": 1,
+    }
+
+
+def test_redis_cache_falha_do_servidor_vira_miss(capsys):
+    client = MagicMock()
+    client.get.side_effect = ConnectionError("sem conexão")
+    cache = RedisCache(client)
+
+    assert cache.get("a") is None
+    assert cache.get_geracao("feeds") == 0
+    assert cache.stats()["erros"] == 2
+    assert "Erro no cache Redis" in capsys.readouterr().out
+
+
+def test_criar_cache_desligado_ou_sem_pacote_redis():
+    assert criar_cache("none") is None
+    with patch("src.utils.cache.redis", None):
+        assert isinstance(criar_cache("redis"), MemoryCache)
+
+
+# --- Testes para get_feed_em_cache ---
+def test_get_feed_em_cache_hit_nao_consulta_o_banco(cache):
+    carregar = MagicMock(return_value=([noticia(1), noticia(2)], "cursor-2"))
+    params = {"skip": 0, "limit": 2, "cursor": None}
+
+    primeira = get_feed_em_cache("latest", params, carregar)
+    segunda = get_feed_em_cache("latest", params, carregar)
+
+    carregar.assert_called_once()
+    assert segunda == primeira == ([noticia(1), noticia(2)], "cursor-2")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_get_feed_em_cache_chave_por_parametros(cache):
+    carregar = MagicMock(return_value=([noticia(1)], None))
+
+    get_feed_em_cache("hottest", {"cursor": None, "time_filter": "week"}, carregar)
+    get_feed_em_cache("hottest", {"cursor": None, "time_filter": "month"}, carregar)
+    get_feed_em_cache("hottest", {"cursor": "abc", "time_filter": "week"}, carregar)
+    get_feed_em_cache("latest", {"cursor": None, "time_filter": "week"}, carregar)
+
+    assert carregar.call_count == 4
+
+
+def test_invalidar_feeds_descarta_paginas(cache):
+    carregar = MagicMock(return_value=([noticia(1)], None))
+
+    get_feed_em_cache("latest", {"cursor": None}, carregar)
+    invalidar_feeds()
+    get_feed_em_cache("latest", {"cursor": None}, carregar)
+
+    assert carregar.call_count == 2
+
+
+def test_get_feed_em_cache_guarda_json(cache):
+    get_feed_em_cache("latest", {"cursor": None}, lambda: ([noticia(3)], None))
+
+    bruto = cache.get("feeds:0:latest:cursor=")
+    assert json.loads(bruto)["noticias"][0]["data_postagem"] == "2024-01-01T03:00:00"
+
+
+@patch("src.services.feed_cache_service.get_cache", return_value=None)
+def test_get_feed_em_cache_desligado(mock_get_cache):
+    carregar = MagicMock(return_value=([noticia(1)], None))
+
+    get_feed_em_cache("latest", {"cursor": None}, carregar)
+    get_feed_em_cache("latest", {"cursor": None}, carregar)
+    invalidar_feeds()
+
+    assert carregar.call_count == 2
+    assert metricas_cache() == {"backend": "none"}
+
+
+# --- Testes para a versão dos dados (coleta e rankings em outro processo) ---
+def test_get_feed_em_cache_nova_noticia_de_outro_processo(cache, banco):
+    db, versoes = banco
+    carregar = MagicMock(return_value=([noticia(1)], None))
+
+    get_feed_em_cache("latest", {"cursor": None}, carregar, db)
+    get_feed_em_cache("latest", {"cursor": None}, carregar, db)
+    assert carregar.call_count == 1
+
+    # O worker insere uma notícia sem invalidar o cache deste processo
+    db.add(nova_noticia(2))
+    db.commit()
+    get_feed_em_cache("latest", {"cursor": None}, carregar, db)
+    assert carregar.call_count == 1  # Versão ainda reaproveitada
+
+    versoes.delete("versao")  # Passam os cache_version_seconds
+    get_feed_em_cache("latest", {"cursor": None}, carregar, db)
+    assert carregar.call_count == 2
+
+
+def test_get_feed_em_cache_novo_ranking_de_outro_processo(cache, banco):
+    db, versoes = banco
+    carregar = MagicMock(return_value=([noticia(1)], None))
+
+    get_feed_em_cache("hottest", {"cursor": None, "time_filter": "all"}, carregar, db)
+    db.add(RankingNoticia(janela="all", posicao=1, id_noticia=1, qtd_curtidas=0, atualizado_em=datetime(2024, 2, 1)))
+    db.commit()
+    versoes.delete("versao")
+    get_feed_em_cache("hottest", {"cursor": None, "time_filter": "all"}, carregar, db)
+
+    assert carregar.call_count == 2
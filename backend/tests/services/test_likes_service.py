@@ -3,9 +3,13 @@ from unittest.mock import MagicMock, patch, call
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.elements import BinaryExpression
 
+
 from src.db.models.curtir_model import Curtir
+from src.db.models.fonte_model import Fonte
+from src.db.models.noticia_model import Noticia
 from src.db.models.usuario_model import Usuario
-from src.services.likes_service import handleLike, _get_like
+from src.services.likes_service import handleLike, _get_like, reconciliar_qtd_curtidas
+from src.services.user_service import delete_usuario
 
 
 @pytest.fixture
@@ -90,40 +94,23 @@ def test_handle_like_cria_nova_curtida(mock_db_session, mock_usuario):
     total_likes_esperado = 5
 
     with patch('src.services.likes_service._get_like', return_value=None) as mock_get_like_func:
-        mock_count_query = MagicMock()
-        mock_count_filter = MagicMock()
-        mock_db_session.query.return_value = mock_count_query
-        mock_count_query.filter.return_value = mock_count_filter
-        mock_count_filter.count.return_value = total_likes_esperado
-
-        with patch('src.services.likes_service.Curtir') as mock_curtir_constructor:
-            mock_nova_curtida_instancia = MagicMock()
-            mock_curtir_constructor.return_value = mock_nova_curtida_instancia
-            # Para que a comparação de strings da expressão do filtro funcione,
-            # precisamos que o mock_curtir_constructor.id_noticia se comporte como um atributo de coluna.
-            # MagicMock geralmente lida bem com isso para `__eq__` e `__str__`.
-            # Se `mock_curtir_constructor.id_noticia` precisasse de um nome específico para a string SQL,
-            # você poderia configurá-lo:
-            # mock_curtir_constructor.id_noticia.name = 'id_noticia' # Exemplo, pode não ser necessário
-
-            resultado = handleLike(mock_db_session, mock_usuario, news_id)
-
-            mock_get_like_func.assert_called_once_with(user_id, news_id, mock_db_session)
-            mock_curtir_constructor.assert_called_once_with(id_usuario=user_id, id_noticia=news_id)
-            mock_db_session.add.assert_called_once_with(mock_nova_curtida_instancia)
-            mock_db_session.commit.assert_called_once()
+        # INSERT ... RETURNING devolve a curtida; UPDATE ... RETURNING, o novo total
+        mock_db_session.execute.return_value.first.return_value = (news_id,)
+        mock_db_session.execute.return_value.scalar.return_value = total_likes_esperado
 
-            # Verifica a query de contagem
-            mock_db_session.query.assert_called_once_with(mock_curtir_constructor)  # CORREÇÃO 1
-            mock_count_query.filter.assert_called_once()
-            args_chamada_filter_count, _ = mock_count_query.filter.call_args
-            # CORREÇÃO 2: Use mock_curtir_constructor para construir a string da expressão esperada
-            assert str(args_chamada_filter_count[0]) == str(mock_curtir_constructor.id_noticia == news_id)
-            mock_count_filter.count.assert_called_once()
+        resultado = handleLike(mock_db_session, mock_usuario, news_id)
 
-            assert resultado == {"liked": True, "likes": total_likes_esperado}
+        mock_get_like_func.assert_called_once_with(user_id, news_id, mock_db_session)
+        mock_db_session.commit.assert_called_once()
 
+        insert, contador = [c[0][0] for c in mock_db_session.execute.call_args_list]
+        assert "INSERT INTO curtidas" in str(insert) and "ON CONFLICT DO NOTHING" in str(insert)
+        # O contador é incrementado no banco, sem count() na tabela de curtidas
+        assert "qtd_curtidas=(noticias.qtd_curtidas + :qtd_curtidas_1)" in str(contador)
+        assert contador.compile().params["qtd_curtidas_1"] == 1
+        mock_db_session.query.assert_not_called()
 
+        assert resultado == {"liked": True, "likes": total_likes_esperado}
 
 
 def test_handle_like_deleta_curtida_existente(mock_db_session, mock_usuario):
@@ -134,29 +121,99 @@ def test_handle_like_deleta_curtida_existente(mock_db_session, mock_usuario):
 
     # Mock _get_like para retornar uma curtida existente
     with patch('src.services.likes_service._get_like', return_value=curtida_existente_mock) as mock_get_like_func:
-        # Mock para a query de contagem de likes
-        mock_count_query = MagicMock()
-        mock_count_filter = MagicMock()
-        mock_db_session.query.return_value = mock_count_query
-        mock_count_query.filter.return_value = mock_count_filter
-        mock_count_filter.count.return_value = total_likes_esperado_apos_delete
+        mock_db_session.execute.return_value.first.return_value = (news_id,)
+        mock_db_session.execute.return_value.scalar.return_value = total_likes_esperado_apos_delete
 
         resultado = handleLike(mock_db_session, mock_usuario, news_id)
 
         mock_get_like_func.assert_called_once_with(user_id, news_id, mock_db_session)
-        mock_db_session.delete.assert_called_once_with(curtida_existente_mock)
-        mock_db_session.commit.assert_called_once()  # Um commit após deletar
+        mock_db_session.commit.assert_called_once()  # Curtida e contador na mesma transação
 
-        # Verifica a query de contagem
-        mock_db_session.query.assert_called_once_with(Curtir)
-        mock_count_query.filter.assert_called_once()
-        args_chamada_filter_count, _ = mock_count_query.filter.call_args
-        assert str(args_chamada_filter_count[0]) == str(Curtir.id_noticia == news_id)
-        mock_count_filter.count.assert_called_once()
+        delete, contador = [c[0][0] for c in mock_db_session.execute.call_args_list]
+        assert "DELETE FROM curtidas" in str(delete)
+        assert contador.compile().params["qtd_curtidas_1"] == -1
+        mock_db_session.query.assert_not_called()
 
         assert resultado == {"liked": False, "likes": total_likes_esperado_apos_delete}
 
 
+# Testes com SQLite: contador mantido junto com as curtidas
+@pytest.fixture
+def curtidas_db(sqlite_db):
+    sqlite_db.add(Fonte(id=1, url="http://fonte.com/rss", tipo_extracao="rss", nome="Fonte"))
+    sqlite_db.add_all([
+        Usuario(id=i, nome=f"U{i}", email=f"u{i}@x.com", senha_hash="h") for i in (1, 2)
+    ])
+    sqlite_db.add_all([
+        Noticia(id=i, titulo="T", resumo="R", url=f"http://n.com/{i}", id_fonte=1) for i in (1, 2)
+    ])
+    sqlite_db.commit()
+    return sqlite_db
+
+
+def qtd_curtidas(db, news_id):
+    return db.query(Noticia.qtd_curtidas).filter(Noticia.id == news_id).scalar()
+
+
+def test_handle_like_atualiza_contador(curtidas_db):
+    usuario_1, usuario_2 = curtidas_db.get(Usuario, 1), curtidas_db.get(Usuario, 2)
+
+    assert handleLike(curtidas_db, usuario_1, 1) == {"liked": True, "likes": 1}
+    assert handleLike(curtidas_db, usuario_2, 1) == {"liked": True, "likes": 2}
+    assert handleLike(curtidas_db, usuario_1, 1) == {"liked": False, "likes": 1}
+
+    assert qtd_curtidas(curtidas_db, 1) == 1
+    assert curtidas_db.query(Curtir).count() == 1
+
+
+def test_handle_like_descurtir_duas_vezes_nao_desconta_de_novo(curtidas_db):
+    usuario_1, usuario_2 = curtidas_db.get(Usuario, 1), curtidas_db.get(Usuario, 2)
+    handleLike(curtidas_db, usuario_1, 1)
+    handleLike(curtidas_db, usuario_2, 1)
+    curtida = _get_like(1, 1, curtidas_db)
+
+    # Dois cliques simultâneos: os dois leram a curtida antes de qualquer DELETE
+    with patch('src.services.likes_service._get_like', return_value=curtida):
+        assert handleLike(curtidas_db, usuario_1, 1) == {"liked": False, "likes": 1}
+        assert handleLike(curtidas_db, usuario_1, 1) == {"liked": False, "likes": 1}
+
+    assert qtd_curtidas(curtidas_db, 1) == 1
+
+
+def test_handle_like_curtir_duas_vezes_nao_conta_de_novo(curtidas_db):
+    usuario_1 = curtidas_db.get(Usuario, 1)
+
+    with patch('src.services.likes_service._get_like', return_value=None):
+        assert handleLike(curtidas_db, usuario_1, 1) == {"liked": True, "likes": 1}
+        assert handleLike(curtidas_db, usuario_1, 1) == {"liked": True, "likes": 1}
+
+    assert qtd_curtidas(curtidas_db, 1) == 1
+    assert curtidas_db.query(Curtir).count() == 1
+
+
+@patch('src.services.user_service.delete_user_image')
+def test_delete_usuario_desconta_curtidas(mock_delete_image, curtidas_db):
+    usuario_1, usuario_2 = curtidas_db.get(Usuario, 1), curtidas_db.get(Usuario, 2)
+    for news_id in (1, 2):
+        handleLike(curtidas_db, usuario_1, news_id)
+    handleLike(curtidas_db, usuario_2, 1)
+
+    delete_usuario(usuario_1, curtidas_db)
+
+    assert (qtd_curtidas(curtidas_db, 1), qtd_curtidas(curtidas_db, 2)) == (1, 0)
+
+
+def test_reconciliar_qtd_curtidas_corrige_divergencias(curtidas_db):
+    curtidas_db.add_all([Curtir(id_usuario=1, id_noticia=1), Curtir(id_usuario=2, id_noticia=1)])
+    curtidas_db.query(Noticia).filter(Noticia.id == 2).update({Noticia.qtd_curtidas: 7})
+    curtidas_db.commit()
+
+    assert reconciliar_qtd_curtidas(curtidas_db) == 2
+    assert (qtd_curtidas(curtidas_db, 1), qtd_curtidas(curtidas_db, 2)) == (2, 0)
+    # Nada mais a corrigir
+    assert reconciliar_qtd_curtidas(curtidas_db) == 0
+
+
 def test_handle_like_usuario_sem_id_levanta_valueerror(mock_db_session, mock_usuario_sem_id):
     news_id = 202
 
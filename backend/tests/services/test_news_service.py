@@ -9,14 +9,19 @@ from src.services.news_service import (
     build_noticia_response,
     get_news_feed,
     get_news_by_id,
+    get_liked_news,
+    get_next_cursor,
+    insert_news_bulk,
+    marcar_curtidos,
 )
+from src.services.likes_service import handleLike, reconciliar_qtd_curtidas
 from src.db.models.noticia_model import Noticia
 from src.db.models.fonte_model import Fonte
 from src.db.models.usuario_model import Usuario
 from src.db.models.curtir_model import Curtir
 from src.schemas.noticia_schema import NoticiaCreate, NoticiaResponse
 from src.schemas.fonte_schema import FonteResponse
-from sqlalchemy import func
+from sqlalchemy import event, func
 
 
 # --- Dados de Teste e Mocks Globais ---
@@ -50,6 +55,7 @@ def mock_noticia_model(mock_fonte_model):
     noticia.url = "http://noticiateste.com/noticia1"
     noticia.id_fonte = mock_fonte_model.id
     noticia.data_coleta = datetime.now()
+    noticia.qtd_curtidas = 0
     noticia.fonte = mock_fonte_model  # Simula o relacionamento
     return noticia
 
@@ -66,6 +72,14 @@ def noticia_create_data(mock_fonte_model):
     )
 
 
+# Banco SQLite em memória (tests/conftest.py) com uma fonte cadastrada
+@pytest.fixture
+def fonte_db(sqlite_db):
+    sqlite_db.add(Fonte(id=1, url="http://fonte.com/rss", tipo_extracao="rss", nome="Fonte"))
+    sqlite_db.commit()
+    return sqlite_db
+
+
 # --- Testes para create_news ---
 
 def test_create_news_success(mock_db_session, noticia_create_data):
@@ -122,8 +136,8 @@ def test_create_news_already_exists(mock_db_session, noticia_create_data):
 # --- Testes para build_noticia_response ---
 
 def test_build_noticia_response_basic(mock_db_session, mock_noticia_model, mock_usuario, mock_fonte_model):
-    # Simula a contagem de curtidas e se o usuário curtiu
-    mock_db_session.query(Curtir).filter(Curtir.id_noticia == mock_noticia_model.id).count.return_value = 5
+    # Contador de curtidas da notícia e se o usuário curtiu
+    mock_noticia_model.qtd_curtidas = 5
     mock_db_session.query(Curtir).filter(
         Curtir.id_noticia == mock_noticia_model.id, Curtir.id_usuario == mock_usuario.id
     ).first.return_value = MagicMock(spec=Curtir)  # Usuário curtiu
@@ -177,23 +191,23 @@ def test_build_noticia_response_sem_fonte(mock_db_session, mock_usuario): # Remo
 # --- Testes para get_news_feed ---
 def test_get_news_feed_order_by_data_postagem(mock_db_session, mock_usuario, mock_noticia_model):
     # Configura o mock da query para ordenação por data_postagem
-    mock_query_obj = mock_db_session.query.return_value # Mock para o objeto query
+    mock_query_obj = mock_db_session.query.return_value.options.return_value # Mock após options (fonte)
     mock_ordered_query = mock_query_obj.order_by.return_value # Mock após order_by
     mock_offset_query = mock_ordered_query.offset.return_value # Mock após offset
     mock_limited_query = mock_offset_query.limit.return_value # Mock após limit
-    mock_limited_query.all.return_value = [mock_noticia_model, mock_noticia_model]  # Duas notícias
+    # Duas notícias, com o contador de curtidas na própria linha
+    mock_noticia_model.qtd_curtidas = 2
+    mock_limited_query.all.return_value = [mock_noticia_model, mock_noticia_model]
 
-    # Mocks para build_noticia_response dentro do loop
-    # Ajustar para que o filtro de curtidas use o ID da notícia mockada
-    mock_db_session.query(Curtir).filter(Curtir.id_noticia == mock_noticia_model.id).count.return_value = 2
-    mock_db_session.query(Curtir).filter(
-        Curtir.id_noticia == mock_noticia_model.id, Curtir.id_usuario == mock_usuario.id
-    ).first.return_value = None  # Não curtiu
+    # Consulta IN das curtidas do usuário: não curtiu nenhuma
+    mock_db_session.query.return_value.filter.return_value.__iter__.return_value = iter([])
 
     feed = get_news_feed(mock_usuario, mock_db_session, skip=0, limit=10, order_by="data_postagem")
 
     assert len(feed) == 2
     assert feed[0].id == mock_noticia_model.id
+    assert feed[0].qtd_curtidas == 2
+    assert feed[0].curtido is False
 
     # Verifica se query(Noticia) foi chamado
     mock_db_session.query.assert_any_call(Noticia)
@@ -208,12 +222,14 @@ def test_get_news_feed_order_by_data_postagem(mock_db_session, mock_usuario, moc
 
 def test_get_news_feed_order_by_qtd_curtidas(mock_db_session, mock_usuario, mock_noticia_model):
     mock_query_curtidas = MagicMock()
-    mock_db_session.query(Noticia, func.count(Curtir.id_usuario).label(
-        "qtd_curtidas")).outerjoin().group_by().order_by().offset().limit.return_value = mock_query_curtidas
-    mock_query_curtidas.all.return_value = [(mock_noticia_model, 5), (mock_noticia_model, 3)]
-    mock_db_session.query(Curtir).filter(
-        Curtir.id_noticia == mock_noticia_model.id, Curtir.id_usuario == mock_usuario.id
-    ).first.return_value = MagicMock()
+    mock_db_session.query().options().order_by().offset().limit.return_value = mock_query_curtidas
+    noticia_3_curtidas = MagicMock(**{k: getattr(mock_noticia_model, k) for k in (
+        "id", "titulo", "resumo", "imagem", "data_postagem", "url", "id_fonte", "data_coleta", "fonte")})
+    noticia_3_curtidas.qtd_curtidas = 3
+    mock_noticia_model.qtd_curtidas = 5
+    mock_query_curtidas.all.return_value = [mock_noticia_model, noticia_3_curtidas]
+    # Consulta IN das curtidas do usuário: curtiu a notícia
+    mock_db_session.query.return_value.filter.return_value.__iter__.return_value = iter([(mock_noticia_model.id,)])
 
     feed = get_news_feed(mock_usuario, mock_db_session, skip=0, limit=10, order_by="qtd_curtidas")
 
@@ -225,13 +241,261 @@ def test_get_news_feed_order_by_qtd_curtidas(mock_db_session, mock_usuario, mock
     mock_db_session.query(Curtir).filter(Curtir.id_noticia == mock_noticia_model.id).count.assert_not_called()
 
 
+# --- Testes de quantidade de consultas por página (SQLite) ---
+@pytest.fixture
+def feed_db(fonte_db):
+    # 15 notícias; o usuário 1 curtiu as pares e o usuário 2 curtiu as múltiplas de 3
+    fonte_db.add_all([
+        Usuario(id=1, nome="Ana", email="ana@x.com", senha_hash="h"),
+        Usuario(id=2, nome="Bia", email="bia@x.com", senha_hash="h"),
+    ])
+    fonte_db.add_all([Noticia(id=i, **_noticia_dict(i)) for i in range(1, 16)])
+    fonte_db.add_all(
+        [Curtir(id_usuario=1, id_noticia=i) for i in range(2, 16, 2)]
+        + [Curtir(id_usuario=2, id_noticia=i) for i in range(3, 16, 3)]
+    )
+    fonte_db.commit()
+    reconciliar_qtd_curtidas(fonte_db)  # Preenche o contador de curtidas
+    fonte_db.expunge_all()  # Nada carregado na sessão: a fonte precisa vir na consulta
+    return fonte_db
+
+
+@pytest.fixture
+def contar_consultas(feed_db):
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    engine = feed_db.get_bind()
+    event.listen(engine, "before_cursor_execute", registrar)
+    yield consultas
+    event.remove(engine, "before_cursor_execute", registrar)
+
+
+@pytest.mark.parametrize("limit", [1, 5, 10])
+@pytest.mark.parametrize("order_by", ["data_postagem", "qtd_curtidas"])
+def test_get_news_feed_consultas_nao_crescem_com_a_pagina(feed_db, contar_consultas, order_by, limit):
+    usuario = feed_db.get(Usuario, 1)
+    contar_consultas.clear()
+
+    feed = get_news_feed(usuario, feed_db, skip=0, limit=limit, order_by=order_by)
+
+    assert len(feed) == limit
+    # Uma consulta para a página (notícia + fonte) e uma para as curtidas do usuário
+    assert len(contar_consultas) == 2
+    for noticia in feed:
+        assert noticia.fonte.nome == "Fonte"
+        assert noticia.curtido == (noticia.id % 2 == 0)
+        assert noticia.qtd_curtidas == (noticia.id % 2 == 0) + (noticia.id % 3 == 0)
+
+
+def test_get_news_feed_anonimo_uma_consulta(feed_db, contar_consultas):
+    feed = get_news_feed(None, feed_db, limit=10)
+
+    assert [n.id for n in feed] == list(range(15, 5, -1))
+    assert not any(n.curtido for n in feed)
+    assert len(contar_consultas) == 1
+
+
+def test_get_news_feed_qtd_curtidas_ordena_por_curtidas(feed_db):
+    feed = get_news_feed(None, feed_db, limit=3, order_by="qtd_curtidas")
+
+    # 6 e 12 têm duas curtidas; são as primeiras
+    assert {n.id for n in feed[:2]} == {6, 12}
+    assert feed[0].qtd_curtidas == 2
+    assert feed[2].qtd_curtidas == 1
+
+
+def test_marcar_curtidos_sobre_pagina_anonima(feed_db, contar_consultas):
+    anonima = get_news_feed(None, feed_db, limit=4)
+    usuario = feed_db.get(Usuario, 2)
+    contar_consultas.clear()
+
+    pagina = marcar_curtidos(anonima, usuario, feed_db)
+
+    # Uma consulta IN; o usuário 2 curtiu as múltiplas de 3
+    assert len(contar_consultas) == 1
+    assert [(n.id, n.curtido) for n in pagina] == [(15, True), (14, False), (13, False), (12, True)]
+    assert not any(n.curtido for n in anonima)  # A página compartilhada não muda
+    assert marcar_curtidos(anonima, None, feed_db) is anonima
+
+
+def test_marcar_curtidos_conta_curtida_feita_depois_do_cache(feed_db):
+    anonima = get_news_feed(None, feed_db, limit=4)
+    usuario = feed_db.get(Usuario, 2)
+
+    handleLike(feed_db, usuario, 14)
+    pagina = marcar_curtidos(anonima, usuario, feed_db)
+
+    # A página em cache é de antes da curtida; o contador vem do banco
+    antes = next(n for n in anonima if n.id == 14)
+    depois = next(n for n in pagina if n.id == 14)
+    assert (depois.curtido, depois.qtd_curtidas) == (True, antes.qtd_curtidas + 1)
+
+
+def test_get_news_by_id_consultas(feed_db, contar_consultas):
+    usuario = feed_db.get(Usuario, 1)
+    contar_consultas.clear()
+
+    noticia = get_news_by_id(usuario, 6, feed_db)
+
+    assert (noticia.qtd_curtidas, noticia.curtido, noticia.fonte.nome) == (2, True, "Fonte")
+    assert len(contar_consultas) == 2
+
+
+# --- Testes de paginação por cursor (SQLite) ---
+def percorrer_feed(db, order_by, limit, antes_da_pagina=None):
+    ids, cursor, paginas = [], None, 0
+    while True:
+        if antes_da_pagina:
+            antes_da_pagina(paginas)
+        pagina = get_news_feed(None, db, limit=limit, order_by=order_by, cursor=cursor)
+        ids += [n.id for n in pagina]
+        paginas += 1
+        cursor = get_next_cursor(pagina, limit, order_by)
+        if cursor is None:
+            return ids, paginas
+
+
+@pytest.mark.parametrize("order_by", ["data_postagem", "qtd_curtidas"])
+def test_cursor_percorre_feed_sem_repetir_nem_pular(feed_db, order_by):
+    # Mesma ordem que a paginação por skip, incluindo empates no número de curtidas
+    esperado = [n.id for n in get_news_feed(None, feed_db, limit=100, order_by=order_by)]
+
+    ids, paginas = percorrer_feed(feed_db, order_by, limit=4)
+
+    assert ids == esperado
+    assert paginas == 4
+
+
+def test_cursor_estavel_com_noticias_novas(feed_db):
+    def coletar_noticia_nova(pagina):
+        # Uma coleta insere uma notícia mais recente entre as páginas
+        if pagina:
+            i = 100 + pagina
+            feed_db.add(Noticia(id=i, **_noticia_dict(i)))
+            feed_db.commit()
+
+    ids, _ = percorrer_feed(feed_db, "data_postagem", limit=4, antes_da_pagina=coletar_noticia_nova)
+
+    assert ids == list(range(15, 0, -1))
+
+
+def test_cursor_ultima_pagina_sem_proximo(feed_db):
+    pagina = get_news_feed(None, feed_db, limit=10, skip=10)
+    assert len(pagina) == 5
+    assert get_next_cursor(pagina, 10) is None
+
+
+@pytest.mark.parametrize("cursor", ["nao-e-base64!", "e30", "W10"])
+def test_cursor_invalido(feed_db, cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        get_news_feed(None, feed_db, cursor=cursor)
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Cursor inválido"
+
+
+def test_cursor_de_outro_feed_invalido(feed_db):
+    pagina = get_news_feed(None, feed_db, limit=2, order_by="qtd_curtidas")
+    cursor = get_next_cursor(pagina, 2, "qtd_curtidas")
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_news_feed(None, feed_db, limit=2, cursor=cursor)
+    assert exc_info.value.status_code == 400
+
+
+# --- Testes para get_liked_news (SQLite) ---
+@pytest.fixture
+def curtidas_usuario_1(feed_db):
+    # Curtidas do usuário 1 (notícias pares) em horários distintos; 4 e 8 empatadas
+    minutos = {2: 1, 4: 9, 6: 3, 8: 9, 10: 5, 12: 2, 14: 4}
+    for id_noticia, minuto in minutos.items():
+        feed_db.query(Curtir).filter(
+            Curtir.id_usuario == 1, Curtir.id_noticia == id_noticia
+        ).update({Curtir.data_curtida: datetime(2024, 2, 1) + timedelta(minutes=minuto)})
+    feed_db.commit()
+    return feed_db.get(Usuario, 1)
+
+
+def test_get_liked_news_uma_consulta_por_pagina(feed_db, contar_consultas, curtidas_usuario_1):
+    contar_consultas.clear()
+
+    ids, cursor, paginas = [], None, 0
+    while True:
+        pagina, cursor = get_liked_news(curtidas_usuario_1, feed_db, limit=3, cursor=cursor)
+        ids += [n.id for n in pagina]
+        paginas += 1
+        assert all(n.curtido and n.fonte.nome == "Fonte" for n in pagina)
+        if cursor is None:
+            break
+
+    # Da curtida mais recente para a mais antiga; o id desempata
+    assert ids == [8, 4, 10, 14, 6, 12, 2]
+    assert len(contar_consultas) == paginas == 3
+
+
+def test_get_liked_news_skip_e_contador(feed_db, curtidas_usuario_1):
+    pagina, cursor = get_liked_news(curtidas_usuario_1, feed_db, skip=4, limit=2)
+
+    assert [(n.id, n.qtd_curtidas) for n in pagina] == [(6, 2), (12, 2)]
+    assert cursor is not None
+
+
+def test_get_liked_news_cursor_de_outro_feed_invalido(feed_db, curtidas_usuario_1):
+    pagina = get_news_feed(None, feed_db, limit=2)
+    cursor = get_next_cursor(pagina, 2)
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_liked_news(curtidas_usuario_1, feed_db, cursor=cursor)
+    assert exc_info.value.status_code == 400
+
+
 # --- Testes para get_news_by_id ---
 def test_get_news_by_id_not_found(mock_db_session, mock_usuario):
     news_id_nao_existente = 999
-    mock_db_session.query(Noticia).filter(Noticia.id == news_id_nao_existente).first.return_value = None
+    mock_db_session.query.return_value.options.return_value.filter.return_value.first.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
         get_news_by_id(mock_usuario, news_id_nao_existente, mock_db_session)
 
     assert exc_info.value.status_code == 404
-    assert exc_info.value.detail == "Notícia não encontrada"
\ No newline at end of file
+    assert exc_info.value.detail == "Notícia não encontrada"
+
+# --- Testes para insert_news_bulk ---
+def _noticia_dict(i):
+    return {
+        "titulo": f"Notícia {i}",
+        "resumo": "Resumo.",
+        "imagem": "img.jpg",
+        "data_postagem": datetime(2024, 1, 1) + timedelta(hours=i),
+        "url": f"http://noticia.com/{i}",
+        "id_fonte": 1,
+    }
+
+
+def test_insert_news_bulk_insere_em_lotes(fonte_db):
+    noticias = [_noticia_dict(i) for i in range(5)]
+
+    with patch("src.services.news_service.NEWS_INSERT_CHUNK_SIZE", 2):
+        resultado = insert_news_bulk(noticias, fonte_db)
+    fonte_db.commit()
+
+    assert resultado == {"inseridas": 5, "ignoradas": 0}
+    assert fonte_db.query(Noticia).count() == 5
+
+
+def test_insert_news_bulk_ignora_urls_existentes(fonte_db):
+    insert_news_bulk([_noticia_dict(i) for i in range(3)], fonte_db)
+    fonte_db.commit()
+
+    # Reexecutar a mesma coleta (ou uma sobreposta) não aborta o lote
+    resultado = insert_news_bulk([_noticia_dict(i) for i in range(2, 6)], fonte_db)
+    fonte_db.commit()
+
+    assert resultado == {"inseridas": 3, "ignoradas": 1}
+    assert fonte_db.query(Noticia).count() == 6
+
+
+def test_insert_news_bulk_lista_vazia(fonte_db):
+    assert insert_news_bulk([], fonte_db) == {"inseridas": 0, "ignoradas": 0}
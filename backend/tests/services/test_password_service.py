@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from src.auth.password import criar_contexto
+from src.db.models.usuario_model import Usuario
+from src.schemas.usuario_schema import LoginSchema
+from src.services.password_service import (
+    parametros_do_hash,
+    rehash_senha,
+    relatorio_parametros_senha,
+)
+from src.services.user_service import authenticate_usuario
+
+# Custos mínimos: o "atual" e um "antigo", com memória diferente
+CONTEXTO_ATUAL = criar_contexto(1, 16, 1)
+HASH_ANTIGO = criar_contexto(1, 8, 1).hash("segredo")
+HASH_ATUAL = CONTEXTO_ATUAL.hash("segredo")
+
+
+@pytest.fixture(autouse=True)
+def contexto_atual():
+    with patch("src.auth.password.password_context", CONTEXTO_ATUAL):
+        yield
+
+
+@pytest.fixture
+def sessao(sqlite_engine):
+    Sessao = sessionmaker(bind=sqlite_engine)
+    with Sessao() as db:
+        db.add_all([
+            Usuario(id=1, nome="A", email="a@x.com", senha_hash=HASH_ANTIGO),
+            Usuario(id=2, nome="B", email="b@x.com", senha_hash=HASH_ANTIGO),
+            Usuario(id=3, nome="C", email="c@x.com", senha_hash=HASH_ATUAL),
+            Usuario(id=4, nome="D", email="d@x.com", senha_hash="hash-legado"),
+        ])
+        db.commit()
+    with patch("src.services.password_service.SessionLocal", Sessao):
+        yield Sessao
+
+
+def login(senha_hash):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = Usuario(
+        id=1, email="a@x.com", senha_hash=senha_hash
+    )
+    tarefas = MagicMock()
+    authenticate_usuario(LoginSchema(email="a@x.com", senha="segredo"), db, tarefas)
+    return tarefas
+
+
+# --- Testes para o rehash no login ---
+def test_login_com_parametros_antigos_agenda_rehash():
+    tarefas = login(HASH_ANTIGO)
+
+    tarefas.add_task.assert_called_once_with(rehash_senha, 1, "segredo", HASH_ANTIGO)
+
+
+def test_login_com_parametros_atuais_nao_agenda_rehash():
+    tarefas = login(HASH_ATUAL)
+
+    tarefas.add_task.assert_not_called()
+
+
+def test_rehash_senha_regrava_com_parametros_atuais(sessao):
+    assert rehash_senha(1, "segredo", HASH_ANTIGO) is True
+
+    with sessao() as db:
+        novo_hash = db.get(Usuario, 1).senha_hash
+        assert db.get(Usuario, 2).senha_hash == HASH_ANTIGO
+    assert parametros_do_hash(novo_hash) == "$argon2id$v=19$m=16,t=1,p=1$"
+    assert CONTEXTO_ATUAL.verify("segredo", novo_hash)
+
+
+def test_rehash_senha_nao_sobrescreve_senha_trocada(sessao):
+    # A senha mudou entre o login e a execução da tarefa
+    assert rehash_senha(3, "segredo", HASH_ANTIGO) is False
+
+    with sessao() as db:
+        assert db.get(Usuario, 3).senha_hash == HASH_ATUAL
+
+
+def test_rehash_senha_executor_ocupado(sessao):
+    with patch(
+        "src.services.password_service.hash_password",
+        side_effect=HTTPException(status_code=503),
+    ):
+        assert rehash_senha(1, "segredo", HASH_ANTIGO) is False
+
+    with sessao() as db:
+        assert db.get(Usuario, 1).senha_hash == HASH_ANTIGO
+
+
+# --- Testes para relatorio_parametros_senha ---
+def test_relatorio_parametros_senha(sessao):
+    with sessao() as db:
+        relatorio = relatorio_parametros_senha(db)
+
+    assert relatorio == [
+        {"parametros": "$argon2id$v=19$m=8,t=1,p=1$", "usuarios": 2, "atual": False},
+        {"parametros": "$argon2id$v=19$m=16,t=1,p=1$", "usuarios": 1, "atual": True},
+        {"parametros": "desconhecido", "usuarios": 1, "atual": False},
+    ]
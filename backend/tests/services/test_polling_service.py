@@ -0,0 +1,94 @@
+# tests/services/test_polling_service.py
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.db.models.fonte_model import Fonte
+from src.db.models.noticia_model import Noticia
+from src.services.polling_service import aplicar_jitter, calcular_intervalo, intervalos_por_fonte
+
+AGORA = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def datas_a_cada(minutos, quantidade, inicio=AGORA):
+    return [inicio - timedelta(minutes=minutos * i) for i in range(quantidade)]
+
+
+@pytest.fixture
+def fontes_db(sqlite_db):
+    sqlite_db.add_all([
+        Fonte(id=1, url="http://movimentada.com/rss", tipo_extracao="rss", nome="Movimentada"),
+        Fonte(id=2, url="http://diaria.com/rss", tipo_extracao="rss", nome="Diaria"),
+        Fonte(id=3, url="http://nova.com/rss", tipo_extracao="rss", nome="Nova"),
+    ])
+    sqlite_db.commit()
+    return sqlite_db
+
+
+# --- Testes para calcular_intervalo ---
+def test_calcular_intervalo_metade_da_mediana():
+    # Publica a cada 60 min -> coleta a cada 30 min
+    assert calcular_intervalo(datas_a_cada(60, 10), AGORA) == timedelta(minutes=30)
+
+
+def test_calcular_intervalo_respeita_minimo():
+    assert calcular_intervalo(datas_a_cada(1, 10), AGORA) == timedelta(minutes=5)
+
+
+def test_calcular_intervalo_respeita_maximo():
+    # Uma notícia por dia -> limitado a 6 horas
+    assert calcular_intervalo(datas_a_cada(24 * 60, 10), AGORA) == timedelta(minutes=360)
+
+
+def test_calcular_intervalo_sem_historico_usa_padrao():
+    assert calcular_intervalo([], AGORA) == timedelta(minutes=60)
+    assert calcular_intervalo([AGORA], AGORA) == timedelta(minutes=60)
+
+
+def test_calcular_intervalo_fonte_parada_fica_mais_lenta():
+    ativa = calcular_intervalo(datas_a_cada(20, 3), AGORA)
+    # Mesmo ritmo, mas a última notícia foi há dois dias
+    parada = calcular_intervalo(datas_a_cada(20, 3, inicio=AGORA - timedelta(days=2)), AGORA)
+
+    assert parada > ativa
+
+
+def test_calcular_intervalo_aceita_datas_sem_timezone():
+    datas = [data.replace(tzinfo=None) for data in datas_a_cada(60, 5)]
+    assert calcular_intervalo(datas, AGORA) == timedelta(minutes=30)
+
+
+# --- Testes para aplicar_jitter ---
+def test_aplicar_jitter_dentro_dos_limites():
+    intervalo = timedelta(minutes=30)
+    for _ in range(100):
+        assert timedelta(minutes=27) <= aplicar_jitter(intervalo, 0.1) <= timedelta(minutes=33)
+
+
+# --- Testes para intervalos_por_fonte ---
+@patch("src.services.polling_service.POLLING_HISTORICO", 5)
+def test_intervalos_por_fonte_usa_historico_recente(fontes_db):
+    noticias = []
+    # Fonte 1: a cada 20 min agora, mas antigamente a cada dia (fora do histórico)
+    for i, data in enumerate(datas_a_cada(20, 5) + datas_a_cada(24 * 60, 5, AGORA - timedelta(days=1))):
+        noticias.append((1, data, f"http://movimentada.com/{i}"))
+    for i, data in enumerate(datas_a_cada(24 * 60, 5)):
+        noticias.append((2, data, f"http://diaria.com/{i}"))
+    fontes_db.add_all([
+        Noticia(titulo="T", resumo="R", data_postagem=data, url=url, id_fonte=id_fonte)
+        for id_fonte, data, url in noticias
+    ])
+    fontes_db.commit()
+
+    intervalos = intervalos_por_fonte(fontes_db, [1, 2, 3], AGORA)
+
+    assert intervalos == {
+        1: timedelta(minutes=10),
+        2: timedelta(minutes=360),
+        3: timedelta(minutes=60),
+    }
+
+
+def test_intervalos_por_fonte_sem_fontes(fontes_db):
+    assert intervalos_por_fonte(fontes_db, []) == {}
@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.db.models.curtir_model import Curtir
+from src.db.models.fonte_model import Fonte
+from src.db.models.noticia_model import Noticia
+from src.db.models.ranking_model import RankingNoticia
+from src.db.models.usuario_model import Usuario
+from src.services.news_service import get_news_feed
+from src.services.ranking_service import atualizar_rankings, get_hottest_feed
+from src.utils.cursor import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def ranking_db(sqlite_db):
+    # 12 notícias: as 4 primeiras desta semana, as demais de meses atrás;
+    # qtd_curtidas = i % 5, o id desempata
+    db = sqlite_db
+    agora = datetime.now(timezone.utc)
+    db.add(Fonte(id=1, url="http://fonte.com/rss", tipo_extracao="rss", nome="Fonte"))
+    db.add(Usuario(id=1, nome="Ana", email="ana@x.com", senha_hash="h"))
+    db.add_all([
+        Noticia(
+            id=i,
+            titulo=f"Notícia {i}",
+            resumo="Resumo.",
+            imagem="img.jpg",
+            url=f"http://noticia.com/{i}",
+            id_fonte=1,
+            data_postagem=agora - (timedelta(days=i) if i <= 4 else timedelta(days=60 + i)),
+            qtd_curtidas=i % 5,
+        )
+        for i in range(1, 13)
+    ])
+    db.add(Curtir(id_usuario=1, id_noticia=4))
+    db.commit()
+    return db
+
+
+# Ordem esperada do feed: qtd_curtidas desc, id desc
+ORDEM_ALL = [9, 4, 8, 3, 12, 7, 2, 11, 6, 1, 10, 5]
+
+
+def ler_feed_inteiro(db, usuario=None, limit=3, **kwargs):
+    ids, cursor = [], None
+    while True:
+        pagina, cursor = get_hottest_feed(usuario, db, limit=limit, cursor=cursor, **kwargs)
+        ids += [n.id for n in pagina]
+        if not cursor:
+            return ids
+
+
+def test_atualizar_rankings_por_janela(ranking_db):
+    totais = atualizar_rankings(ranking_db)
+
+    assert totais == {"week": 4, "month": 4, "year": 12, "all": 12}
+    posicoes = (
+        ranking_db.query(RankingNoticia.id_noticia)
+        .filter(RankingNoticia.janela == "all")
+        .order_by(RankingNoticia.posicao)
+    )
+    assert [id_noticia for (id_noticia,) in posicoes] == ORDEM_ALL
+
+
+def test_atualizar_rankings_substitui_posicoes_antigas(ranking_db):
+    atualizar_rankings(ranking_db)
+    ranking_db.query(Noticia).filter(Noticia.id == 1).update({Noticia.qtd_curtidas: 50})
+    ranking_db.commit()
+
+    atualizar_rankings(ranking_db)
+
+    assert ranking_db.query(RankingNoticia).filter(RankingNoticia.janela == "all").count() == 12
+    primeira = ranking_db.get(RankingNoticia, ("all", 1))
+    assert (primeira.id_noticia, primeira.qtd_curtidas) == (1, 50)
+
+
+def test_get_hottest_feed_le_o_ranking(ranking_db):
+    atualizar_rankings(ranking_db)
+    usuario = ranking_db.get(Usuario, 1)
+
+    pagina, cursor = get_hottest_feed(usuario, ranking_db, limit=3, time_filter="week")
+
+    assert [n.id for n in pagina] == [4, 3, 2]
+    assert [n.curtido for n in pagina] == [True, False, False]
+    dados = decode_cursor(cursor)
+    versao = ranking_db.get(RankingNoticia, ("week", 1)).atualizado_em
+    assert dados == {"o": "ranking", "j": "week", "p": 3, "r": versao.isoformat(), "v": 2, "id": 2}
+    assert ler_feed_inteiro(ranking_db, time_filter="week") == [4, 3, 2, 1]
+    assert ler_feed_inteiro(ranking_db) == ORDEM_ALL
+
+
+def test_get_hottest_feed_paginas_estaveis_com_novas_curtidas(ranking_db):
+    atualizar_rankings(ranking_db)
+    primeira, cursor = get_hottest_feed(None, ranking_db, limit=3)
+
+    # Curtidas depois do cálculo não reordenam as páginas seguintes
+    ranking_db.query(Noticia).filter(Noticia.id == 12).update({Noticia.qtd_curtidas: 99})
+    ranking_db.commit()
+    segunda, _ = get_hottest_feed(None, ranking_db, limit=3, cursor=cursor)
+
+    assert [n.id for n in primeira + segunda] == ORDEM_ALL[:6]
+    # O contador exibido é o atual
+    assert next(n.qtd_curtidas for n in segunda if n.id == 12) == 99
+
+
+def test_get_hottest_feed_sem_ranking_usa_consulta_ao_vivo(ranking_db):
+    pagina, cursor = get_hottest_feed(None, ranking_db, skip=2, limit=3)
+
+    ao_vivo = get_news_feed(None, ranking_db, skip=2, limit=3, order_by="qtd_curtidas")
+    assert [n.id for n in pagina] == [n.id for n in ao_vivo] == ORDEM_ALL[2:5]
+    assert decode_cursor(cursor)["o"] == "qtd_curtidas"
+    assert ler_feed_inteiro(ranking_db) == ORDEM_ALL
+
+
+def test_get_hottest_feed_continua_ao_vivo_depois_do_ranking_cheio(ranking_db):
+    with patch("src.services.ranking_service.RANKING_TAMANHO", 4):
+        atualizar_rankings(ranking_db)
+
+        _, cursor = get_hottest_feed(None, ranking_db, limit=3)
+        # A última posição do ranking ganha curtidas depois do cálculo
+        ranking_db.query(Noticia).filter(Noticia.id == ORDEM_ALL[3]).update({Noticia.qtd_curtidas: 99})
+        ranking_db.commit()
+
+        segunda, cursor = get_hottest_feed(None, ranking_db, limit=3, cursor=cursor)
+        # A consulta ao vivo segue das curtidas guardadas, sem repetir o topo
+        assert [n.id for n in segunda] == ORDEM_ALL[3:6]
+        assert decode_cursor(cursor)["o"] == "qtd_curtidas"
+
+        ranking_db.query(Noticia).filter(Noticia.id == ORDEM_ALL[3]).update({Noticia.qtd_curtidas: 3})
+        ranking_db.commit()
+
+        assert ler_feed_inteiro(ranking_db) == ORDEM_ALL
+        # skip além do ranking também segue com a consulta ao vivo
+        alem, _ = get_hottest_feed(None, ranking_db, skip=6, limit=3)
+        assert [n.id for n in alem] == ORDEM_ALL[6:9]
+
+
+def test_get_hottest_feed_cursor_de_outra_janela(ranking_db):
+    atualizar_rankings(ranking_db)
+    _, cursor = get_hottest_feed(None, ranking_db, limit=3, time_filter="all")
+
+    with pytest.raises(HTTPException) as exc:
+        get_hottest_feed(None, ranking_db, limit=3, time_filter="week", cursor=cursor)
+    assert exc.value.status_code == 400
+
+
+def test_get_hottest_feed_ranking_recalculado_entre_paginas(ranking_db):
+    atualizar_rankings(ranking_db)
+    primeira, cursor = get_hottest_feed(None, ranking_db, limit=3)
+
+    # A notícia 1 vai ao topo e o ranking é recalculado antes da próxima página
+    ranking_db.query(Noticia).filter(Noticia.id == 1).update({Noticia.qtd_curtidas: 50})
+    ranking_db.commit()
+    atualizar_rankings(ranking_db)
+
+    segunda, cursor = get_hottest_feed(None, ranking_db, limit=3, cursor=cursor)
+
+    # Segue ao vivo a partir da última notícia vista: nada repetido nem pulado
+    assert [n.id for n in primeira + segunda] == ORDEM_ALL[:6]
+    assert decode_cursor(cursor)["o"] == "qtd_curtidas"
+
+
+def test_get_hottest_feed_cursor_de_ranking_incompleto(ranking_db):
+    atualizar_rankings(ranking_db)
+
+    with pytest.raises(HTTPException) as exc:
+        get_hottest_feed(
+            None, ranking_db, limit=3, cursor=encode_cursor({"o": "ranking", "j": "all", "p": 3})
+        )
+    assert exc.value.status_code == 400
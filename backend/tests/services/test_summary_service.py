@@ -0,0 +1,180 @@
+# tests/test_summary_service.py
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.services.summary_service import carregar_nlp, gerar_resumo, gerar_resumos, get_nlp, resumir_lote
+
+
+# Estruturas de mock para simular o comportamento do spaCy nlp
+class MockSpan:
+    def __init__(self, text):
+        self.text = text
+
+
+class MockDoc:
+    def __init__(self, sents_text):
+        self.sents = [MockSpan(text) for text in sents_text]
+
+
+class TestSummaryService:
+
+    # --- Testes para gerar_resumo ---
+    @patch('src.services.summary_service._nlp')
+    def test_gerar_resumo_texto_normal(self, mock_nlp):
+        mock_nlp.return_value = MockDoc(["Primeira frase.", "Segunda frase.", "Terceira frase longa."])
+        texto = "Primeira frase. Segunda frase. Terceira frase longa."
+        # "Primeira frase." (16)
+        # "Primeira frase. Segunda frase." (16 + 1 + 14 = 31)
+        resumo = gerar_resumo(texto, max_length=30)
+        assert resumo == "Primeira frase. Segunda frase."
+
+    @patch('src.services.summary_service._nlp')
+    def test_gerar_resumo_texto_cabe_exatamente(self, mock_nlp):
+        mock_nlp.return_value = MockDoc(["Frase curta.", "Outra."])
+        texto = "Frase curta. Outra."  # 12 + 1 + 6 = 19
+        resumo = gerar_resumo(texto, max_length=19)
+        assert resumo == "Frase curta. Outra."
+
+    @patch('src.services.summary_service._nlp')
+    def test_gerar_resumo_texto_vazio(self, mock_nlp):
+        resumo = gerar_resumo("   ", max_length=50)
+        assert resumo == "Resumo indisponível"
+        mock_nlp.assert_not_called()
+
+    @patch('src.services.summary_service._nlp')
+    def test_gerar_resumo_texto_curto_menor_que_max(self, mock_nlp):
+        mock_nlp.return_value = MockDoc(["Texto curto."])
+        texto = "Texto curto."
+        resumo = gerar_resumo(texto, max_length=50)
+        assert resumo == "Texto curto."
+
+    @patch('src.services.summary_service._nlp')
+    def test_gerar_resumo_texto_longo_truncado_na_sentenca(self, mock_nlp):
+        sents = ["Esta é a primeira sentença.", "Esta é a segunda que é um pouco mais longa.",
+                 "Esta terceira não deve caber."]
+        mock_nlp.return_value = MockDoc(sents)
+        texto = " ".join(sents)  # "Esta é a primeira sentença." (28 chars)
+        resumo = gerar_resumo(texto, max_length=40)
+        assert resumo == "Esta é a primeira sentença."
+
+    @patch('src.services.summary_service._nlp')
+    def test_gerar_resumo_fallback_corte_brusco(self, mock_nlp):
+        # Teste para o caso de fallback: return texto[: max_length - 3] + "..."
+        # Ocorre se a primeira sentença já for maior que max_length.
+        long_sentence = "Esta é uma sentença única muito longa que excede o comprimento máximo."  # 70 chars
+        mock_nlp.return_value = MockDoc([long_sentence])
+        texto = long_sentence
+        resumo = gerar_resumo(texto, max_length=30)
+        assert resumo == texto[:27] + "..."
+        assert len(resumo) == 30
+
+    # --- Testes para carregar_nlp ---
+    def test_carregar_nlp_sentencizer_nao_precisa_de_modelo(self):
+        nlp = carregar_nlp("sentencizer")
+
+        assert nlp.pipe_names == ["sentencizer"]
+        doc = nlp("Primeira frase. Segunda frase? Terceira!")
+        assert [sent.text for sent in doc.sents] == ["Primeira frase.", "Segunda frase?", "Terceira!"]
+
+    @patch('spacy.load')
+    def test_carregar_nlp_senter_carrega_so_o_necessario(self, mock_load):
+        nlp = carregar_nlp("senter")
+
+        mock_load.assert_called_once_with(
+            "pt_core_news_sm",
+            exclude=["tok2vec", "morphologizer", "parser", "lemmatizer", "attribute_ruler", "ner"],
+        )
+        nlp.enable_pipe.assert_called_once_with("senter")
+
+    @patch('spacy.load')
+    def test_carregar_nlp_full(self, mock_load):
+        assert carregar_nlp("full") is mock_load.return_value
+        mock_load.assert_called_once_with("pt_core_news_sm")
+
+    def test_carregar_nlp_modo_invalido(self):
+        with pytest.raises(ValueError, match="Modo de resumo inválido: rapido"):
+            carregar_nlp("rapido")
+
+    @patch('src.services.summary_service._nlp', carregar_nlp("sentencizer"))
+    def test_gerar_resumo_com_sentencizer(self):
+        texto = "O rio foi despoluído. A fauna voltou à região. Moradores comemoram a mudança."
+        assert gerar_resumo(texto, max_length=50) == "O rio foi despoluído. A fauna voltou à região."
+
+    # --- Testes para get_nlp ---
+    @patch('src.services.summary_service._nlp', None)
+    @patch('src.services.summary_service.carregar_nlp')
+    def test_get_nlp_carrega_uma_vez(self, mock_carregar):
+        assert get_nlp() is mock_carregar.return_value
+        assert get_nlp() is mock_carregar.return_value
+        mock_carregar.assert_called_once_with()
+
+    def test_importar_api_nao_carrega_spacy(self):
+        # Processo novo: os testes deste arquivo já importaram o spaCy
+        codigo = "import sys, src.main; print('spacy' in sys.modules)"
+        resultado = subprocess.run(
+            [sys.executable, "-c", codigo], capture_output=True, text=True, check=True
+        )
+        assert resultado.stdout.strip().splitlines()[-1] == "False"
+
+    # --- Testes para resumir_lote ---
+    @patch('src.services.summary_service._nlp')
+    def test_resumir_lote_usa_pipe_e_preserva_ordem(self, mock_nlp):
+        textos_processados = []
+
+        def fake_pipe(textos):
+            textos_processados.extend(textos)
+            return [MockDoc([texto]) for texto in textos_processados]
+
+        mock_nlp.pipe.side_effect = fake_pipe
+
+        resumos = resumir_lote(["Primeiro.", "   ", "Terceiro."], max_length=50)
+
+        assert resumos == ["Primeiro.", "Resumo indisponível", "Terceiro."]
+        # Textos vazios não passam pelo pipeline
+        assert textos_processados == ["Primeiro.", "Terceiro."]
+        mock_nlp.assert_not_called()
+
+    # --- Testes para gerar_resumos ---
+    @pytest.mark.asyncio
+    @patch('src.services.summary_service.SUMMARY_WORKERS', 0)
+    @patch('src.services.summary_service.SUMMARY_BATCH_SIZE', 2)
+    @patch('src.services.summary_service._nlp')
+    async def test_gerar_resumos_sem_pool(self, mock_nlp, capsys):
+        mock_nlp.pipe.side_effect = lambda textos: [MockDoc([texto]) for texto in textos]
+        textos = [f"Texto {i}." for i in range(5)]
+
+        resumos = await gerar_resumos(textos)
+
+        assert resumos == textos
+        # 5 textos em lotes de 2 -> 3 chamadas ao pipeline
+        assert mock_nlp.pipe.call_count == 3
+        assert "🧠 5 resumos em" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    @patch('src.services.summary_service.SUMMARY_WORKERS', 2)
+    @patch('src.services.summary_service.SUMMARY_BATCH_SIZE', 2)
+    @patch('src.services.summary_service._nlp')
+    async def test_gerar_resumos_distribui_lotes_no_pool(self, mock_nlp):
+        mock_nlp.pipe.side_effect = lambda textos: [MockDoc([texto]) for texto in textos]
+        textos = [f"Texto {i}." for i in range(5)]
+
+        # Um pool de threads no lugar do pool de processos para o mock ser compartilhado
+        with ThreadPoolExecutor(max_workers=2) as executor, \
+                patch('src.services.summary_service._get_executor', return_value=executor), \
+                patch('src.services.summary_service.resumir_lote', wraps=resumir_lote) as mock_resumir:
+            resumos = await gerar_resumos(textos)
+
+        assert resumos == textos
+        assert [chamada[0][0] for chamada in mock_resumir.call_args_list] == [
+            ["Texto 0.", "Texto 1."],
+            ["Texto 2.", "Texto 3."],
+            ["Texto 4."],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_gerar_resumos_lista_vazia(self):
+        assert await gerar_resumos([]) == []
@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.auth.auth import get_current_user_leitura, get_principal, get_principal_optional
+from src.auth.jwt import create_access_token, create_refresh_token
+from src.auth.principal import Principal, UsuarioSnapshot
+from src.db.models.usuario_model import Usuario
+from src.schemas.usuario_schema import UpdateUsuario
+from src.services.user_cache_service import get_usuario_snapshot, invalidar_usuario
+from src.services.user_service import update_usuario
+from src.utils.cache import MemoryCache
+
+
+@pytest.fixture(autouse=True)
+def cache_usuarios():
+    cache = MemoryCache(max_entries=10, ttl=60)
+    with patch("src.services.user_cache_service.get_cache_usuarios", return_value=cache):
+        yield cache
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    db.get.return_value = Usuario(
+        id=1,
+        nome="Ana",
+        email="ana@x.com",
+        senha_hash="h",
+        data_cadastro=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+    )
+    return db
+
+
+def credenciais(sub):
+    return MagicMock(credentials=create_access_token({"sub": sub}))
+
+
+# --- Testes para get_usuario_snapshot ---
+def test_get_usuario_snapshot_consulta_banco_so_no_miss(mock_db):
+    primeiro = get_usuario_snapshot(1, mock_db)
+    segundo = get_usuario_snapshot(1, mock_db)
+
+    assert primeiro == segundo == UsuarioSnapshot(
+        id=1,
+        nome="Ana",
+        email="ana@x.com",
+        data_cadastro=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        foto_perfil=None,
+    )
+    mock_db.get.assert_called_once_with(Usuario, 1)
+
+
+def test_get_usuario_snapshot_usuario_inexistente(mock_db):
+    mock_db.get.return_value = None
+
+    assert get_usuario_snapshot(1, mock_db) is None
+
+
+def test_invalidar_usuario_forca_nova_consulta(mock_db):
+    get_usuario_snapshot(1, mock_db)
+    invalidar_usuario(1)
+    get_usuario_snapshot(1, mock_db)
+
+    assert mock_db.get.call_count == 2
+
+
+def test_update_usuario_invalida_cache(mock_db):
+    usuario = mock_db.get.return_value
+    get_usuario_snapshot(1, mock_db)
+
+    update_usuario(usuario, mock_db, UpdateUsuario(nome="Bia"))
+    assert get_usuario_snapshot(1, mock_db).nome == "Bia"
+
+
+# --- Testes para as dependências de autenticação ---
+def test_get_principal_usa_so_o_token():
+    assert get_principal(credenciais("7")) == Principal(id=7)
+
+
+def test_get_principal_optional_sem_token():
+    assert get_principal_optional(None) is None
+    assert get_principal_optional(credenciais("7")) == Principal(id=7)
+
+
+def test_get_principal_token_invalido():
+    with pytest.raises(HTTPException) as exc:
+        get_principal(MagicMock(credentials="token-invalido"))
+
+    assert exc.value.status_code == 401
+
+
+def test_get_principal_recusa_refresh_token():
+    refresh = create_refresh_token({"sub": "7"}, MagicMock())
+
+    with pytest.raises(HTTPException) as exc:
+        get_principal(MagicMock(credentials=refresh))
+
+    assert exc.value.status_code == 401
+    assert get_principal_optional(MagicMock(credentials=refresh)) is None
+
+
+def test_get_current_user_leitura_usuario_excluido(mock_db):
+    mock_db.get.return_value = None
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user_leitura(Principal(id=1), mock_db)
+
+    assert exc.value.status_code == 401
@@ -0,0 +1,261 @@
+# tests/workers/test_ingest_worker.py
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.db.locks import advisory_lock
+from src.workers.ingest_worker import (
+    RETENTATIVA,
+    agendar,
+    executar,
+    executar_atualizacao_rankings,
+    executar_coleta,
+    executar_reconciliacao,
+    reagendar,
+)
+
+
+def lock(obtido):
+    @contextmanager
+    def fake_lock(chave):
+        yield obtido
+
+    return fake_lock
+
+
+# --- Testes para advisory_lock ---
+def test_advisory_lock_sem_postgres_sempre_obtem():
+    bind = MagicMock()
+    bind.dialect.name = "sqlite"
+
+    with advisory_lock(123, bind=bind) as obtido:
+        assert obtido is True
+
+    bind.connect.assert_not_called()
+
+
+def test_advisory_lock_postgres_obtido_e_liberado():
+    bind = MagicMock()
+    bind.dialect.name = "postgresql"
+    conn = bind.connect.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = True
+
+    with advisory_lock(123, bind=bind) as obtido:
+        assert obtido is True
+        assert conn.execute.call_count == 1
+
+    # try_lock + unlock na mesma conexão
+    sqls = [str(chamada.args[0]) for chamada in conn.execute.call_args_list]
+    assert "pg_try_advisory_lock" in sqls[0]
+    assert "pg_advisory_unlock" in sqls[1]
+
+
+def test_advisory_lock_postgres_ocupado_nao_libera():
+    bind = MagicMock()
+    bind.dialect.name = "postgresql"
+    conn = bind.connect.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = False
+
+    with advisory_lock(123, bind=bind) as obtido:
+        assert obtido is False
+
+    assert conn.execute.call_count == 1
+
+
+def test_advisory_lock_transacional_libera_no_rollback():
+    bind = MagicMock()
+    bind.dialect.name = "postgresql"
+    conn = bind.connect.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = True
+
+    with advisory_lock(123, bind=bind, transacional=True) as obtido:
+        assert obtido is True
+        # A transação continua aberta enquanto o bloco roda
+        conn.commit.assert_not_called()
+
+    assert conn.execute.call_count == 1
+    assert "pg_try_advisory_xact_lock" in str(conn.execute.call_args.args[0])
+    conn.rollback.assert_called_once()
+
+
+# --- Testes para executar_coleta ---
+@pytest.mark.asyncio
+@patch("src.workers.ingest_worker.advisory_lock", lock(True))
+@patch("src.workers.ingest_worker.get_news_from_rss", new_callable=AsyncMock)
+@patch("src.workers.ingest_worker.SessionLocal")
+async def test_executar_coleta_chama_pipeline_diretamente(mock_session_local, mock_get_news):
+    mock_get_news.return_value = {"detail": "ok"}
+    db = mock_session_local.return_value
+
+    assert await executar_coleta() == {"detail": "ok"}
+
+    mock_get_news.assert_awaited_once_with(db, None)
+    db.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("src.workers.ingest_worker.advisory_lock", lock(False))
+@patch("src.workers.ingest_worker.get_news_from_rss", new_callable=AsyncMock)
+@patch("src.workers.ingest_worker.SessionLocal")
+async def test_executar_coleta_pula_se_lock_ocupado(mock_session_local, mock_get_news, capsys):
+    assert await executar_coleta() is None
+
+    mock_get_news.assert_not_awaited()
+    mock_session_local.assert_not_called()
+    assert "Outra coleta já está em andamento" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+@patch("src.workers.ingest_worker.advisory_lock", lock(True))
+@patch("src.workers.ingest_worker.get_news_from_rss", new_callable=AsyncMock)
+@patch("src.workers.ingest_worker.SessionLocal")
+async def test_executar_coleta_erro_faz_rollback(mock_session_local, mock_get_news, capsys):
+    mock_get_news.side_effect = ValueError("Nenhuma fonte de RSS encontrada.")
+    db = mock_session_local.return_value
+
+    assert await executar_coleta() is None
+
+    db.rollback.assert_called_once()
+    db.close.assert_called_once()
+    assert "❌ Erro na coleta de notícias" in capsys.readouterr().out
+
+
+# --- Testes para o agendamento por fonte ---
+class FimDoLaco(Exception):
+    pass
+
+
+@patch("src.workers.ingest_worker.aplicar_jitter", lambda intervalo: intervalo)
+@patch("src.workers.ingest_worker.intervalos_por_fonte")
+@patch("src.workers.ingest_worker.SessionLocal")
+def test_agendar_usa_intervalo_de_cada_fonte(mock_session_local, mock_intervalos):
+    agora = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    mock_intervalos.return_value = {1: timedelta(minutes=5), 2: timedelta(hours=6)}
+
+    assert agendar([1, 2], agora) == {
+        1: agora + timedelta(minutes=5),
+        2: agora + timedelta(hours=6),
+    }
+
+
+@pytest.mark.asyncio
+@patch("src.workers.ingest_worker.encerrar_executor")
+@patch("src.workers.ingest_worker.executar_atualizacao_rankings")
+@patch("src.workers.ingest_worker.executar_reconciliacao")
+@patch("src.workers.ingest_worker.listar_fontes_rss", return_value=[1, 2])
+@patch("src.workers.ingest_worker.executar_coleta", new_callable=AsyncMock)
+async def test_executar_uma_vez(mock_coleta, mock_fontes, mock_reconciliacao, mock_rankings, mock_encerrar):
+    with patch("src.workers.ingest_worker.agendar", return_value={}):
+        await executar(uma_vez=True)
+
+    mock_coleta.assert_awaited_once_with([1, 2])
+    mock_reconciliacao.assert_called_once()
+    mock_rankings.assert_called_once()
+    mock_encerrar.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("src.workers.ingest_worker.encerrar_executor")
+@patch("src.workers.ingest_worker.executar_atualizacao_rankings")
+@patch("src.workers.ingest_worker.executar_reconciliacao")
+@patch("src.workers.ingest_worker.listar_fontes_rss", return_value=[1, 2])
+@patch("src.workers.ingest_worker.executar_coleta", new_callable=AsyncMock)
+async def test_executar_coleta_so_fontes_vencidas(
+    mock_coleta, mock_fontes, mock_reconciliacao, mock_rankings, mock_encerrar
+):
+    def fake_agendar(ids_fontes, agora):
+        # Fonte 1 vence de novo logo em seguida; fonte 2 só daqui a horas
+        atrasos = {1: timedelta(seconds=-1), 2: timedelta(hours=6)}
+        return {i: agora + atrasos[i] for i in ids_fontes}
+
+    esperas = []
+
+    async def fake_sleep(segundos):
+        esperas.append(segundos)
+        if len(esperas) == 2:
+            raise FimDoLaco()
+
+    with patch("src.workers.ingest_worker.agendar", side_effect=fake_agendar), \
+            patch("src.workers.ingest_worker.asyncio.sleep", side_effect=fake_sleep):
+        with pytest.raises(FimDoLaco):
+            await executar()
+
+    assert [chamada.args[0] for chamada in mock_coleta.await_args_list] == [[1, 2], [1]]
+    # A reconciliação só volta a rodar depois de likes_reconcile_minutes
+    mock_reconciliacao.assert_called_once()
+    mock_rankings.assert_called_once()
+    mock_encerrar.assert_called_once()
+
+
+@patch("src.workers.ingest_worker.aplicar_jitter", lambda intervalo: intervalo)
+def test_reagendar_usa_o_intervalo_minimo():
+    assert RETENTATIVA == timedelta(minutes=5)  # polling_min_minutes padrão
+    agora = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+    assert reagendar([1, 2], agora) == {
+        1: agora + RETENTATIVA,
+        2: agora + RETENTATIVA,
+    }
+
+
+@pytest.mark.asyncio
+@patch("src.workers.ingest_worker.encerrar_executor")
+@patch("src.workers.ingest_worker.executar_atualizacao_rankings")
+@patch("src.workers.ingest_worker.executar_reconciliacao")
+@patch("src.workers.ingest_worker.listar_fontes_rss", return_value=[1, 2])
+@patch("src.workers.ingest_worker.executar_coleta", new_callable=AsyncMock, return_value=None)
+async def test_executar_coleta_pulada_nao_avanca_o_ritmo_das_fontes(
+    mock_coleta, mock_fontes, mock_reconciliacao, mock_rankings, mock_encerrar
+):
+    # Outro worker está com o lock: as fontes voltam em polling_min_minutes
+    with patch("src.workers.ingest_worker.agendar") as mock_agendar, \
+            patch("src.workers.ingest_worker.reagendar", return_value={}) as mock_reagendar:
+        await executar(uma_vez=True)
+
+    mock_agendar.assert_not_called()
+    assert mock_reagendar.call_args.args[0] == [1, 2]
+
+
+# --- Testes para executar_reconciliacao ---
+@patch("src.workers.ingest_worker.advisory_lock", lock(True))
+@patch("src.workers.ingest_worker.reconciliar_qtd_curtidas", return_value=3)
+@patch("src.workers.ingest_worker.SessionLocal")
+def test_executar_reconciliacao(mock_session_local, mock_reconciliar, capsys):
+    assert executar_reconciliacao() == 3
+
+    mock_reconciliar.assert_called_once_with(mock_session_local.return_value.__enter__.return_value)
+    assert "corrigido em 3 notícias" in capsys.readouterr().out
+
+
+@patch("src.workers.ingest_worker.advisory_lock", lock(False))
+@patch("src.workers.ingest_worker.reconciliar_qtd_curtidas")
+def test_executar_reconciliacao_pula_se_lock_ocupado(mock_reconciliar):
+    assert executar_reconciliacao() is None
+    mock_reconciliar.assert_not_called()
+
+
+# --- Testes para executar_atualizacao_rankings ---
+@patch("src.workers.ingest_worker.advisory_lock", lock(True))
+@patch("src.workers.ingest_worker.atualizar_rankings", return_value={"all": 10})
+@patch("src.workers.ingest_worker.SessionLocal")
+def test_executar_atualizacao_rankings(mock_session_local, mock_atualizar):
+    assert executar_atualizacao_rankings() == {"all": 10}
+    mock_atualizar.assert_called_once_with(mock_session_local.return_value.__enter__.return_value)
+
+
+@patch("src.workers.ingest_worker.advisory_lock", lock(False))
+@patch("src.workers.ingest_worker.atualizar_rankings")
+def test_executar_atualizacao_rankings_pula_se_lock_ocupado(mock_atualizar):
+    assert executar_atualizacao_rankings() is None
+    mock_atualizar.assert_not_called()
+
+
+@patch("src.workers.ingest_worker.advisory_lock", lock(True))
+@patch("src.workers.ingest_worker.atualizar_rankings", side_effect=Exception("falhou"))
+@patch("src.workers.ingest_worker.SessionLocal")
+def test_executar_atualizacao_rankings_erro_faz_rollback(mock_session_local, mock_atualizar, capsys):
+    assert executar_atualizacao_rankings() is None
+    mock_session_local.return_value.__enter__.return_value.rollback.assert_called_once()
+    assert "Erro ao atualizar rankings" in capsys.readouterr().out